@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memory benchmark for the movie records (mvp-1 models.py).
+Holds N movies in memory as the raw TMDb + OMDb responses (what a cache of
+raw responses keeps), as the dicts the views used to build, and as merged
+Movie records, and measures retained memory with tracemalloc. Also times
+decoding the responses (json vs utils.fastjson, with and without projecting
+them into records) and the round trip through the cache format.
+
+Usage:
+    python benchmarks/bench_models.py [--movies 5000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from common import use_app, measure, record_result
+from replay import synthetic_tmdb, synthetic_omdb
+
+use_app("mvp-1")
+import models  # noqa: E402
+from utils import fastjson  # noqa: E402
+
+def make_responses(count):
+    """Generate raw TMDb details and OMDb responses as JSON text."""
+    responses = []
+    for i in range(count):
+        movie_id = 10000 + i
+        tmdb = synthetic_tmdb(f"/3/movie/{movie_id}", {})
+        omdb = synthetic_omdb("/", {"i": tmdb["imdb_id"], "plot": "full"})
+        responses.append((json.dumps(tmdb), json.dumps(omdb)))
+    return responses
+
+def omdb_result(data):
+    """Same result dict as omdb.get_omdb_details() builds from a response."""
+    return {
+        'success': True,
+        'plot': data.get("Plot", ""),
+        'imdb_id': data.get("imdbID", ""),
+        'ratings': data.get("Ratings", []),
+        'director': data.get("Director", ""),
+        'actors': [actor.strip() for actor in data.get("Actors", "").split(',') if actor.strip()],
+        'awards': data.get("Awards", ""),
+        'poster': data.get("Poster", ""),
+        'source': 'IMDb',
+        'not_found': False,
+        'url': f"https://www.imdb.com/title/{data.get('imdbID', '')}"
+    }
+
+def build_raw(responses):
+    return [(json.loads(tmdb), json.loads(omdb)) for tmdb, omdb in responses]
+
+def build_dicts(responses):
+    return [(models.Movie.from_tmdb(json.loads(tmdb)).to_dict(), omdb_result(json.loads(omdb)))
+            for tmdb, omdb in responses]
+
+def build_records(responses):
+    return [models.Movie.from_tmdb(json.loads(tmdb)).merge(models.Movie.from_omdb(omdb_result(json.loads(omdb))))
+            for tmdb, omdb in responses]
+
+def decode_each(responses, decode):
+    """Decode every TMDb response, dropping each result like a request handler does."""
+    for tmdb, _ in responses:
+        decode(tmdb)
+
+def retained_bytes(build, responses):
+    """Measure the memory still held by what build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    held = build(responses)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory use of movie records")
+    parser.add_argument("--movies", type=int, default=5000, help="number of movies held in memory")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per serialization test (best is kept)")
+    parser.add_argument("--output", help="results file (JSON lines)")
+    args = parser.parse_args()
+
+    responses = make_responses(args.movies)
+    raw_bytes = retained_bytes(build_raw, responses)
+    dict_bytes = retained_bytes(build_dicts, responses)
+    record_bytes = retained_bytes(build_records, responses)
+
+    # Decoding the TMDb details with the standard parser and with fastjson, alone and projected into records
+    decode_times = {}
+    for name, loads in (("json", json.loads), ("fastjson", fastjson.loads)):
+        decode_times[f"decode_{name}_us"] = measure(lambda: decode_each(responses, loads), repeat=args.repeat)[0]
+        decode_times[f"project_{name}_us"] = measure(
+            lambda: decode_each(responses, lambda tmdb: models.Movie.from_tmdb(loads(tmdb))), repeat=args.repeat
+        )[0]
+
+    # Round trip through the cache format: view dicts as JSON objects, records as compact lists
+    dicts = build_dicts(responses)
+    records = build_records(responses)
+    dict_time, dict_json = measure(lambda: [json.loads(json.dumps(pair)) for pair in dicts], repeat=args.repeat)
+    record_time, record_json = measure(
+        lambda: [models.Movie.from_cache(json.loads(json.dumps(record.to_cache()))) for record in records],
+        repeat=args.repeat
+    )
+    assert record_json == records
+
+    record_result("models", {
+        "movies": args.movies,
+        "json_backend": fastjson.BACKEND,
+        **{name: round(seconds / args.movies * 1e6, 2) for name, seconds in decode_times.items()},
+        "raw_responses_bytes_per_movie": round(raw_bytes / args.movies),
+        "dicts_bytes_per_movie": round(dict_bytes / args.movies),
+        "records_bytes_per_movie": round(record_bytes / args.movies),
+        "records_vs_dicts": round(record_bytes / dict_bytes, 3),
+        "records_vs_raw": round(record_bytes / raw_bytes, 3),
+        "dict_json_bytes_per_movie": round(sum(len(json.dumps(pair)) for pair in dicts) / args.movies),
+        "record_cache_bytes_per_movie": round(sum(len(json.dumps(record.to_cache())) for record in records) / args.movies),
+        "dict_round_trip_us": round(dict_time / args.movies * 1e6, 2),
+        "record_round_trip_us": round(record_time / args.movies * 1e6, 2)
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
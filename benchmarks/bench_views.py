@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+End-to-end benchmark of the search and detail views of both MVPs, run
+offline against the record/replay stub server (see replay.py).
+
+Each MVP runs in its own process (both use the module names config, api
+and utils) with a fresh cache directory. Every query is searched and its
+first result opened for --rounds rounds, so round 1 shows cold-cache and
+later rounds warm-cache latency. With --offline, mvp-1 then runs one more
+round in offline mode (served from the snapshots and caches, see views.py).
+With --instances N, N processes of each MVP run the queries at the same
+time, each with its own cache directory; --shared-cache points them all to
+one stand-in Redis server (see kvstub.py), so the cache is shared.
+Request counts come from the stub server.
+
+Usage:
+    python benchmarks/bench_views.py                      # synthetic upstreams
+    python benchmarks/bench_views.py --mode replay        # recorded fixtures
+    python benchmarks/bench_views.py --mvp mvp-1 --latency 0.1 --jitter 0.05
+    python benchmarks/bench_views.py --mvp mvp-1 --offline
+    python benchmarks/bench_views.py --instances 4 --shared-cache
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import BENCH_ENV, use_app, percentile, record_result
+from kvstub import KeyValueStub
+from replay import StubServer
+
+DEFAULT_QUERIES = ["Inception", "Bố Già", "The Dark Knight", "Parasite", "Mắt Biếc"]
+
+def summarize(latencies):
+    """Summarize a list of latencies in seconds as milliseconds."""
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0
+    }
+
+def run_mvp1(queries, rounds, offline=False):
+    """Search and open the first result of each query in mvp-1."""
+    use_app("mvp-1")
+    import main as app
+    from utils import resilience, translator
+    translator.translator = None  # googletrans has no stub; translations return the original text
+
+    timings = []
+    for round_number in list(range(1, rounds + 1)) + (["offline"] if offline else []):
+        if round_number == "offline":
+            resilience.set_offline(True)
+        for query in queries:
+            start = time.perf_counter()
+            movies = app.search_movies(query)
+            search_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if movies:
+                app.display_movie_info(movies[0])
+            detail_time = time.perf_counter() - start
+            timings.append({"round": round_number, "search": search_time, "detail": detail_time})
+    return timings
+
+def run_mvp2(queries, rounds, offline=False):
+    """Search and open the first result of each query in mvp-2."""
+    use_app("mvp-2")
+    import main as app
+    from ui.movie_display import display_movie_info, display_search_results
+
+    timings = []
+    for round_number in range(1, rounds + 1):
+        for query in queries:
+            start = time.perf_counter()
+            movies, movie_details_list = app.search_movie(query)
+            if movies:
+                app.console.print(display_search_results(movies, movie_details_list))
+            search_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if movie_details_list:
+                display_movie_info(movie_details_list[0])
+            detail_time = time.perf_counter() - start
+            timings.append({"round": round_number, "search": search_time, "detail": detail_time})
+    return timings
+
+def worker(mvp, queries, rounds, offline=False):
+    """Run one MVP inside this process and print its timings as JSON."""
+    runner = run_mvp1 if mvp == "mvp-1" else run_mvp2
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        timings = runner(queries, rounds, offline)
+    total = time.perf_counter() - start
+    print(json.dumps({"timings": timings, "total_seconds": total}))
+
+def run_workers(mvp, server, args, cache_backend="file"):
+    """Run the workers of one MVP in subprocesses, each with a fresh cache directory.
+
+    Returns:
+        dict: Timings of all workers, and the longest total run time
+    """
+    with contextlib.ExitStack() as stack:
+        workers = []
+        for _ in range(args.instances):
+            cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix=f"bench-{mvp}-"))
+            env = dict(os.environ, **BENCH_ENV, UPSTREAM_OVERRIDE=server.url, CACHE_DIR=cache_dir,
+                       CACHE_BACKEND=cache_backend)
+            command = [sys.executable, os.path.abspath(__file__), "--worker", mvp, "--rounds", str(args.rounds),
+                       "--queries", *args.queries] + (["--offline"] if args.offline else [])
+            workers.append(subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True))
+
+        results = []
+        for process in workers:
+            stdout, stderr = process.communicate()
+            if process.returncode != 0:
+                raise RuntimeError(f"{mvp} worker failed:\n{stderr}")
+            results.append(json.loads(stdout.strip().splitlines()[-1]))
+    return {"timings": [timing for result in results for timing in result["timings"]],
+            "total_seconds": max(result["total_seconds"] for result in results)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline search/detail view benchmark for both MVPs")
+    parser.add_argument("--mvp", choices=["mvp-1", "mvp-2", "all"], default="all")
+    parser.add_argument("--mode", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="standard deviation of the latency")
+    parser.add_argument("--rounds", type=int, default=2, help="rounds over the queries (1 = cold only)")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--offline", action="store_true", help="add an offline round (mvp-1)")
+    parser.add_argument("--instances", type=int, default=1, help="processes of each MVP running at the same time")
+    parser.add_argument("--shared-cache", action="store_true", help="share one cache between the processes (kvstub.py)")
+    parser.add_argument("--output", help="results file (JSON lines)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.queries, args.rounds, args.offline)
+        return
+
+    server = StubServer(args.mode, latency=args.latency, jitter=args.jitter).start()
+    kv_server = KeyValueStub().start() if args.shared_cache else None
+    try:
+        for mvp in (["mvp-1", "mvp-2"] if args.mvp == "all" else [args.mvp]):
+            server.reset_stats()
+            result = run_workers(mvp, server, args, kv_server.url if kv_server else "file")
+            stats = server.get_stats()
+            timings = result["timings"]
+            views = len(timings)
+            rounds = sorted({t["round"] for t in timings}, key=str)
+
+            record_result("views", {
+                "mvp": mvp,
+                "mode": args.mode,
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "queries": len(args.queries),
+                "rounds": args.rounds,
+                "instances": args.instances,
+                "cache_backend": "shared" if kv_server else "file",
+                "search": {f"round_{r}": summarize([t["search"] for t in timings if t["round"] == r])
+                           for r in rounds},
+                "detail": {f"round_{r}": summarize([t["detail"] for t in timings if t["round"] == r])
+                           for r in rounds},
+                "views_per_second": round(views / result["total_seconds"], 2),
+                "upstream_requests": stats["requests"],
+                "upstream_requests_per_view": round(stats["requests"] / views, 1) if views else 0,
+                "upstream_bytes": stats["bytes"],
+                "fixture_misses": stats["misses"],
+                "requests_by_host": {host: value["requests"] for host, value in stats["by_host"].items()}
+            }, args.output)
+    finally:
+        server.stop()
+        if kv_server:
+            kv_server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for the YouTube review filters (mvp-1).
+Runs the channel and title filters over synthetic search snippets and
+records throughput next to the original per-call implementation.
+
+Usage:
+    python benchmarks/bench_youtube_filters.py [--items 50000] [--movies 20]
+"""
+
+import argparse
+import random
+import re
+
+from common import use_app, measure, record_result
+
+use_app("mvp-1")
+from utils import youtube_filters  # noqa: E402
+
+CHANNELS = [
+    "Phê Phim", "Mọt Phim", "Cine Review", "Schaffrillas Productions", "CinemaSins",
+    "Vietcetera", "Popcorn VN", "Chris Stuckmann", "Rạp Phim Online", "Movie Recaps",
+    "Tóm Tắt Phim", "Jeremy Jahns", "Ghiền Phim", "IGN", "Xem Phim Hay"
+]
+
+MOVIES = [
+    "Inception", "Bố Già", "The Dark Knight", "Parasite", "Mắt Biếc", "Dune: Part Two",
+    "Interstellar", "Hai Phượng", "Oppenheimer", "Tấm Cám: Chuyện Chưa Kể", "Joker",
+    "Avengers: Endgame", "Nhà Bà Nữ", "Spirited Away", "Lật Mặt 6", "Titanic",
+    "Everything Everywhere All at Once", "Em Chưa 18", "Barbie", "Mai"
+]
+
+TITLE_TEMPLATES = [
+    "Review phim {title} - đánh giá chi tiết", "{title} ({year}) | REVIEW", "Tóm tắt phim: {title}",
+    "{title} explained in 5 minutes", "Top 10 phim hay nhất {year}", "Why {title} is a masterpiece",
+    "Phê Phim review {title}", "Trailer mới nhất tháng {month}", "{title} - Có đáng xem không?"
+]
+
+def make_items(count, movies, seed=42):
+    """Generate synthetic search.list items."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        channel_index = rng.randrange(len(CHANNELS))
+        title = rng.choice(TITLE_TEMPLATES).format(
+            title=rng.choice(movies), year=rng.randint(1990, 2025), month=rng.randint(1, 12)
+        )
+        items.append({
+            "id": {"videoId": f"vid{i:08d}"},
+            "snippet": {
+                "title": title,
+                "channelTitle": CHANNELS[channel_index],
+                "channelId": f"UC{channel_index:022d}"
+            }
+        })
+    return items
+
+# Original implementation (before the compiled filters), kept as the baseline
+def baseline_is_vietnamese_channel(channel_title):
+    vn_patterns = [
+        'review', 'phim', 'điện ảnh', 'phê phim', 'xem phim',
+        'việt', 'viet', 'vn', '.vn', 'vietnam',
+        'phim hay', 'phim mới', 'phim chiếu rạp',
+        'cine', 'cinema', 'rap', 'rạp'
+    ]
+    channel_lower = channel_title.lower()
+    vietnamese_chars = 'àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ'
+    has_vietnamese_chars = any(c in vietnamese_chars for c in channel_lower)
+    has_vn_pattern = any(pattern.lower() in channel_lower for pattern in vn_patterns)
+    return has_vietnamese_chars or has_vn_pattern
+
+def baseline_contains_movie_title(video_title, movie_title):
+    video_lower = video_title.lower()
+    movie_lower = movie_title.lower()
+    movie_clean = ''.join(c for c in movie_lower if c.isalnum() or c.isspace())
+    movie_words = movie_clean.split()
+    if len(movie_words) == 1:
+        pattern = r'\b' + re.escape(movie_clean) + r'\b'
+        return bool(re.search(pattern, video_lower))
+    current_pos = 0
+    for word in movie_words:
+        pos = video_lower.find(word, current_pos)
+        if pos == -1:
+            return False
+        current_pos = pos + len(word)
+    return True
+
+def run_baseline(items, movies):
+    accepted = 0
+    for movie_title in movies:
+        for item in items:
+            snippet = item["snippet"]
+            if (baseline_is_vietnamese_channel(snippet["channelTitle"]) and
+                    baseline_contains_movie_title(snippet["title"], movie_title)):
+                accepted += 1
+    return accepted
+
+def run_compiled(items, movies):
+    youtube_filters._channel_cache.clear()
+    youtube_filters.compile_title_matcher.cache_clear()
+    youtube_filters._fold_video_title.cache_clear()
+    accepted = 0
+    for movie_title in movies:
+        accepted += sum(1 for _ in youtube_filters.filter_review_items(items, movie_title))
+    return accepted
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the YouTube review filters")
+    parser.add_argument("--items", type=int, default=50000, help="number of synthetic snippets")
+    parser.add_argument("--movies", type=int, default=len(MOVIES), help="number of movies to filter for")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per implementation (best is kept)")
+    parser.add_argument("--output", help="results file (JSON lines)")
+    args = parser.parse_args()
+
+    movies = MOVIES[:args.movies]
+    items = make_items(args.items, movies)
+    checks = args.items * len(movies)
+
+    baseline_time, baseline_accepted = measure(run_baseline, items, movies, repeat=args.repeat)
+    compiled_time, compiled_accepted = measure(run_compiled, items, movies, repeat=args.repeat)
+
+    record_result("youtube_filters", {
+        "items": args.items,
+        "movies": len(movies),
+        "baseline_seconds": round(baseline_time, 4),
+        "baseline_items_per_second": round(checks / baseline_time),
+        "baseline_accepted": baseline_accepted,
+        "compiled_seconds": round(compiled_time, 4),
+        "compiled_items_per_second": round(checks / compiled_time),
+        # Can exceed the baseline: folded titles also match unaccented video titles
+        "compiled_accepted": compiled_accepted,
+        "speedup": round(baseline_time / compiled_time, 2)
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared helpers for the benchmark scripts.
+Handles importing the MVP modules and recording benchmark results.
+"""
+
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+# Keys are required by the api modules but never reach a real upstream
+BENCH_ENV = {
+    "TMDB_API_KEY": "bench",
+    "OMDB_API_KEY": "bench",
+    "YOUTUBE_API_KEY": "bench",
+    "OPENAI_API_KEY": "bench",
+    # youtube-transcript-api opens its own sessions to youtube.com, so transcripts are left out
+    "TRANSCRIPT_CANDIDATES": "0"
+}
+
+def use_app(mvp):
+    """Make the modules of an MVP importable (e.g. 'mvp-1').
+
+    Args:
+        mvp (str): MVP directory name
+    """
+    scripts_dir = os.path.join(REPO_ROOT, mvp, "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+
+def measure(func, *args, repeat=5, **kwargs):
+    """Run a function several times and keep the best wall-clock time.
+
+    Args:
+        func (callable): Function to time
+        repeat (int, optional): Number of runs
+
+    Returns:
+        tuple: (best time in seconds, result of the last run)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def percentile(values, pct):
+    """Get a percentile of a list of numbers (nearest-rank).
+
+    Args:
+        values (list): Numbers
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, 0 for an empty list
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def record_result(name, data, output=None):
+    """Print a benchmark result and append it to a JSON-lines results file.
+
+    Args:
+        name (str): Benchmark name, also the default results file name
+        data (dict): Measured values
+        output (str, optional): Results file path (default: results/<name>.jsonl)
+
+    Returns:
+        dict: The recorded entry
+    """
+    entry = {
+        "benchmark": name,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        **data
+    }
+    output = output or os.path.join(RESULTS_DIR, f"{name}.jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    print(json.dumps(entry, ensure_ascii=False, indent=2))
+    return entry
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stand-in key-value server speaking the Redis protocol (RESP2).
+
+Implements the commands used by the 'redis' cache backend of the MVPs
+(utils/cache_backend.py): PING, AUTH, SELECT, GET, SET (with PX/EX and NX),
+DEL, INCRBY, PEXPIRE, plus DBSIZE and FLUSHDB. Keys expire like in Redis.
+It lets the shared cache be tested and benchmarked without a Redis server:
+
+    python benchmarks/kvstub.py --port 6390
+    CACHE_BACKEND=redis://127.0.0.1:6390 python mvp-1/scripts/server.py --port 8001
+    CACHE_BACKEND=redis://127.0.0.1:6390 python mvp-1/scripts/server.py --port 8002
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+
+class KeyValueStub:
+    """Threaded in-memory RESP server (one keyspace per database number)."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.databases = {}
+        self.lock = threading.Lock()
+        self.stats = {"commands": 0, "connections": 0}
+        self.server = socketserver.ThreadingTCPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"redis://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, keys=sum(len(keys) for keys in self.databases.values()))
+
+    def _live(self, db, key):
+        """Get the (value, expires_at) of a key, dropping it if it expired."""
+        item = db.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del db[key]
+            return None
+        return item
+
+    def execute(self, db_number, args):
+        """Run one command.
+
+        Returns:
+            Reply: str (status), int, bytes, None (nil) or Exception (error)
+        """
+        name = args[0].decode().upper()
+        with self.lock:
+            self.stats["commands"] += 1
+            db = self.databases.setdefault(db_number, {})
+            if name == "PING":
+                return "PONG"
+            if name == "GET":
+                item = self._live(db, args[1])
+                return item[0] if item else None
+            if name == "SET":
+                options = [arg.decode().upper() for arg in args[3:]]
+                expires_at = None
+                if "PX" in options:
+                    expires_at = time.time() + int(options[options.index("PX") + 1]) / 1000
+                elif "EX" in options:
+                    expires_at = time.time() + int(options[options.index("EX") + 1])
+                if "NX" in options and self._live(db, args[1]) is not None:
+                    return None
+                db[args[1]] = (args[2], expires_at)
+                return "OK"
+            if name == "DEL":
+                return sum(db.pop(key, None) is not None for key in args[1:])
+            if name == "INCRBY":
+                item = self._live(db, args[1])
+                try:
+                    value = int(item[0] if item else 0) + int(args[2])
+                except ValueError:
+                    return ValueError("ERR value is not an integer or out of range")
+                db[args[1]] = (str(value).encode(), item[1] if item else None)
+                return value
+            if name == "PEXPIRE":
+                item = self._live(db, args[1])
+                if item is None:
+                    return 0
+                db[args[1]] = (item[0], time.time() + int(args[2]) / 1000)
+                return 1
+            if name == "DBSIZE":
+                return len([key for key in list(db) if self._live(db, key)])
+            if name == "FLUSHDB":
+                db.clear()
+                return "OK"
+        return ValueError(f"ERR unknown command '{name}'")
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                with stub.lock:
+                    stub.stats["connections"] += 1
+                db_number = 0
+                while True:
+                    args = self.read_command()
+                    if args is None:
+                        return
+                    name = args[0].decode().upper()
+                    if name == "SELECT":
+                        db_number = int(args[1])
+                        reply = "OK"
+                    elif name == "AUTH":
+                        reply = "OK"
+                    else:
+                        reply = stub.execute(db_number, args)
+                    self.wfile.write(encode_reply(reply))
+
+            def read_command(self):
+                line = self.rfile.readline()
+                if not line.startswith(b"*"):
+                    return None
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+        return Handler
+
+def encode_reply(reply):
+    """Encode a reply of KeyValueStub.execute in RESP."""
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Redis server for the shared cache backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    stub = KeyValueStub(args.host, args.port)
+    print(f"Listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Load test of the movie lookup pipeline against local upstream stand-ins.
+
+The upstreams (TMDb, OMDb, YouTube, Wikipedia/Wikidata, OpenAI) are served by
+the stub server (see replay.py) with configurable latency distributions and
+error rates per host. N virtual users then send a mix of search and detail
+requests for --duration seconds:
+
+    mvp-1  over HTTP to the movie service (server.py) started in a subprocess
+    mvp-2  in a worker subprocess calling the OMDb/OpenAI lookups of the
+           search and detail views directly (mvp-2 has no HTTP service)
+
+Detail requests open a movie found by an earlier search. Latency percentiles
+exclude the first --warmup seconds; upstream fan-out and cache hit ratios
+cover the whole run. The report is printed and appended as JSON to
+benchmarks/results/loadtest.jsonl.
+
+Usage:
+    python benchmarks/loadtest.py --users 20 --duration 30 --detail-ratio 0.7
+    python benchmarks/loadtest.py --host-latency www.omdbapi.com=lognormal:0.3,0.8 --error-rate 0.02
+    python benchmarks/loadtest.py --app mvp-2 --users 5 --duration 20
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from common import BENCH_ENV, use_app, percentile, record_result
+from replay import StubServer, parse_distribution, parse_host_values
+
+DEFAULT_QUERIES = ["Inception", "Bố Già", "The Dark Knight", "Parasite", "Mắt Biếc",
+                   "Interstellar", "Hai Phượng", "Spirited Away", "Joker", "Tấm Cám"]
+
+class VirtualUsers:
+    """Runs virtual users that alternate search and detail requests.
+
+    The client callables return (ok, status label, movie ids found); ids
+    found by searches become candidates for later detail requests.
+    """
+
+    def __init__(self, search, detail, queries, detail_ratio, think_time=0.0, seed=1):
+        self.search = search
+        self.detail = detail
+        self.queries = queries
+        self.detail_ratio = detail_ratio
+        self.think_time = think_time
+        self.seed = seed
+        self.known_ids = []
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def _user(self, number, deadline, client):
+        rng = random.Random(self.seed + number)
+        while time.perf_counter() < deadline:
+            with self.lock:
+                movie_id = rng.choice(self.known_ids) if self.known_ids and rng.random() < self.detail_ratio else None
+
+            start = time.perf_counter()
+            try:
+                if movie_id is None:
+                    kind = "search"
+                    ok, status, found = self.search(client, rng.choice(self.queries))
+                else:
+                    kind = "detail"
+                    ok, status, found = self.detail(client, movie_id)
+            except Exception as e:
+                ok, status, found = False, type(e).__name__, []
+            end = time.perf_counter()
+
+            with self.lock:
+                self.samples.append((kind, start, end - start, ok, str(status)))
+                for found_id in found:
+                    if found_id not in self.known_ids:
+                        self.known_ids.append(found_id)
+
+            if self.think_time:
+                time.sleep(rng.expovariate(1 / self.think_time))
+
+    def run(self, users, duration, make_client=lambda: None):
+        """Run the users until the duration is over.
+
+        Returns:
+            float: perf_counter() value at the start of the run
+        """
+        started = time.perf_counter()
+        deadline = started + duration
+        threads = [threading.Thread(target=self._user, args=(number, deadline, make_client()), daemon=True)
+                   for number in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return started
+
+# ---------------------------------------------------------------------------
+# mvp-1: HTTP service
+# ---------------------------------------------------------------------------
+
+class ServiceClient:
+    """Keep-alive HTTP connection of one virtual user to the movie service."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connection = None
+
+    def get(self, path):
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+            try:
+                self.connection.request("GET", path)
+                response = self.connection.getresponse()
+                return response.status, json.loads(response.read() or b"{}")
+            except (http.client.HTTPException, OSError):
+                # The connection was closed by the service; reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+def service_search(client, query):
+    status, payload = client.get(f"/search?q={urllib.parse.quote(query)}")
+    return status == 200, status, [movie["id"] for movie in payload.get("results", [])[:5]]
+
+def service_detail(client, movie_id):
+    status, _ = client.get(f"/movie/{movie_id}")
+    return status == 200, status, []
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for_service(port, timeout=30):
+    """Wait until the service answers /health."""
+    deadline = time.time() + timeout
+    client = ServiceClient("127.0.0.1", port)
+    while time.time() < deadline:
+        try:
+            return client.get("/health")[1]
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("movie service did not start")
+
+def run_service(args, stub, cache_dir):
+    """Load-test the mvp-1 HTTP service.
+
+    Returns:
+        tuple: (samples, start time, service statistics)
+    """
+    port = free_port()
+    env = dict(os.environ, **BENCH_ENV, UPSTREAM_OVERRIDE=stub.url, CACHE_DIR=cache_dir,
+               SERVER_PORT=str(port), SERVER_WORKERS=str(args.workers))
+    scripts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mvp-1", "scripts")
+    service = subprocess.Popen([sys.executable, "server.py"], cwd=scripts_dir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_service(port)
+        stub.reset_stats()
+
+        users = VirtualUsers(service_search, service_detail, args.queries, args.detail_ratio,
+                             args.think_time, args.seed)
+        started = users.run(args.users, args.duration, lambda: ServiceClient("127.0.0.1", port))
+        health = ServiceClient("127.0.0.1", port).get("/health")[1]
+    finally:
+        service.terminate()
+        service.wait()
+
+    responses = health["caches"].pop("responses", {})
+    caches = {name: hit_ratio(stats) for name, stats in health["caches"].items()}
+    caches.update({f"responses.{name}": hit_ratio(stats) for name, stats in responses.items()})
+    caches["coalesced"] = {
+        "hits": health["coalesced"],
+        "ratio": round(health["coalesced"] / health["requests"], 3) if health["requests"] else 0
+    }
+    breakers = {name: state["breaker"] for name, state in health["upstreams"].items()}
+    return users.samples, started, {"cache": caches, "hedging": health["hedging"], "breakers": breakers}
+
+def hit_ratio(stats):
+    """Add the share of lookups answered from cache (stale and negative hits included)."""
+    hits = stats["hits"] + stats.get("stale", 0) + stats.get("negative", 0)
+    lookups = hits + stats["misses"]
+    return dict(stats, ratio=round(hits / lookups, 3) if lookups else 0)
+
+# ---------------------------------------------------------------------------
+# mvp-2: in-process pipeline
+# ---------------------------------------------------------------------------
+
+def worker_mvp2(args):
+    """Run the virtual users against the mvp-2 lookups inside this process."""
+    use_app("mvp-2")
+    from api import omdb, openai_helper
+    from utils import cache
+    import main as app
+
+    def search(client, query):
+        movies, _ = app.search_movie(query)
+        return bool(movies), "ok" if movies else "empty", [movie["imdbID"] for movie in movies[:5]]
+
+    def detail(client, imdb_id):
+        details = omdb.get_movie_details(imdb_id)
+        if not details:
+            return False, "omdb", []
+        if details.get("Awards") and details["Awards"] != "N/A":
+            openai_helper.get_awards_analysis(details)
+        analysis = openai_helper.get_movie_analysis(details)
+        ok = isinstance(analysis, str) and not analysis.startswith("Error")
+        return ok, "ok" if ok else "openai", []
+
+    users = VirtualUsers(search, detail, args.queries, args.detail_ratio, args.think_time, args.seed)
+    # Progress messages of the lookups are dropped (redirect_stdout is process-wide, so it wraps all users)
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = users.run(args.users, args.duration)
+    print(json.dumps({"samples": [[kind, start - started, latency, ok, status]
+                                  for kind, start, latency, ok, status in users.samples],
+                      "cache": cache.get_stats()}))
+
+def run_mvp2(args, stub, cache_dir):
+    """Load-test the mvp-2 pipeline in a worker subprocess.
+
+    Returns:
+        tuple: (samples, start time, service statistics)
+    """
+    env = dict(os.environ, **BENCH_ENV, UPSTREAM_OVERRIDE=stub.url, CACHE_DIR=cache_dir)
+    command = [sys.executable, os.path.abspath(__file__), "--worker", *sys.argv[1:]]
+    stub.reset_stats()
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"mvp-2 worker failed:\n{completed.stderr}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    caches = {f"responses.{name}": hit_ratio(stats) for name, stats in result["cache"].items()}
+    return [tuple(sample) for sample in result["samples"]], 0.0, {"cache": caches}
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def latency_summary(latencies):
+    """Summarize latencies in seconds as milliseconds."""
+    return {
+        "count": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0
+    }
+
+def build_report(args, samples, started, service_stats, stub_stats):
+    measured = [s for s in samples if s[1] - started >= args.warmup]
+    window = max(args.duration - args.warmup, 1e-9)
+
+    statuses = {}
+    for sample in measured:
+        statuses[sample[4]] = statuses.get(sample[4], 0) + 1
+    failed = sum(1 for sample in measured if not sample[3])
+
+    return {
+        "app": args.app,
+        "users": args.users,
+        "workers": args.workers if args.app == "mvp-1" else None,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "detail_ratio": args.detail_ratio,
+        "think_time": args.think_time,
+        "upstreams": {
+            "mode": args.mode,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "host_latency": args.host_latency or [],
+            "error_rate": args.error_rate or []
+        },
+        "requests": len(measured),
+        "requests_per_second": round(len(measured) / window, 2),
+        "error_rate": round(failed / len(measured), 4) if measured else 0,
+        "statuses": statuses,
+        "latency": {
+            "all": latency_summary([s[2] for s in measured]),
+            "search": latency_summary([s[2] for s in measured if s[0] == "search"]),
+            "detail": latency_summary([s[2] for s in measured if s[0] == "detail"])
+        },
+        "fanout": {
+            "upstream_requests": stub_stats["requests"],
+            "upstream_errors": stub_stats["errors"],
+            "per_request": round(stub_stats["requests"] / len(samples), 2) if samples else 0,
+            "per_request_by_host": {host: round(value["requests"] / len(samples), 2)
+                                    for host, value in stub_stats["by_host"].items()} if samples else {}
+        },
+        **service_stats
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the movie lookup pipeline with stub upstreams")
+    parser.add_argument("--app", choices=["mvp-1", "mvp-2"], default="mvp-1")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20, help="test length in seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds left out of the latency figures")
+    parser.add_argument("--detail-ratio", type=float, default=0.7, help="share of detail requests")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between requests of a user")
+    parser.add_argument("--workers", type=int, default=8, help="SERVER_WORKERS of the mvp-1 service")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mode", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="standard deviation of the latency")
+    parser.add_argument("--host-latency", action="append", metavar="HOST=DIST",
+                        help="latency distribution of one upstream host (see replay.py)")
+    parser.add_argument("--error-rate", action="append", metavar="[HOST=]RATE",
+                        help="share of upstream requests answered with a 503")
+    parser.add_argument("--output", help="results file (JSON lines)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_mvp2(args)
+        return
+
+    stub = StubServer(args.mode, latency=args.latency, jitter=args.jitter,
+                      host_latency=parse_host_values(args.host_latency, parse_distribution),
+                      error_rates=parse_host_values(args.error_rate, float)).start()
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"loadtest-{args.app}-") as cache_dir:
+            runner = run_service if args.app == "mvp-1" else run_mvp2
+            samples, started, service_stats = runner(args, stub, cache_dir)
+        stub_stats = stub.get_stats()
+    finally:
+        stub.stop()
+
+    record_result("loadtest", build_report(args, samples, started, service_stats, stub_stats), args.output)
+
+if __name__ == "__main__":
+    main()
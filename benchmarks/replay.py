@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Record/replay stub server for the upstream APIs (TMDb, OMDb, YouTube,
+Wikipedia/Wikidata, OpenAI).
+
+The MVPs send every upstream request to this server when UPSTREAM_OVERRIDE
+is set (e.g. UPSTREAM_OVERRIDE=http://127.0.0.1:8765). The original host is
+kept as the first path segment: /api.themoviedb.org/3/movie/27205?...
+
+Modes:
+    record     Forward requests to the real upstream (live keys and network
+               needed) and save each response as a fixture file
+    replay     Serve saved fixtures only; unknown requests get a 502
+    synthetic  Generate plausible responses without any fixtures
+
+Latency and errors can be set per upstream host (a suffix such as
+wikipedia.org matches every language edition):
+    --host-latency api.themoviedb.org=lognormal:0.08,0.5
+    --error-rate www.omdbapi.com=0.05 --error-rate 0.01
+
+Latency distributions (seconds):
+    const:M            always M
+    normal:M,SD        Gaussian, cut at 0
+    lognormal:MED,S    log-normal with median MED and shape S (long tail)
+    uniform:LO,HI      uniform between LO and HI
+    exp:M              exponential with mean M
+
+Usage:
+    python benchmarks/replay.py record --port 8765
+    python benchmarks/replay.py replay --port 8765 --latency 0.08 --jitter 0.03
+    python benchmarks/replay.py synthetic --host-latency www.omdbapi.com=lognormal:0.2,0.8
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Query parameters holding API keys: never part of fixture keys or saved URLs
+SECRET_PARAMS = {"api_key", "apikey", "key"}
+# Request headers worth forwarding when recording
+FORWARDED_HEADERS = {"content-type", "user-agent", "authorization", "accept"}
+
+def split_upstream_path(path):
+    """Split a stub request path into upstream host, path and query.
+
+    Args:
+        path (str): Request path, e.g. '/api.themoviedb.org/3/movie/1?x=1'
+
+    Returns:
+        tuple: (host, path, query params as list of pairs)
+    """
+    parts = urllib.parse.urlsplit(path)
+    host, _, upstream_path = parts.path.lstrip("/").partition("/")
+    return host, "/" + upstream_path, urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+
+def fixture_key(method, host, path, query, body=b""):
+    """Build the fixture key of a request, ignoring API keys and parameter order.
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    public_query = sorted((k, v) for k, v in query if k not in SECRET_PARAMS)
+    digest = hashlib.sha1()
+    digest.update(f"{method} {host}{path}?{urllib.parse.urlencode(public_query)}".encode("utf-8"))
+    if body:
+        digest.update(hashlib.sha1(body).digest())
+    return digest.hexdigest()[:20]
+
+class FixtureStore:
+    """Fixture files stored as <fixtures_dir>/<host>/<key>.json."""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        self.fixtures_dir = fixtures_dir
+
+    def _path(self, host, key):
+        return os.path.join(self.fixtures_dir, host, f"{key}.json")
+
+    def load(self, host, key):
+        try:
+            with open(self._path(host, key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, host, key, fixture):
+        path = self._path(host, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1)
+
+def record_upstream(method, host, path, query, body, headers):
+    """Forward a request to the real upstream.
+
+    Returns:
+        tuple: (status, content type, body bytes)
+    """
+    import requests  # Only needed when recording
+
+    response = requests.request(
+        method,
+        f"https://{host}{path}",
+        params=query,
+        data=body or None,
+        headers={k: v for k, v in headers.items() if k.lower() in FORWARDED_HEADERS},
+        timeout=30
+    )
+    return response.status_code, response.headers.get("Content-Type", "application/json"), response.content
+
+# ---------------------------------------------------------------------------
+# Synthetic upstream responses
+# ---------------------------------------------------------------------------
+
+def _number(text, modulo=100000):
+    """Stable pseudo-random number derived from text."""
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16) % modulo
+
+def _lorem(seed, sentences):
+    rng = random.Random(seed)
+    words = ("phim", "story", "hero", "journey", "family", "secret", "city", "war", "love",
+             "time", "dream", "memory", "night", "future", "truth", "friend", "power", "home")
+    return " ".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(8, 16))).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+def synthetic_tmdb(path, params):
+    if path.startswith("/3/search/movie"):
+        query = params.get("query", "movie")
+        base = _number(query) + 1000
+        return {"page": 1, "total_results": 8, "results": [
+            {"id": base + i, "title": f"{query.title()}{' ' + str(i + 1) if i else ''}",
+             "original_title": query.title(), "release_date": f"{2000 + (base + i) % 24}-0{1 + i % 9}-15",
+             "overview": _lorem(base + i, 2), "popularity": 100 - i, "vote_average": 7.1}
+            for i in range(8)
+        ]}
+    if path.startswith(("/3/trending/movie", "/3/movie/popular")):
+        return {"page": 1, "results": [
+            {"id": 2000 + i, "title": f"Popular Movie {i + 1}", "release_date": f"20{10 + i % 15}-05-01"}
+            for i in range(20)
+        ]}
+    if path.startswith("/3/genre/movie/list"):
+        return {"genres": [{"id": 28, "name": "Action"}, {"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}]}
+    match = re.match(r"/3/movie/(\d+)(/reviews)?", path)
+    if match:
+        movie_id = int(match.group(1))
+        reviews = {"page": 1, "results": [
+            {"author": f"user{i}", "content": _lorem(movie_id * 10 + i, 4)} for i in range(5)
+        ]}
+        if match.group(2):
+            return reviews
+        return {
+            "id": movie_id, "title": f"Movie {movie_id}", "original_title": f"Movie {movie_id}",
+            "release_date": f"{2000 + movie_id % 24}-06-01", "runtime": 90 + movie_id % 60,
+            "overview": _lorem(movie_id, 4), "vote_average": 7.4, "vote_count": 1200 + movie_id % 5000,
+            "poster_path": f"/poster{movie_id}.jpg", "imdb_id": f"tt{movie_id:07d}",
+            "genres": [{"id": 28, "name": "Action"}, {"id": 18, "name": "Drama"}],
+            "production_companies": [{"id": 1, "name": "Synthetic Pictures"}],
+            "credits": {
+                "cast": [{"name": f"Actor {movie_id}-{i}", "character": f"Role {i}", "order": i} for i in range(40)],
+                "crew": [{"name": f"Crew {movie_id}-{i}", "job": "Director" if i == 0 else "Grip"} for i in range(120)]
+            },
+            "reviews": reviews,
+            "external_ids": {"imdb_id": f"tt{movie_id:07d}", "wikidata_id": f"Q{movie_id}"},
+            "translations": {"translations": [
+                {"iso_3166_1": "US", "iso_639_1": "en", "data": {"title": f"Movie {movie_id}", "overview": _lorem(movie_id, 4)}}
+            ] + ([
+                # Two movies out of three have a Vietnamese translation on TMDb
+                {"iso_3166_1": "VN", "iso_639_1": "vi", "data": {"title": f"Phim {movie_id}", "overview": _lorem(movie_id + 7, 4)}}
+            ] if movie_id % 3 else [])}
+        }
+    return None
+
+def synthetic_omdb(path, params):
+    if "s" in params:
+        title = params["s"]
+        base = _number(title) + 100000
+        return {"Response": "True", "totalResults": "6", "Search": [
+            {"Title": f"{title.title()}{' ' + str(i + 1) if i else ''}", "Year": str(2000 + (base + i) % 24),
+             "imdbID": f"tt{base + i:07d}", "Type": "movie", "Poster": "N/A"}
+            for i in range(6)
+        ]}
+    key = params.get("i") or params.get("t", "")
+    number = _number(key)
+    return {
+        "Response": "True", "Title": params.get("t") or f"Movie {key}", "Year": str(2000 + number % 24),
+        "Runtime": f"{90 + number % 60} min", "Genre": "Action, Drama", "Director": f"Director {number}",
+        "Actors": ", ".join(f"Actor {number}-{i}" for i in range(4)), "Plot": _lorem(number, 6),
+        "Awards": "Won 2 Oscars. 15 wins & 40 nominations total", "Poster": "N/A",
+        "Ratings": [{"Source": "Internet Movie Database", "Value": "8.1/10"},
+                    {"Source": "Rotten Tomatoes", "Value": "91%"}, {"Source": "Metacritic", "Value": "77/100"}],
+        "imdbRating": "8.1", "imdbVotes": f"{1000 + number:,}", "imdbID": params.get("i") or f"tt{number:07d}",
+        "BoxOffice": f"${number * 1000:,}"
+    }
+
+def synthetic_youtube(path, params):
+    if path.endswith("/videos"):
+        return {"items": [
+            {"id": video_id, "snippet": {"title": f"Review phim {video_id}", "channelTitle": "Phê Phim",
+                                         "channelId": "UCsynthetic", "publishedAt": "2024-01-01T00:00:00Z"}}
+            for video_id in params.get("id", "").split(",") if video_id
+        ]}
+    title = re.split(r"\s(?:\d{4}\s)?review phim", params.get("q", ""))[0]
+    page = int(params.get("pageToken", "0") or 0)
+    items = []
+    for i in range(int(params.get("maxResults", 25))):
+        n = page * 100 + i
+        channel = f"Phê Phim {n % 7}" if n % 3 != 2 else f"Movie Talk {n % 5}"
+        items.append({
+            "id": {"videoId": f"v{_number(title)}x{n}"},
+            "snippet": {
+                "title": f"Review phim {title} #{n}" if n % 4 else f"Top phim hay #{n}",
+                "channelTitle": channel, "channelId": f"UC{_number(channel)}",
+                "publishedAt": f"2024-{1 + n % 12:02d}-10T00:00:00Z",
+                "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/{n}/mqdefault.jpg"}}
+            }
+        })
+    return {"items": items, "nextPageToken": str(page + 1) if page < 4 else None}
+
+def synthetic_wikidata(path, params):
+    entity = params.get("ids", "Q0")
+    return {"entities": {entity: {"sitelinks": {
+        "viwiki": {"site": "viwiki", "title": f"Phim {entity}"},
+        "enwiki": {"site": "enwiki", "title": f"Film {entity}"}
+    }}}}
+
+def synthetic_wikipedia(host, path, params):
+    title = params.get("titles", "")
+    page_id = _number(host + title) + 1
+    page = {"pageid": page_id, "ns": 0, "title": title,
+            "fullurl": f"https://{host}/wiki/{urllib.parse.quote(title)}"}
+    if params.get("prop") == "extracts":
+        page["extract"] = f"{_lorem(page_id, 4)}\n\n== Plot ==\n{_lorem(page_id + 1, 12)}\n\n== Cast ==\n{_lorem(page_id + 2, 3)}"
+    return {"batchcomplete": "", "query": {"pages": {str(page_id): page}}}
+
+def synthetic_openai(body):
+    try:
+        prompt = json.loads(body or b"{}").get("messages", [{}])[-1].get("content", "")
+    except ValueError:
+        prompt = ""
+    if "JSON" in prompt:
+        content = json.dumps({
+            "oscar_awards": [{"category": "Phim hay nhất", "result": "Thắng", "year": "2010"}],
+            "golden_globe_awards": [], "bafta_awards": [], "other_major_awards": [],
+            "total_wins": 15, "total_nominations": 40, "summary": "Tóm tắt giải thưởng tổng hợp."
+        }, ensure_ascii=False)
+    else:
+        content = _lorem(_number(prompt), 12)
+    return {
+        "id": "chatcmpl-synthetic", "object": "chat.completion", "created": int(time.time()),
+        "model": "gpt-3.5-turbo",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                  "total_tokens": (len(prompt) + len(content)) // 4}
+    }
+
+def synthetic_response(method, host, path, query, body):
+    """Generate a plausible upstream response.
+
+    Returns:
+        tuple: (status, content type, body bytes)
+    """
+    params = dict(query)
+    if host == "api.themoviedb.org":
+        data = synthetic_tmdb(path, params)
+    elif host == "www.omdbapi.com":
+        data = synthetic_omdb(path, params)
+    elif host == "www.googleapis.com":
+        data = synthetic_youtube(path, params)
+    elif host == "www.wikidata.org":
+        data = synthetic_wikidata(path, params)
+    elif host.endswith(".wikipedia.org"):
+        data = synthetic_wikipedia(host, path, params)
+    elif host == "api.openai.com":
+        data = synthetic_openai(body)
+    else:
+        data = None
+
+    if data is None:
+        return 404, "application/json", b'{"error": "unknown synthetic endpoint"}'
+    return 200, "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+# ---------------------------------------------------------------------------
+# Latency and error profiles
+# ---------------------------------------------------------------------------
+
+def parse_distribution(spec):
+    """Parse a latency distribution such as 'lognormal:0.08,0.5'.
+
+    Args:
+        spec (str): Distribution name and parameters (see module docstring)
+
+    Returns:
+        callable: Function returning one latency sample in seconds
+    """
+    name, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    samplers = {
+        "const": lambda m: m,
+        "normal": lambda m, sd: max(0.0, random.gauss(m, sd)),
+        "lognormal": lambda median, shape: random.lognormvariate(math.log(median), shape),
+        "uniform": lambda lo, hi: random.uniform(lo, hi),
+        "exp": lambda m: random.expovariate(1 / m) if m else 0.0
+    }
+    if name not in samplers:
+        raise ValueError(f"unknown latency distribution: {name}")
+    sampler = samplers[name]
+    sampler(*values)  # Fail early on a wrong number of parameters
+    return lambda: sampler(*values)
+
+def parse_host_values(items, convert):
+    """Parse repeated HOST=VALUE options; a VALUE without host is the default.
+
+    Args:
+        items (list): Option values
+        convert (callable): Converts each VALUE
+
+    Returns:
+        dict: Converted values by host ('*' for the default)
+    """
+    parsed = {}
+    for item in items or []:
+        host, sep, value = item.rpartition("=")
+        parsed[host if sep else "*"] = convert(value)
+    return parsed
+
+def match_host(values, host):
+    """Get the value configured for a host (exact, then suffix, then default)."""
+    if host in values:
+        return values[host]
+    for pattern, value in values.items():
+        if pattern != "*" and host.endswith("." + pattern):
+            return value
+    return values.get("*")
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+
+class StubServer:
+    """Threaded HTTP server answering upstream requests from fixtures."""
+
+    def __init__(self, mode="replay", host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 fixtures_dir=FIXTURES_DIR, host_latency=None, error_rates=None):
+        """
+        Args:
+            host_latency (dict, optional): Latency samplers by host (see parse_distribution);
+                hosts not listed use the normal latency/jitter distribution
+            error_rates (dict, optional): Share of requests answered with a 503 by host
+                ('*' for all hosts)
+        """
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.host_latency = host_latency or {}
+        self.error_rates = error_rates or {}
+        self.store = FixtureStore(fixtures_dir)
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = {"requests": 0, "bytes": 0, "misses": 0, "errors": 0, "by_host": {}}
+
+    def get_stats(self):
+        with self.stats_lock:
+            return json.loads(json.dumps(self.stats))
+
+    def _count(self, host, size, miss=False, error=False):
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += size
+            self.stats["misses"] += int(miss)
+            self.stats["errors"] += int(error)
+            by_host = self.stats["by_host"].setdefault(host, {"requests": 0, "bytes": 0, "errors": 0})
+            by_host["requests"] += 1
+            by_host["bytes"] += size
+            by_host["errors"] += int(error)
+
+    def delay(self, host):
+        """Simulated upstream latency in seconds."""
+        sampler = match_host(self.host_latency, host)
+        if sampler:
+            return sampler()
+        return max(0.0, random.gauss(self.latency, self.jitter)) if self.latency or self.jitter else 0.0
+
+    def fails(self, host):
+        """Decide whether to answer a request with a simulated upstream error."""
+        rate = match_host(self.error_rates, host)
+        return bool(rate) and random.random() < rate
+
+    def handle(self, method, raw_path, body, headers):
+        """Answer one upstream request.
+
+        Returns:
+            tuple: (status, content type, body bytes)
+        """
+        host, path, query = split_upstream_path(raw_path)
+        key = fixture_key(method, host, path, query, body)
+
+        if self.fails(host):
+            delay = self.delay(host)
+            if delay:
+                time.sleep(delay)
+            content = json.dumps({"error": "simulated upstream error"}).encode()
+            self._count(host, len(content), error=True)
+            return 503, "application/json", content
+
+        if self.mode == "synthetic":
+            status, content_type, content = synthetic_response(method, host, path, query, body)
+        elif self.mode == "record":
+            status, content_type, content = record_upstream(method, host, path, query, body, headers)
+            public_query = [(k, v) for k, v in query if k not in SECRET_PARAMS]
+            self.store.save(host, key, {
+                "request": {"method": method, "url": f"https://{host}{path}?{urllib.parse.urlencode(public_query)}"},
+                "status": status,
+                "content_type": content_type,
+                "body": content.decode("utf-8", errors="replace")
+            })
+        else:
+            fixture = self.store.load(host, key)
+            if fixture is None:
+                self._count(host, 0, miss=True)
+                return 502, "application/json", json.dumps({"error": f"no fixture for {method} {host}{path}"}).encode()
+            status, content_type, content = fixture["status"], fixture["content_type"], fixture["body"].encode("utf-8")
+
+        delay = self.delay(host)
+        if delay:
+            time.sleep(delay)
+        self._count(host, len(content))
+        return status, content_type, content
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, status, content_type, content):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if self.path.startswith("/__stats"):
+                    self._respond(200, "application/json", json.dumps(server.get_stats()).encode())
+                    return
+                if self.path.startswith("/__reset"):
+                    server.reset_stats()
+                    self._respond(200, "application/json", b"{}")
+                    return
+                self._respond(*server.handle(self.command, self.path, body, dict(self.headers)))
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def start(self):
+        """Serve in a background thread.
+
+        Returns:
+            StubServer: self
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay stub server for the upstream APIs")
+    parser.add_argument("mode", choices=["record", "replay", "synthetic"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean added latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="standard deviation of the latency")
+    parser.add_argument("--host-latency", action="append", metavar="HOST=DIST",
+                        help="latency distribution of one upstream host, e.g. www.omdbapi.com=lognormal:0.2,0.8")
+    parser.add_argument("--error-rate", action="append", metavar="[HOST=]RATE",
+                        help="share of requests answered with a 503, for one host or all")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="fixtures directory")
+    args = parser.parse_args()
+
+    server = StubServer(args.mode, args.host, args.port, args.latency, args.jitter, args.fixtures,
+                        host_latency=parse_host_values(args.host_latency, parse_distribution),
+                        error_rates=parse_host_values(args.error_rate, float))
+    print(f"Stub server ({args.mode}) on {server.url} - set UPSTREAM_OVERRIDE={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -13,19 +13,23 @@ import os
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import OMDB_API_KEY, OMDB_BASE_URL
+from utils import cache, fastjson, http_client, tracing
 
-def get_omdb_ratings(title, year=None):
-    """Get ratings from OMDb API (IMDb, Rotten Tomatoes, Metacritic).
+def build_lookup_params(title, year=None, imdb_id=None):
+    """Build OMDb lookup parameters, preferring the exact IMDb ID over the title.
     
     Args:
         title (str): Movie title
         year (str, optional): Release year
+        imdb_id (str, optional): IMDb ID, skips title matching when given
         
     Returns:
-        tuple: Tuple of (ratings list, IMDb ID)
+        dict: Request parameters (without API key)
     """
+    if imdb_id:
+        return {"i": imdb_id, "r": "json"}
+    
     params = {
-        "apikey": OMDB_API_KEY,
         "t": title,
         "type": "movie",
         "r": "json"
@@ -33,11 +37,28 @@ def get_omdb_ratings(title, year=None):
     
     if year:
         params["y"] = year
+    
+    return params
+
+@tracing.traced("omdb.get_omdb_ratings")
+def get_omdb_ratings(title, year=None, imdb_id=None):
+    """Get ratings from OMDb API (IMDb, Rotten Tomatoes, Metacritic).
+    
+    Args:
+        title (str): Movie title
+        year (str, optional): Release year
+        imdb_id (str, optional): IMDb ID, skips title matching when given
+        
+    Returns:
+        tuple: Tuple of (ratings list, IMDb ID)
+    """
+    params = build_lookup_params(title, year, imdb_id)
+    params["apikey"] = OMDB_API_KEY
         
     try:
-        response = requests.get(OMDB_BASE_URL, params=params)
+        response = http_client.get(OMDB_BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = fastjson.decode_response(response)
         
         if data.get("Response") == "True":
             return data.get("Ratings", []), data.get("imdbID", "")
@@ -46,16 +67,20 @@ def get_omdb_ratings(title, year=None):
         print(f"Error getting OMDb data: {e}")
         return [], ""
 
-def get_omdb_details(title, year=None, plot_length="full"):
+@tracing.traced("omdb.get_omdb_details")
+@cache.cached("omdb_details")
+def get_omdb_details(title, year=None, plot_length="full", imdb_id=None):
     """Get detailed movie information from OMDb including plot.
     
     Args:
         title (str): Movie title
         year (str, optional): Release year
         plot_length (str, optional): 'short' or 'full' plot summary
+        imdb_id (str, optional): IMDb ID, skips title matching when given
         
     Returns:
-        dict: Movie details including plot, IMDb ID and ratings
+        dict: Movie details including plot, IMDb ID and ratings; 'not_found'
+            is True when OMDb has no such movie (as opposed to a failed request)
     """
     # Default result structure
     result = {
@@ -67,28 +92,22 @@ def get_omdb_details(title, year=None, plot_length="full"):
         'actors': [],
         'awards': '',
         'poster': '',
-        'source': 'IMDb'
+        'source': 'IMDb',
+        'not_found': False
     }
     
     # Check if API key is available
     if OMDB_API_KEY == "your_omdb_api_key" or not OMDB_API_KEY:
         return result
     
-    params = {
-        "apikey": OMDB_API_KEY,
-        "t": title,
-        "type": "movie",
-        "plot": plot_length,
-        "r": "json"
-    }
-    
-    if year:
-        params["y"] = year
+    params = build_lookup_params(title, year, imdb_id)
+    params["apikey"] = OMDB_API_KEY
+    params["plot"] = plot_length
         
     try:
-        response = requests.get(OMDB_BASE_URL, params=params)
+        response = http_client.get(OMDB_BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = fastjson.decode_response(response)
         
         if data.get("Response") == "True":
             result['success'] = True
@@ -103,6 +122,9 @@ def get_omdb_details(title, year=None, plot_length="full"):
             # Add IMDb URL if we have an ID
             if result['imdb_id']:
                 result['url'] = f"https://www.imdb.com/title/{result['imdb_id']}"
+        else:
+            # e.g. "Movie not found!": asking again soon gives the same answer
+            result['not_found'] = True
         
         return result
     except requests.exceptions.RequestException as e:
@@ -12,8 +12,11 @@ import os
 
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import TMDB_API_KEY, TMDB_BASE_URL, LANGUAGE
+from config import TMDB_API_KEY, TMDB_BASE_URL, LANGUAGE, TARGET_LOCALE
+from utils import cache, fastjson, http_client, tracing
+import models
 
+@tracing.traced("tmdb.search_movie")
 def search_movie(query):
     """Search for movies by title.
     
@@ -33,37 +36,118 @@ def search_movie(query):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        return response.json()["results"]
+        return fastjson.decode_response(response)["results"]
     except requests.exceptions.RequestException as e:
         print(f"Error searching for movie: {e}")
         return []
 
+@tracing.traced("tmdb.get_trending_movies")
+def get_trending_movies(time_window="day"):
+    """Get the movies trending on TMDb.
+    
+    Args:
+        time_window (str, optional): 'day' or 'week'
+        
+    Returns:
+        list: List of movie results, most trending first
+    """
+    url = f"{TMDB_BASE_URL}/trending/movie/{time_window}"
+    params = {
+        "api_key": TMDB_API_KEY,
+        "language": LANGUAGE
+    }
+    
+    try:
+        response = http_client.get(url, params=params)
+        response.raise_for_status()
+        return fastjson.decode_response(response)["results"]
+    except requests.exceptions.RequestException as e:
+        print(f"Error getting trending movies: {e}")
+        return []
+
+@tracing.traced("tmdb.get_popular_movies")
+def get_popular_movies(page=1):
+    """Get the most popular movies on TMDb.
+    
+    Args:
+        page (int, optional): Result page (20 movies per page)
+        
+    Returns:
+        list: List of movie results, most popular first
+    """
+    url = f"{TMDB_BASE_URL}/movie/popular"
+    params = {
+        "api_key": TMDB_API_KEY,
+        "language": LANGUAGE,
+        "page": page
+    }
+    
+    try:
+        response = http_client.get(url, params=params)
+        response.raise_for_status()
+        return fastjson.decode_response(response)["results"]
+    except requests.exceptions.RequestException as e:
+        print(f"Error getting popular movies: {e}")
+        return []
+
+@tracing.traced("tmdb.get_genre_list")
+def get_genre_list(language=LANGUAGE):
+    """Get the movie genres of TMDb with their names in a language.
+
+    Args:
+        language (str, optional): Language of the names (e.g. 'vi-VN')
+
+    Returns:
+        list: List of {'id', 'name'} dicts, empty if request fails
+    """
+    url = f"{TMDB_BASE_URL}/genre/movie/list"
+    params = {
+        "api_key": TMDB_API_KEY,
+        "language": language
+    }
+
+    try:
+        response = http_client.get(url, params=params)
+        response.raise_for_status()
+        return fastjson.decode_response(response)["genres"]
+    except requests.exceptions.RequestException as e:
+        print(f"Error getting genre list: {e}")
+        return []
+
+@tracing.traced("tmdb.get_movie_details")
+@cache.cached("tmdb_details", encode=models.Movie.to_cache, decode=models.Movie.from_cache)
 def get_movie_details(movie_id):
     """Get detailed information about a movie.
     
+    Only the fields the views use are kept (e.g. the directors and the
+    top-billed cast out of the full credits), so the cached records stay small.
+    TMDb's Vietnamese title and overview, where it has them, come in the same
+    call (appended translations), so they need no machine translation.
+    
     Args:
         movie_id (int): TMDb movie ID
         
     Returns:
-        dict: Movie details or None if request fails
+        Movie: Movie record or None if request fails
     """
     url = f"{TMDB_BASE_URL}/movie/{movie_id}"
     params = {
         "api_key": TMDB_API_KEY,
         "language": LANGUAGE,
-        "append_to_response": "credits,reviews"
+        "append_to_response": "credits,external_ids,translations"
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return models.Movie.from_tmdb(fastjson.decode_response(response), locale=TARGET_LOCALE)
     except requests.exceptions.RequestException as e:
         print(f"Error getting movie details: {e}")
         return None
 
+@tracing.traced("tmdb.get_movie_credits")
 def get_movie_credits(movie_id):
     """Get cast and crew information for a movie.
     
@@ -79,13 +163,14 @@ def get_movie_credits(movie_id):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return fastjson.decode_response(response)
     except requests.exceptions.RequestException as e:
         print(f"Error getting movie credits: {e}")
         return None
 
+@tracing.traced("tmdb.get_movie_reviews")
 def get_movie_reviews(movie_id, limit=3):
     """Get user reviews for a movie.
     
@@ -104,9 +189,9 @@ def get_movie_reviews(movie_id, limit=3):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        results = response.json().get("results", [])
+        results = fastjson.decode_response(response).get("results", [])
         return results[:limit]  # Return only the specified number of reviews
     except requests.exceptions.RequestException as e:
         print(f"Error getting movie reviews: {e}")
@@ -128,47 +213,15 @@ def extract_movie_data(movie_details):
     """Extract relevant data from movie details.
     
     Args:
-        movie_details (dict): Full movie details from TMDb API
+        movie_details (Movie or dict): Movie record from get_movie_details(),
+            or full movie details from TMDb API
         
     Returns:
-        dict: Simplified movie data
+        dict: Simplified movie data (see models.Movie.to_dict)
     """
     if not movie_details:
         return {}
     
-    # Extract basic information
-    data = {
-        "title": movie_details.get("title", "Không có tên"),
-        "original_title": movie_details.get("original_title", ""),
-        "release_date": movie_details.get("release_date", ""),
-        "release_year": movie_details.get("release_date", "")[:4] if movie_details.get("release_date") else None,
-        "runtime": movie_details.get("runtime", 0),
-        "overview": movie_details.get("overview", "Không có mô tả"),
-        "vote_average": movie_details.get("vote_average", 0),
-        "vote_count": movie_details.get("vote_count", 0),
-        "poster_path": movie_details.get("poster_path", ""),
-    }
-    
-    # Extract genres
-    data["genres"] = []
-    for genre in movie_details.get("genres", []):
-        data["genres"].append(genre.get("name", ""))
-    
-    # Extract production companies
-    data["production_companies"] = []
-    for company in movie_details.get("production_companies", []):
-        data["production_companies"].append(company.get("name", ""))
-    
-    # Extract directors and cast
-    data["directors"] = []
-    data["cast"] = []
-    credits = movie_details.get("credits", {})
-    
-    for crew_member in credits.get("crew", []):
-        if crew_member.get("job") == "Director":
-            data["directors"].append(crew_member.get("name", ""))
-    
-    for cast_member in credits.get("cast", [])[:5]:  # Get top 5 cast members
-        data["cast"].append(cast_member.get("name", ""))
-    
-    return data 
\ No newline at end of file
+    if not isinstance(movie_details, models.Movie):
+        movie_details = models.Movie.from_tmdb(movie_details)
+    return movie_details.to_dict()
\ No newline at end of file
@@ -7,13 +7,15 @@ Handles fetching plot summaries and other information from Wikipedia.
 """
 
 import wikipediaapi
+import requests
 import sys
 import os
 import re
 
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import TARGET_LANGUAGE
+from config import TARGET_LANGUAGE, WIKIDATA_API_URL
+from utils import cache, fastjson, http_client, tracing
 
 # Initialize Wikipedia API with a custom user agent
 user_agent = 'MovieSearchApp/1.0 (quangvu@example.com)'
@@ -30,56 +32,146 @@ wiki_en = wikipediaapi.Wikipedia(
     user_agent=user_agent
 )
 
-def get_movie_plot(movie_title, year=None, fallback_to_english=True):
+# Send Wikipedia requests through the shared upstream transport
+http_client.install(wiki_wiki._session)
+http_client.install(wiki_en._session)
+
+@tracing.traced("wikipedia.get_page_titles")
+@cache.cached("wikidata_sitelinks", store_if=bool)  # Empty on errors: not cached
+def get_page_titles(wikidata_id):
+    """Resolve Wikipedia page titles for a Wikidata item.
+    
+    One Wikidata call replaces the page-name guessing in get_movie_plot().
+    
+    Args:
+        wikidata_id (str): Wikidata item ID (e.g. 'Q25188'), from TMDb external_ids
+        
+    Returns:
+        dict: Language code -> page title, empty if unknown or on error
+    """
+    if not wikidata_id:
+        return {}
+    
+    target_language = TARGET_LANGUAGE.split('-')[0]
+    params = {
+        "action": "wbgetentities",
+        "ids": wikidata_id,
+        "props": "sitelinks",
+        "sitefilter": f"{target_language}wiki|enwiki",
+        "format": "json"
+    }
+    
+    try:
+        response = http_client.get(WIKIDATA_API_URL, params=params, headers={"User-Agent": user_agent})
+        response.raise_for_status()
+        sitelinks = fastjson.decode_response(response).get("entities", {}).get(wikidata_id, {}).get("sitelinks", {})
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error getting Wikidata sitelinks: {e}")
+        return {}
+    
+    titles = {}
+    for language in (target_language, 'en'):
+        title = sitelinks.get(f"{language}wiki", {}).get("title")
+        if title:
+            titles[language] = title
+    return titles
+
+@tracing.traced("wikipedia.get_movie_plot")
+@cache.cached("wikipedia_plot")
+def get_movie_plot(movie_title, year=None, fallback_to_english=True, page_titles=None):
     """Get movie plot summary from Wikipedia.
     
     Args:
         movie_title (str): Movie title
         year (str, optional): Release year to help disambiguate
         fallback_to_english (bool): Whether to try English Wikipedia if target language fails
+        page_titles (dict, optional): Known page titles by language code; when given,
+            those pages are read directly and no title guessing is done
         
     Returns:
-        dict: Dictionary with plot, source_url, and language
+        dict: Dictionary with plot, source_url, language and page_title;
+            'not_found' is True when every page was checked without finding a plot
     """
     result = {
         'plot': '',
         'source_url': '',
         'language': TARGET_LANGUAGE.split('-')[0],
-        'success': False
+        'page_title': '',
+        'success': False,
+        'not_found': False
     }
     
-    # Try with year for more specific search
-    search_term = f"{movie_title} ({year})" if year else movie_title
-    search_term_film = f"{movie_title} film" if not year else f"{movie_title} film {year}"
+    try:
+        if page_titles:
+            result = get_plot_from_known_pages(page_titles, result, fallback_to_english)
+            result['not_found'] = not result['success']
+            return result
     
-    # Try different search terms
-    search_terms = [
-        search_term,
-        search_term_film,
-        movie_title  # Simplest form as last resort
-    ]
+        # Try with year for more specific search
+        search_term = f"{movie_title} ({year})" if year else movie_title
+        search_term_film = f"{movie_title} film" if not year else f"{movie_title} film {year}"
     
-    # Try each search term in target language
-    for term in search_terms:
-        page = wiki_wiki.page(term)
-        if page.exists():
-            result = extract_plot_from_page(page, result)
-            if result['success']:
-                return result
+        # Try different search terms
+        search_terms = [
+            search_term,
+            search_term_film,
+            movie_title  # Simplest form as last resort
+        ]
     
-    # If all failed and fallback is enabled, try English Wikipedia
-    if fallback_to_english:
-        result['language'] = 'en'
+        # Try each search term in target language
         for term in search_terms:
-            page = wiki_en.page(term)
+            page = wiki_wiki.page(term)
             if page.exists():
                 result = extract_plot_from_page(page, result)
                 if result['success']:
                     return result
     
+        # If all failed and fallback is enabled, try English Wikipedia
+        if fallback_to_english:
+            result['language'] = 'en'
+            for term in search_terms:
+                page = wiki_en.page(term)
+                if page.exists():
+                    result = extract_plot_from_page(page, result)
+                    if result['success']:
+                        return result
+        
+        # Every candidate page was probed without errors
+        result['not_found'] = True
+    except requests.exceptions.RequestException as e:
+        print(f"Error getting Wikipedia plot: {e}")
+    
     # If we still don't have a plot, return empty result
     return result
 
+def get_plot_from_known_pages(page_titles, result, fallback_to_english=True):
+    """Get movie plot from already identified Wikipedia pages.
+    
+    Args:
+        page_titles (dict): Language code -> page title
+        result (dict): Result dictionary to update
+        fallback_to_english (bool): Whether to read the English page if the target language fails
+        
+    Returns:
+        dict: Updated result dictionary
+    """
+    candidates = [(result['language'], wiki_wiki)]
+    if fallback_to_english and result['language'] != 'en':
+        candidates.append(('en', wiki_en))
+    
+    for language, wiki in candidates:
+        title = page_titles.get(language)
+        if not title:
+            continue
+        result['language'] = language
+        page = wiki.page(title)
+        if page.exists():
+            result = extract_plot_from_page(page, result)
+            if result['success']:
+                return result
+    
+    return result
+
 def extract_plot_from_page(page, result):
     """Extract plot section from Wikipedia page.
     
@@ -106,6 +198,7 @@ def extract_plot_from_page(page, result):
             if plot_text:
                 result['plot'] = plot_text
                 result['source_url'] = page.fullurl
+                result['page_title'] = page.title
                 result['success'] = True
                 return result
     
@@ -115,6 +208,7 @@ def extract_plot_from_page(page, result):
     if summary and len(summary) > 200:  # Ensure it's substantial
         result['plot'] = summary
         result['source_url'] = page.fullurl
+        result['page_title'] = page.title
         result['success'] = True
         return result
     
@@ -146,6 +240,7 @@ def extract_plot_from_page(page, result):
         if relevant_paragraphs:
             result['plot'] = '\n\n'.join(relevant_paragraphs[:3])  # Limit to first 3 paragraphs
             result['source_url'] = page.fullurl
+            result['page_title'] = page.title
             result['success'] = True
             
     return result 
\ No newline at end of file
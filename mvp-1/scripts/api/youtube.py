@@ -10,41 +10,35 @@ import requests
 import urllib.parse
 import sys
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
 # Add parent directory to sys.path to import config and utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import YOUTUBE_API_KEY, YOUTUBE_API_URL, DEFAULT_SEARCH_SUFFIX, YOUTUBE_RESULT_LIMIT
+from config import (YOUTUBE_API_KEY, YOUTUBE_API_URL, YOUTUBE_VIDEOS_URL, DEFAULT_SEARCH_SUFFIX,
+                    YOUTUBE_RESULT_LIMIT, YOUTUBE_DAILY_QUOTA, YOUTUBE_QUOTA_RESERVE,
+                    YOUTUBE_SEARCH_COST, YOUTUBE_VIDEOS_COST, YOUTUBE_MAX_SEARCH_PAGES,
+                    TRANSCRIPT_CANDIDATES, TRANSCRIPT_DEADLINE)
+from utils import blobstore, cache, cache_backend, fastjson, http_client, metrics, quota, resilience, tracing, youtube_filters
 
-def is_vietnamese_channel(channel_title):
+# Partial responses: ask only for the parts read by youtube_filters and build_video_info
+SEARCH_FIELDS = "nextPageToken,items(id/videoId,snippet(title,channelId,channelTitle,publishedAt,thumbnails/medium/url))"
+VIDEOS_FIELDS = "items(id,snippet(title,channelTitle,publishedAt,thumbnails/medium/url))"
+
+def is_vietnamese_channel(channel_title, channel_id=None):
     """Check if a YouTube channel is likely Vietnamese based on its title.
     
     Args:
         channel_title (str): The title of the YouTube channel
+        channel_id (str, optional): The channel id, used to memoize the result
         
     Returns:
         bool: True if the channel appears to be Vietnamese
     """
-    # List of common Vietnamese words/patterns in channel names
-    vn_patterns = [
-        'review', 'phim', 'điện ảnh', 'phê phim', 'xem phim',
-        'việt', 'viet', 'vn', '.vn', 'vietnam',
-        'phim hay', 'phim mới', 'phim chiếu rạp',
-        'cine', 'cinema', 'rap', 'rạp'
-    ]
-    
-    # Convert to lowercase for case-insensitive matching
-    channel_lower = channel_title.lower()
-    
-    # Check for Vietnamese diacritical marks
-    vietnamese_chars = 'àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ'
-    has_vietnamese_chars = any(c in vietnamese_chars for c in channel_lower)
-    
-    # Check for Vietnamese patterns
-    has_vn_pattern = any(pattern.lower() in channel_lower for pattern in vn_patterns)
-    
-    return has_vietnamese_chars or has_vn_pattern
+    return youtube_filters.is_vietnamese_channel(channel_title, channel_id)
 
 def contains_movie_title(video_title, movie_title):
     """Check if a video title contains the movie title.
@@ -56,33 +50,69 @@ def contains_movie_title(video_title, movie_title):
     Returns:
         bool: True if the video title contains the movie title
     """
-    # Convert both to lowercase for case-insensitive matching
-    video_lower = video_title.lower()
-    movie_lower = movie_title.lower()
-    
-    # Remove common special characters from movie title
-    movie_clean = ''.join(c for c in movie_lower if c.isalnum() or c.isspace())
-    
-    # Split movie title into words
-    movie_words = movie_clean.split()
-    
-    # For single word titles, check if it exists as a whole word
-    if len(movie_words) == 1:
-        import re
-        pattern = r'\b' + re.escape(movie_clean) + r'\b'
-        return bool(re.search(pattern, video_lower))
-    
-    # For multi-word titles, check if all words are present in order
-    current_pos = 0
-    for word in movie_words:
-        pos = video_lower.find(word, current_pos)
-        if pos == -1:
-            return False
-        current_pos = pos + len(word)
+    return youtube_filters.matches_title(youtube_filters.compile_title_matcher(movie_title), video_title)
+
+def build_video_info(video_id, snippet):
+    """Build the video information dictionary used by the UI.
     
-    return True
+    Args:
+        video_id (str): YouTube video ID
+        snippet (dict): 'snippet' part of a search or videos API item
+        
+    Returns:
+        dict: Video information
+    """
+    published_at = snippet.get("publishedAt", "")
+    return {
+        "title": snippet.get("title", ""),
+        "channel": snippet.get("channelTitle", ""),
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "published_at": published_at[:10] if published_at else "",  # Just get the date part
+        "thumbnail": snippet.get("thumbnails", {}).get("medium", {}).get("url", ""),
+        "video_id": video_id
+    }
+
+@tracing.traced("youtube.get_videos_by_id")
+def get_videos_by_id(video_ids):
+    """Get video information for known video ids.
+    
+    Uses videos.list (1 quota unit) instead of search.list (100 quota units).
+    
+    Args:
+        video_ids (list): YouTube video IDs
+        
+    Returns:
+        list: List of YouTube video information, in the given order
+    """
+    if not video_ids or not check_api_key():
+        return []
+    
+    if not quota.try_spend("youtube", YOUTUBE_API_KEY, YOUTUBE_VIDEOS_COST, YOUTUBE_DAILY_QUOTA):
+        return []
+    
+    params = {
+        "key": YOUTUBE_API_KEY,
+        "id": ",".join(video_ids[:50]),
+        "part": "snippet",
+        "fields": VIDEOS_FIELDS
+    }
+    
+    try:
+        response = http_client.get(YOUTUBE_VIDEOS_URL, params=params)
+        if is_quota_exceeded(response):
+            quota.mark_exhausted("youtube", YOUTUBE_API_KEY, YOUTUBE_DAILY_QUOTA)
+            return []
+        response.raise_for_status()
+        items = {item.get("id"): item.get("snippet", {}) for item in fastjson.decode_response(response).get("items", [])}
+    except requests.exceptions.RequestException as e:
+        print(f"Error getting YouTube videos: {e}")
+        return []
+    
+    # Videos may have been deleted since they were found; keep the rest in order
+    return [build_video_info(video_id, items[video_id]) for video_id in video_ids if video_id in items]
 
-def get_youtube_reviews(movie_title, year=None, limit=None, custom_keywords=None):
+@tracing.traced("youtube.get_youtube_reviews")
+def get_youtube_reviews(movie_title, year=None, limit=None, custom_keywords=None, video_ids=None):
     """Search for movie reviews on YouTube using the YouTube API.
     
     Args:
@@ -90,6 +120,8 @@ def get_youtube_reviews(movie_title, year=None, limit=None, custom_keywords=None
         year (str, optional): Release year of the movie
         limit (int, optional): Maximum number of results to return
         custom_keywords (str, optional): Custom search keywords provided by user
+        video_ids (list, optional): Video ids found by an earlier search; when
+            given they are fetched directly and the search is skipped
         
     Returns:
         list: List of YouTube video information
@@ -102,58 +134,91 @@ def get_youtube_reviews(movie_title, year=None, limit=None, custom_keywords=None
     if not check_api_key():
         return []
     
+    if video_ids:
+        results = get_videos_by_id(video_ids[:limit])
+        if results:
+            return results
+    
+    # Skip the search (100 quota units a page) if it recently found no Vietnamese review
+    negative_key = cache.make_key(movie_title, year, custom_keywords)
+    if cache.get_negative("youtube_reviews", negative_key) is not None:
+        return []
+    
     # Prepare search query
     query = f"{movie_title} {year} review phim" if year else f"{movie_title} review phim"
     query += f" {custom_keywords}" if custom_keywords else f" {DEFAULT_SEARCH_SUFFIX}"
     
-    # Set up API request with a higher maxResults to account for filtering
+    # search.list costs the same for any maxResults, so always ask for a full page
     params = {
         "key": YOUTUBE_API_KEY,
         "q": query,
         "part": "snippet",
         "type": "video",
-        "maxResults": min(50, limit * 3),  # Request more results to filter
-        "relevanceLanguage": "vi"
+        "maxResults": 50,
+        "relevanceLanguage": "vi",
+        "fields": SEARCH_FIELDS
     }
     
-    try:
-        # Make API request
-        response = requests.get(YOUTUBE_API_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Process and filter results
-        results = []
-        for item in data.get("items", []):
-            video_id = item.get("id", {}).get("videoId", "")
-            snippet = item.get("snippet", {})
-            title = snippet.get("title", "")
-            channel = snippet.get("channelTitle", "")
-            published_at = snippet.get("publishedAt", "")
-            thumbnail = snippet.get("thumbnails", {}).get("medium", {}).get("url", "")
+    results = []
+    seen_ids = set()
+    completed = True
+    for page in range(YOUTUBE_MAX_SEARCH_PAGES):
+        # Degrade to whatever we already have instead of exhausting the daily quota
+        if not quota.try_spend("youtube", YOUTUBE_API_KEY, YOUTUBE_SEARCH_COST,
+                               YOUTUBE_DAILY_QUOTA, reserve=YOUTUBE_QUOTA_RESERVE):
+            print("Cảnh báo: Hạn mức YouTube API hôm nay sắp hết, bỏ qua tìm kiếm video.")
+            completed = False
+            break
+        
+        try:
+            # Make API request
+            response = http_client.get(YOUTUBE_API_URL, params=params)
+            if is_quota_exceeded(response):
+                quota.mark_exhausted("youtube", YOUTUBE_API_KEY, YOUTUBE_DAILY_QUOTA)
+                print("Cảnh báo: Đã hết hạn mức YouTube API hôm nay.")
+                completed = False
+                break
+            response.raise_for_status()
+            data = fastjson.decode_response(response)
+        except requests.exceptions.RequestException as e:
+            print(f"Error searching YouTube: {e}")
+            completed = False
+            break
+        
+        # Keep only Vietnamese reviews that mention the movie title
+        for video_id, snippet in youtube_filters.filter_review_items(data.get("items", []), movie_title, seen_ids):
+            results.append(build_video_info(video_id, snippet))
             
-            # Only include videos from Vietnamese channels that contain the movie title
-            if (video_id and title and 
-                is_vietnamese_channel(channel) and 
-                contains_movie_title(title, movie_title)):
-                
-                results.append({
-                    "title": title,
-                    "channel": channel,
-                    "url": f"https://www.youtube.com/watch?v={video_id}",
-                    "published_at": published_at[:10] if published_at else "",  # Just get the date part
-                    "thumbnail": thumbnail,
-                    "video_id": video_id
-                })
-                
-                # Break if we have enough Vietnamese results
-                if len(results) >= limit:
-                    break
-                
-        return results
-    except requests.exceptions.RequestException as e:
-        print(f"Error searching YouTube: {e}")
-        return []
+            # Stop as soon as we have enough Vietnamese results
+            if len(results) >= limit:
+                return results
+        
+        # Only fetch the next page while filtered results are still missing
+        next_page_token = data.get("nextPageToken")
+        if not next_page_token:
+            break
+        params["pageToken"] = next_page_token
+    
+    if not results and completed:
+        cache.set_negative("youtube_reviews", negative_key, [])
+    return results
+
+def is_quota_exceeded(response):
+    """Check if a YouTube API response reports an exhausted quota.
+    
+    Args:
+        response (requests.Response): YouTube API response
+        
+    Returns:
+        bool: True if the daily quota has been exceeded
+    """
+    if response.status_code != 403:
+        return False
+    try:
+        errors = fastjson.decode_response(response).get("error", {}).get("errors", [])
+    except ValueError:
+        return False
+    return any(error.get("reason") in ("quotaExceeded", "dailyLimitExceeded") for error in errors)
 
 def check_api_key():
     """Check if the YouTube API key is valid.
@@ -169,6 +234,82 @@ def check_api_key():
         return False
     return True
 
+# Transcript kinds in order of preference
+TRANSCRIPT_KINDS = ["vi", "en>vi", "auto>vi"]
+
+# Transcript cache lookups (reported by the HTTP service); updated from the transcript worker threads
+transcript_cache_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+def load_cached_transcripts(video_id):
+    """Load cached transcripts of a video.
+    
+    Args:
+        video_id (str): YouTube video ID
+        
+    Returns:
+        dict: Cache entry with 'languages' (kind -> segments), 'disabled' and
+            'stored_at', or None if the video has not been fetched yet
+    """
+    backend = cache_backend.default_backend
+    key = f"transcripts/{video_id}"
+    try:
+        entry = backend.get(key)
+        if entry is not None and "stored_at" not in entry and isinstance(backend, cache_backend.FileBackend):
+            entry["stored_at"] = os.path.getmtime(backend.path(key))  # Entries written before it was recorded
+    except OSError as e:
+        print(f"Error reading cached transcript: {e}")
+        return None
+    return entry
+
+def save_cached_transcripts(video_id, entry):
+    """Save transcripts of a video to the cache.
+    
+    Args:
+        video_id (str): YouTube video ID
+        entry (dict): Cache entry (see load_cached_transcripts)
+    """
+    backend = cache_backend.default_backend
+    try:
+        languages = entry.get("languages", {})
+        if not backend.shared:
+            # The segments of each transcript are stored as one blob
+            languages = {kind: blobstore.put_value(segments) for kind, segments in languages.items()}
+        backend.set(f"transcripts/{video_id}", dict(entry, languages=languages, stored_at=time.time()))
+    except OSError as e:
+        print(f"Error caching transcript: {e}")
+
+def select_transcript(transcript_list):
+    """Pick the preferred transcript of a video.
+    
+    Args:
+        transcript_list (TranscriptList): Transcripts available for the video
+        
+    Returns:
+        tuple: (kind, Transcript) where kind is one of TRANSCRIPT_KINDS
+        
+    Raises:
+        NoTranscriptFound: If the video has no usable transcript
+    """
+    try:
+        # Native Vietnamese transcript
+        return "vi", transcript_list.find_manually_created_transcript(['vi'])
+    except NoTranscriptFound:
+        pass
+    
+    try:
+        # Manually created English transcript, translated to Vietnamese
+        return "en>vi", transcript_list.find_manually_created_transcript(['en']).translate('vi')
+    except NoTranscriptFound:
+        pass
+    
+    # Auto-generated transcript (Vietnamese, otherwise English translated)
+    transcript = transcript_list.find_generated_transcript(['vi', 'en'])
+    if transcript.language_code != 'vi':
+        transcript = transcript.translate('vi')
+    return "auto>vi", transcript
+
+@tracing.traced("youtube.get_video_transcript")
 def get_video_transcript(video_id):
     """Get transcript (subtitles) from a YouTube video.
     
@@ -179,43 +320,133 @@ def get_video_transcript(video_id):
         dict: Dictionary containing success status and transcript data
             - success (bool): Whether transcript was retrieved successfully
             - transcript (list): List of transcript segments with text and timestamps
+            - language (str): Kind of transcript (see TRANSCRIPT_KINDS)
+            - video_id (str): YouTube video ID
             - error (str): Error message if any
     """
+    result = {
+        "success": False,
+        "transcript": None,
+        "language": None,
+        "video_id": video_id,
+        "error": None
+    }
+    
+    # Serve from cache (a cached 'disabled' entry means the video has no transcript)
+    cached = load_cached_transcripts(video_id)
+    tracing.annotate(cache="hit" if cached else "miss")
+    with _stats_lock:
+        transcript_cache_stats["hits" if cached else "misses"] += 1
+    if cached:
+        cache.note_freshness("transcripts", cached["stored_at"])
+        for kind in TRANSCRIPT_KINDS:
+            if kind in cached.get("languages", {}):
+                result.update(success=True, transcript=cached["languages"][kind], language=kind)
+                return result
+        if cached.get("disabled"):
+            result["error"] = "Phụ đề đã bị tắt cho video này."
+            return result
+    
+    # Videos recently found without a usable transcript
+    known_miss = cache.get_negative("transcripts", video_id)
+    if known_miss is not None:
+        return known_miss
+    
+    # The transcript API has its own HTTP client, so it is kept out explicitly
+    if resilience.is_offline():
+        result["error"] = "Không có phụ đề đã lưu cho video này (chế độ ngoại tuyến)."
+        return result
+    
+    cache.note_freshness("transcripts", time.time())
     try:
-        # Try to get Vietnamese transcript first
         transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        try:
-            # Try to get Vietnamese transcript
-            transcript = transcript_list.find_transcript(['vi'])
-        except NoTranscriptFound:
-            try:
-                # If Vietnamese not available, get English and translate
-                transcript = transcript_list.find_transcript(['en'])
-                transcript = transcript.translate('vi')
-            except NoTranscriptFound:
-                # If no English transcript, get auto-generated and translate
-                transcript = transcript_list.find_generated_transcript(['en'])
-                transcript = transcript.translate('vi')
+        kind, transcript = select_transcript(transcript_list)
         
         # Get the actual transcript data
         transcript_data = transcript.fetch()
         
-        return {
-            "success": True,
-            "transcript": transcript_data,
-            "error": None
-        }
+        entry = cached or {"languages": {}}
+        entry["languages"][kind] = transcript_data
+        save_cached_transcripts(video_id, entry)
+        
+        result.update(success=True, transcript=transcript_data, language=kind)
+        return result
         
     except TranscriptsDisabled:
-        return {
-            "success": False,
-            "transcript": None,
-            "error": "Phụ đề đã bị tắt cho video này."
-        }
+        save_cached_transcripts(video_id, {"languages": {}, "disabled": True})
+        result["error"] = "Phụ đề đã bị tắt cho video này."
+        return result
+    except NoTranscriptFound:
+        result["error"] = "Không có phụ đề phù hợp cho video này."
+        cache.set_negative("transcripts", video_id, result)
+        return result
     except Exception as e:
-        return {
-            "success": False,
-            "transcript": None,
-            "error": f"Không thể lấy phụ đề: {str(e)}"
-        } 
\ No newline at end of file
+        result["error"] = f"Không thể lấy phụ đề: {str(e)}"
+        return result
+
+@tracing.traced("youtube.get_best_transcript")
+def get_best_transcript(video_ids, max_videos=None, deadline=None):
+    """Fetch transcripts of several videos concurrently and pick the best one.
+    
+    Native Vietnamese transcripts are preferred over translated English ones,
+    which are preferred over auto-generated ones; ties go to the earlier video.
+    
+    Args:
+        video_ids (list): YouTube video IDs, most relevant first
+        max_videos (int, optional): Number of videos to try (default TRANSCRIPT_CANDIDATES)
+        deadline (float, optional): Seconds to wait before settling for the best
+            transcript found so far (default TRANSCRIPT_DEADLINE)
+        
+    Returns:
+        dict: Result of get_video_transcript() for the chosen video
+    """
+    candidates = list(video_ids)[:max_videos or TRANSCRIPT_CANDIDATES]
+    if not candidates:
+        return {"success": False, "transcript": None, "language": None, "video_id": None,
+                "error": "Không có video để lấy phụ đề."}
+    
+    deadline = TRANSCRIPT_DEADLINE if deadline is None else deadline
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    futures = {executor.submit(tracing.bind(get_video_transcript), video_id): index
+               for index, video_id in enumerate(candidates)}
+    
+    best = None
+    best_rank = None
+    first_error = None
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            result = future.result()
+            if not result["success"]:
+                first_error = first_error or result
+                continue
+            rank = (TRANSCRIPT_KINDS.index(result["language"]), futures[future])
+            if best_rank is None or rank < best_rank:
+                best, best_rank = result, rank
+            # Nothing can beat a native transcript of the first video
+            if best_rank == (0, 0):
+                break
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # Slow fetches keep running in the background and still fill the cache
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    if best:
+        return best
+    if first_error:
+        return first_error
+    return {"success": False, "transcript": None, "language": None, "video_id": None,
+            "error": "Hết thời gian chờ lấy phụ đề."}
+
+def collect_metrics():
+    """Report the transcript cache counters and the quota left today (see metrics.register_collector)."""
+    with _stats_lock:
+        counts = dict(transcript_cache_stats)
+    collected = [("movie_cache_events_total", "counter", "Cache lookups by outcome (hits, stale, negative, misses) and refreshes",
+                  [({"namespace": "transcripts", "event": event}, count) for event, count in counts.items()])]
+    if YOUTUBE_API_KEY:
+        collected.append(("movie_youtube_quota_remaining", "gauge", "YouTube Data API quota units left today",
+                          [({}, quota.get_remaining("youtube", YOUTUBE_API_KEY, YOUTUBE_DAILY_QUOTA))]))
+    return collected
+
+metrics.register_collector(collect_metrics)
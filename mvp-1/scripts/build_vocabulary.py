@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vocabulary Table Generator
+--------------------------
+Builds the table of precomputed Vietnamese translations used by
+utils/vocabulary.py (VOCABULARY_FILE) from:
+
+    - the TMDb movie genre list, in English and in Vietnamese
+      (GET /genre/movie/list), with the curated names below taking precedence
+    - the curated award names and awards summary sentences of OMDb
+
+The version of the table is increased whenever its content changes, so a
+deployment can tell which table it runs (/health of server.py). Run it
+again when TMDb adds a genre or a new phrase needs a translation:
+    cd mvp-1/scripts && python build_vocabulary.py
+Without network access (or an API key), --no-fetch rebuilds the table from
+the curated data only.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from config import VOCABULARY_FILE
+from api import tmdb
+from utils import vocabulary
+
+# TMDb movie genres: id -> (English name, Vietnamese name as shown in the genre line)
+CURATED_GENRES = {
+    28: ("Action", "Hành động"),
+    12: ("Adventure", "Phiêu lưu"),
+    16: ("Animation", "Hoạt hình"),
+    35: ("Comedy", "Hài"),
+    80: ("Crime", "Hình sự"),
+    99: ("Documentary", "Tài liệu"),
+    18: ("Drama", "Chính kịch"),
+    10751: ("Family", "Gia đình"),
+    14: ("Fantasy", "Giả tưởng"),
+    36: ("History", "Lịch sử"),
+    27: ("Horror", "Kinh dị"),
+    10402: ("Music", "Âm nhạc"),
+    9648: ("Mystery", "Bí ẩn"),
+    10749: ("Romance", "Lãng mạn"),
+    878: ("Science Fiction", "Khoa học viễn tưởng"),
+    10770: ("TV Movie", "Phim truyền hình"),
+    53: ("Thriller", "Gây cấn"),
+    10752: ("War", "Chiến tranh"),
+    37: ("Western", "Miền Tây")
+}
+
+# Award names appearing in OMDb awards summaries (singular; plurals add an 's')
+AWARDS = {
+    "Oscar": "giải Oscar",
+    "Golden Globe": "giải Quả cầu vàng",
+    "BAFTA Award": "giải BAFTA",
+    "BAFTA Film Award": "giải BAFTA",
+    "Primetime Emmy": "giải Emmy",
+    "Emmy": "giải Emmy"
+}
+
+# Sentences of OMDb awards summaries: (regular expression, Vietnamese template), first match wins
+SENTENCES = [
+    (r"Won (?P<n>\d+) {award}s?", "Đoạt {n} {award}"),
+    (r"Nominated for (?P<n>\d+) {award}s?", "Được đề cử {n} {award}"),
+    (r"Another (?P<w>\d+) wins? & (?P<m>\d+) nominations?", "Thêm {w} giải thưởng và {m} đề cử khác"),
+    (r"Another (?P<w>\d+) wins?", "Thêm {w} giải thưởng khác"),
+    (r"Another (?P<m>\d+) nominations?", "Thêm {m} đề cử khác"),
+    (r"(?P<w>\d+) wins? & (?P<m>\d+) nominations? total", "Tổng cộng {w} giải thưởng và {m} đề cử"),
+    (r"(?P<w>\d+) wins? & (?P<m>\d+) nominations?", "{w} giải thưởng và {m} đề cử"),
+    (r"(?P<w>\d+) wins? total", "Tổng cộng {w} giải thưởng"),
+    (r"(?P<w>\d+) wins?", "{w} giải thưởng"),
+    (r"(?P<m>\d+) nominations? total", "Tổng cộng {m} đề cử"),
+    (r"(?P<m>\d+) nominations?", "{m} đề cử")
+]
+
+def short_genre_name(name):
+    """Shorten a Vietnamese TMDb genre name for the genre line ('Phim Hành Động' -> 'Hành động')."""
+    if name.startswith("Phim ") and len(name) > len("Phim "):
+        name = name[len("Phim "):]
+    return name[:1].upper() + name[1:].lower()
+
+def collect_genres(fetch=True):
+    """Merge the curated genres with the TMDb genre list.
+
+    Genres TMDb lists that are not curated get TMDb's Vietnamese name.
+
+    Returns:
+        dict: id -> (English name, Vietnamese name)
+    """
+    genres = dict(CURATED_GENRES)
+    if not fetch:
+        return genres
+
+    english = {genre["id"]: genre["name"] for genre in tmdb.get_genre_list("en-US")}
+    vietnamese = {genre["id"]: genre["name"] for genre in tmdb.get_genre_list("vi-VN")}
+    if not english:
+        print("Không lấy được danh sách thể loại của TMDb, chỉ dùng dữ liệu có sẵn.")
+    for genre_id, name in english.items():
+        if genre_id not in genres and vietnamese.get(genre_id):
+            genres[genre_id] = (name, short_genre_name(vietnamese[genre_id]))
+            print(f"  + thể loại mới: {name} -> {genres[genre_id][1]}")
+        elif genre_id in genres and genres[genre_id][0] != name:
+            print(f"  ! TMDb đổi tên thể loại {genre_id}: {genres[genre_id][0]} -> {name}")
+    return genres
+
+def build_table(genres):
+    """Build the table content (without version and date)."""
+    terms = {}
+    for genre_id in sorted(genres):
+        english, translation = genres[genre_id]
+        terms[english] = translation
+        terms[translation] = translation  # Already Vietnamese (LANGUAGE=vi-VN): nothing to translate
+    return {
+        "format": vocabulary.FORMAT,
+        "language": "vi",
+        "terms": terms,
+        "awards": AWARDS,
+        "sentences": [list(sentence) for sentence in SENTENCES]
+    }
+
+def main():
+    """Main function to generate the vocabulary table."""
+    parser = argparse.ArgumentParser(description="Tạo bảng dịch sẵn sang tiếng Việt cho thể loại và giải thưởng")
+    parser.add_argument("--no-fetch", action="store_true", help="không gọi TMDb, chỉ dùng dữ liệu có sẵn")
+    parser.add_argument("--output", default=VOCABULARY_FILE, help="file bảng dịch (mặc định VOCABULARY_FILE)")
+    args = parser.parse_args()
+
+    if not args.no_fetch and not tmdb.check_api_key():
+        sys.exit(1)
+
+    table = build_table(collect_genres(fetch=not args.no_fetch))
+    try:
+        with open(args.output, encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    content = {key: value for key, value in previous.items() if key not in ("version", "generated_at")}
+    if content == table:
+        print(f"Bảng dịch không thay đổi (phiên bản {previous['version']}).")
+        return
+
+    table["version"] = previous.get("version", 0) + 1
+    table["generated_at"] = datetime.date.today().isoformat()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Đã ghi bảng dịch phiên bản {table['version']}: {len(table['terms'])} mục, "
+          f"{len(table['sentences'])} mẫu câu -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -22,11 +22,112 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")  # YouTube API key
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 OMDB_BASE_URL = "http://www.omdbapi.com/"
 YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3/search"
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
 
+# Send all upstream requests to a local stub server instead (e.g. http://127.0.0.1:8765, see benchmarks/)
+UPSTREAM_OVERRIDE = os.getenv("UPSTREAM_OVERRIDE")
+
 # Language settings
 LANGUAGE = os.getenv("LANGUAGE", "en-US")
 TARGET_LANGUAGE = "vi"  # Vietnamese - Always translate to Vietnamese
+TARGET_LOCALE = "vi-VN"  # Preferred TMDb translation when several countries have one in TARGET_LANGUAGE
+VOCABULARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "vocabulary_vi.json")  # Precomputed translations, see build_vocabulary.py
+
+# Local cache settings
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache'))
+ID_MAP_FILE = os.path.join(CACHE_DIR, "id_map.json")  # TMDb id <-> IMDb id / Wikipedia / YouTube
+ID_MAP_YOUTUBE_TTL = 7 * 24 * 3600  # Re-search YouTube once stored video ids are a week old
+QUOTA_FILE = os.path.join(CACHE_DIR, "quota.json")  # Daily API quota ledger per key
+BLOB_DIR = os.path.join(CACHE_DIR, "blobs")  # Compressed texts shared by cache entries, see utils/blobstore.py
+BLOB_MIN_SIZE = int(os.getenv("BLOB_MIN_SIZE", "1024"))  # Strings this long (characters) are stored as blobs
+BLOB_GC_GRACE = 3600  # Unreferenced blobs younger than this (seconds) survive garbage collection
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")  # Last detail view of each movie, served in offline mode
+PLOT_INDEX_FILE = os.getenv("PLOT_INDEX_FILE", os.path.join(CACHE_DIR, "plot_index.sqlite3"))  # Full-text index of fetched plots, see utils/plot_index.py
+
+# Offline mode: serve only cached and snapshotted data, never contact an upstream (also --offline)
+OFFLINE = os.getenv("OFFLINE", "0") == "1"
+
+# Upstream response cache, see utils/cache.py
+CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "1024"))  # Entries kept in the in-process LRU
+DAY = 24 * 3600
+CACHE_FIELD_TTLS = {  # How long each kind of field stays fresh (seconds)
+    "ratings": 1 * DAY,  # OMDb ratings, TMDb vote average and vote count
+    "details": 7 * DAY,  # Runtime, genres, companies, posters, awards
+    "credits": 30 * DAY,  # Cast and crew
+    "plot": 30 * DAY,  # TMDb overview, OMDb plot, Wikipedia extracts
+    "translation": 90 * DAY  # Vietnamese translations of a source text
+}
+CACHE_NAMESPACES = {  # Fields held by each cached lookup: fresh until the first is due, served stale until the last
+    "tmdb_details": ["ratings", "details", "credits", "plot"],
+    "omdb_details": ["ratings", "details", "credits", "plot"],
+    "wikipedia_plot": ["plot"],
+    "wikidata_sitelinks": ["details"],  # Wikipedia page titles of a Wikidata item
+    "search": ["ratings", "details"],  # Result lists of views.search_movies (popularity and votes drift)
+    "translations": ["translation"]
+}
+CACHE_NEGATIVE_TTLS = {  # How long a lookup that found nothing is not repeated (seconds)
+    "omdb_details": 12 * 3600,  # OMDb "Movie not found!"
+    "wikipedia_plot": 12 * 3600,  # No page or no plot section for any candidate title
+    "youtube_reviews": 6 * 3600,  # No Vietnamese review among the search results (reviews get uploaded)
+    "transcripts": 6 * 3600  # No usable transcript yet (auto captions appear after upload)
+}
+SEARCH_CACHE_FOLD_DIACRITICS = os.getenv("SEARCH_CACHE_FOLD_DIACRITICS", "1") != "0"  # 'bo gia' reuses 'Bố Già'
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")  # Storage behind the LRU: 'file' (CACHE_DIR) or redis://host:port/db shared by all instances
+CACHE_BACKEND_TIMEOUT = float(os.getenv("CACHE_BACKEND_TIMEOUT", "1.0"))  # Connect and read timeout of a network backend (seconds)
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "mvp1:")  # Keeps the keys of each app apart on a shared server
+CACHE_LOCK_TTL = 30  # A fetch lock left behind by a crashed instance expires after this (seconds)
+CACHE_LOCK_WAIT = 10  # Longest wait for another instance fetching the same entry, then fetch anyway (seconds)
+CACHE_LOCK_POLL = 0.05  # Interval between checks of that fetch (seconds)
+
+# Upstream rate limits (requests per second, burst) and circuit breakers, see utils/resilience.py
+UPSTREAM_RATE_LIMITS = {
+    "tmdb": (40, 40),  # TMDb allows about 50 requests per second per IP
+    "omdb": (10, 10),
+    "youtube": (10, 10),
+    "wikipedia": (20, 20),
+    "translate": (5, 5)  # googletrans gets blocked when called too fast
+}
+RATE_LIMIT_MAX_WAIT = 5  # Longest wait for a rate-limit token before failing fast (seconds)
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open an upstream's circuit breaker
+BREAKER_COOLDOWN = 30  # Seconds an open breaker fails requests fast before trying again
+UPSTREAM_TIMEOUT = 10  # Default (connect, read) timeout of upstream requests in seconds
+
+# Concurrent requests per upstream, shared by priority class, see utils/scheduler.py
+UPSTREAM_CONCURRENCY = {
+    "tmdb": 16,
+    "omdb": 6,
+    "youtube": 6,
+    "wikipedia": 8,
+    "translate": 3
+}
+SCHEDULER_INTERACTIVE_RESERVE = 1  # Slots of each upstream that background work never takes
+SCHEDULER_MAX_WAIT = 30  # Longest wait for a slot before failing (seconds)
+
+# Request hedging for sources with long-tail latency, see utils/hedging.py (empty to disable)
+HEDGED_SOURCES = [source for source in os.getenv("HEDGED_SOURCES", "").split(",") if source]
+HEDGE_MAX_RATIO = 0.1  # Extra requests allowed, as a share of the source's requests
+HEDGE_MIN_DELAY = 0.05  # Never hedge sooner than this (seconds)
+HEDGE_MIN_SAMPLES = 20  # Latencies observed before hedging starts
+HEDGE_WINDOW = 200  # Recent latencies used for the p95
+
+# Metrics in the Prometheus text format, see utils/metrics.py
+METRICS_FILE = os.getenv("METRICS_FILE", "")  # File rewritten periodically with all metrics (empty to disable)
+METRICS_DUMP_INTERVAL = float(os.getenv("METRICS_DUMP_INTERVAL", "15"))  # Seconds between writes of METRICS_FILE
+
+# Cache warm-up job (warmup.py)
+WARMUP_TITLES = [title.strip() for title in os.getenv("WARMUP_TITLES", "").split(",") if title.strip()]  # Extra titles to keep warm
+WARMUP_LIMIT = int(os.getenv("WARMUP_LIMIT", "20"))  # Movies warmed per run
+WARMUP_REQUEST_BUDGET = int(os.getenv("WARMUP_REQUEST_BUDGET", "400"))  # Upstream requests per run
+WARMUP_DELAY = float(os.getenv("WARMUP_DELAY", "1.0"))  # Pause between movies (seconds)
+
+# HTTP service (server.py)
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "8"))  # Threads running the blocking api calls
+SERVER_MAX_PENDING = int(os.getenv("SERVER_MAX_PENDING", "64"))  # Requests waiting for a worker before answering 503
+SERVER_REQUEST_TIMEOUT = 30  # Seconds before a request is answered with 504
 
 # UI symbols and formatting
 UI_SEPARATOR = "=" * 60
@@ -49,4 +150,15 @@ UI_ICONS = {
 
 # YouTube search defaults
 DEFAULT_SEARCH_SUFFIX = "review đánh giá phim"
-YOUTUBE_RESULT_LIMIT = 10 
\ No newline at end of file
+YOUTUBE_RESULT_LIMIT = 10
+
+# YouTube Data API quota (units per day, reset at midnight Pacific Time)
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "200"))  # Kept for cheap videos.list calls
+YOUTUBE_SEARCH_COST = 100  # search.list costs 100 units per page, whatever maxResults is
+YOUTUBE_VIDEOS_COST = 1  # videos.list costs 1 unit
+YOUTUBE_MAX_SEARCH_PAGES = 3  # Stop following nextPageToken after this many pages
+
+# YouTube transcripts
+TRANSCRIPT_CANDIDATES = int(os.getenv("TRANSCRIPT_CANDIDATES", "5"))  # Number of top videos whose transcripts are fetched concurrently
+TRANSCRIPT_DEADLINE = 8  # Seconds to wait for transcripts before using the best one found 
\ No newline at end of file
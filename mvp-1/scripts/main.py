@@ -9,219 +9,248 @@ information in Vietnamese. It uses TMDB API for movie data and translates result
 """
 
 import sys
+import argparse
 
 # Import modules
-from config import UI_SEPARATOR, UI_ICONS, TMDB_IMAGE_BASE_URL
-from api import tmdb, omdb, youtube, wikipedia
-from utils.translator import translate_to_vietnamese, translate_texts
-from utils.formatter import format_date, format_rating_source, format_runtime
+from config import UI_SEPARATOR, UI_ICONS
+from api import tmdb, omdb, youtube
+from views import background, build_movie_view, search_movies, search_plots
+from utils.formatter import format_date, format_rating_source, format_runtime, format_timestamp
+from utils import metrics, resilience, tracing
+from utils.transcript import display_transcript
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
 console = Console()
 
+# Transcript kinds (see youtube.TRANSCRIPT_KINDS) as shown to the user
+TRANSCRIPT_LABELS = {
+    "vi": "tiếng Việt",
+    "en>vi": "dịch từ tiếng Anh",
+    "auto>vi": "tự động tạo"
+}
+
+# Sections of the detail view (see views.SECTION_SOURCES) as shown with their freshness
+SECTION_LABELS = {
+    "movie": "Thông tin phim (TMDb)",
+    "omdb": "Đánh giá và tóm tắt (IMDb)",
+    "wikipedia": "Cốt truyện (Wikipedia)",
+    "youtube_reviews": "Video YouTube",
+    "transcript": "Phụ đề",
+    "translations": "Bản dịch",
+    "reviews": "Nhận xét (TMDb)"
+}
+
 def display_movie_info(movie):
     """Display formatted movie information in Vietnamese."""
-    # Get full movie details
-    movie_details = tmdb.get_movie_details(movie["id"])
-    if not movie_details:
+    view = build_movie_view(movie["id"], executor=background)
+    if not view:
         print("Không thể lấy thông tin chi tiết của phim.")
         return
     
-    # Extract movie data
-    movie_data = tmdb.extract_movie_data(movie_details)
-    
-    # Get external ratings and details from OMDb
-    omdb_ratings, imdb_id = omdb.get_omdb_ratings(
-        movie_data["title"], 
-        movie_data["release_year"]
-    )
-    
-    # Get detailed info from OMDb including plot
-    omdb_details = omdb.get_omdb_details(
-        movie_data["title"],
-        movie_data["release_year"]
-    )
-    
-    # Get YouTube reviews
-    youtube_reviews = youtube.get_youtube_reviews(movie_data["title"], movie_data["release_year"])
-    
-    # Get Wikipedia plot
-    wiki_plot_data = wikipedia.get_movie_plot(movie_data["title"], movie_data["release_year"])
+    render_movie_view(view)
+
+def display_plot_results(movies):
+    """Display the results of a plot search (views.search_plots) with Rich."""
+    if not movies:
+        console.print("Không có phim nào đã xem có cốt truyện phù hợp. Hãy thử tìm theo tên phim.")
+        return
+
+    table = Table(title="PHIM CÓ CỐT TRUYỆN PHÙ HỢP (trong các phim đã xem)")
+    table.add_column("#", justify="right", style="cyan", no_wrap=True)
+    table.add_column("Tên phim", style="magenta")
+    table.add_column("Năm phát hành", style="green")
+    table.add_column("Nội dung", style="dim")
+    for i, movie in enumerate(movies, 1):
+        table.add_row(str(i), movie["title"] or "N/A", movie["release_year"] or "N/A", movie["snippet"])
+    console.print(table)
+
+def render_movie_view(view):
+    """Render the data from views.build_movie_view() with Rich.
     
-    # Get user reviews from TMDb
-    reviews = tmdb.get_movie_reviews(movie["id"], limit=2)
+    Args:
+        view (dict): Movie view data
+    """
+    movie_data = view["movie"]
+    translations = view["translations"]
+    omdb_details = view["omdb"]
+    wiki_plot_data = view["wikipedia"]
+    youtube_reviews = view["youtube_reviews"]
+    transcript_result = view["transcript"]
     
-    # Translate information to Vietnamese
-    title_vi = translate_to_vietnamese(movie_data["title"]) if movie_data["title"] != movie_data["original_title"] else movie_data["title"]
     original_title_vi = f" ({movie_data['original_title']})" if movie_data["original_title"] and movie_data["original_title"] != movie_data["title"] else ""
-    overview_vi = translate_to_vietnamese(movie_data["overview"])
-    genres_vi = translate_texts(movie_data["genres"])
-    production_companies_vi = translate_texts(movie_data["production_companies"])
-    
-    # Translate IMDb plot if available
-    imdb_plot_vi = ""
-    if omdb_details['success'] and omdb_details['plot']:
-        imdb_plot_vi = translate_to_vietnamese(omdb_details['plot'])
-    
-    # Translate Wikipedia plot if it's in English
-    wiki_plot_vi = ""
-    if wiki_plot_data['success']:
-        if wiki_plot_data['language'] == 'en':
-            wiki_plot_vi = translate_to_vietnamese(wiki_plot_data['plot'])
-        else:
-            wiki_plot_vi = wiki_plot_data['plot']
     
     # Format date and runtime
     formatted_release_date = format_date(movie_data["release_date"])
     hours, minutes = format_runtime(movie_data["runtime"])
     
+    # In offline mode, show how old the data of each section is
+    if resilience.is_offline() and view.get("freshness"):
+        table = Table(title="DỮ LIỆU NGOẠI TUYẾN")
+        table.add_column("Phần", style="cyan")
+        table.add_column("Cập nhật lúc", style="yellow")
+        for section, label in SECTION_LABELS.items():
+            if section in view["freshness"]:
+                table.add_row(label, format_timestamp(view["freshness"][section]))
+        console.print(table)
+    
     # Format and display information using Rich
-    movie_title = f"{UI_ICONS['movie']} {title_vi}{original_title_vi}"
-    basic_info = f"""
-{UI_ICONS['date']} Ngày phát hành: {formatted_release_date}
-{UI_ICONS['duration']} Thời lượng: {hours}h {minutes}m
-{UI_ICONS['genre']} Thể loại: {', '.join(genres_vi)}
-{UI_ICONS['director']} Đạo diễn: {', '.join(movie_data['directors'])}
-{UI_ICONS['cast']} Diễn viên chính: {', '.join(movie_data['cast'])}
-{UI_ICONS['company']} Hãng sản xuất: {', '.join(production_companies_vi)}
-"""
-    # Include the movie title in the panel content
-    panel_content = f"{movie_title}\n{basic_info}"
-    console.print(Panel(panel_content, border_style="blue"))
+    with tracing.span("basic_info", "render"):
+        movie_title = f"{UI_ICONS['movie']} {translations['title']}{original_title_vi}"
+        basic_info = "\n".join([
+            "",
+            f"{UI_ICONS['date']} Ngày phát hành: {formatted_release_date}",
+            f"{UI_ICONS['duration']} Thời lượng: {hours}h {minutes}m",
+            f"{UI_ICONS['genre']} Thể loại: {', '.join(translations['genres'])}",
+            f"{UI_ICONS['director']} Đạo diễn: {', '.join(movie_data['directors'])}",
+            f"{UI_ICONS['cast']} Diễn viên chính: {', '.join(movie_data['cast'])}",
+            f"{UI_ICONS['company']} Hãng sản xuất: {', '.join(translations['production_companies'])}",
+            ""
+        ])
+        # Include the movie title in the panel content
+        panel_content = f"{movie_title}\n{basic_info}"
+        console.print(Panel(panel_content, border_style="blue"))
 
     # Display ratings using a table
-    if omdb_details['success'] and omdb_details['ratings']:
-        table = Table(title="ĐÁNH GIÁ")
-        table.add_column("Nguồn", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Điểm", style="magenta")
-        table.add_row("The Movie Database", f"{movie_data['vote_average']}/10 (dựa trên {movie_data['vote_count']} lượt đánh giá)")
-        for rating in omdb_details['ratings']:
-            source = format_rating_source(rating.get("Source", ""))
-            value = rating.get("Value", "N/A")
-            table.add_row(source, value)
-        console.print(table)
+    with tracing.span("ratings", "render"):
+        if omdb_details['success'] and omdb_details['ratings']:
+            table = Table(title="ĐÁNH GIÁ")
+            table.add_column("Nguồn", justify="right", style="cyan", no_wrap=True)
+            table.add_column("Điểm", style="magenta")
+            table.add_row("The Movie Database", f"{movie_data['vote_average']}/10 (dựa trên {movie_data['vote_count']} lượt đánh giá)")
+            for rating in omdb_details['ratings']:
+                source = format_rating_source(rating.get("Source", ""))
+                value = rating.get("Value", "N/A")
+                table.add_row(source, value)
+            console.print(table)
 
     # Display awards if available
-    if omdb_details['success'] and omdb_details['awards']:
-        awards_vi = translate_to_vietnamese(omdb_details['awards'])
-        console.print(Panel(awards_vi, title="GIẢI THƯỞNG", border_style="yellow"))
+    with tracing.span("awards", "render"):
+        if translations['awards']:
+            console.print(Panel(translations['awards'], title="GIẢI THƯỞNG", border_style="yellow"))
 
     # Display summaries with both original and translated content
-    if movie_data["overview"]:
-        console.print(Panel(
-            f"{overview_vi}\n\n[dim]Original: {movie_data['overview']}[/dim]",
-            title="TÓM TẮT NỘI DUNG PHIM (The Movie Database)",
-            border_style="green"
-        ))
-
-    if omdb_details['success'] and omdb_details['plot']:
-        console.print(Panel(
-            f"{imdb_plot_vi}\n\n[dim]Original: {omdb_details['plot']}[/dim]",
-            title="TÓM TẮT NỘI DUNG PHIM (Internet Movie Database)",
-            border_style="green"
-        ))
+    with tracing.span("summaries", "render"):
+        if movie_data["overview"]:
+            console.print(Panel(
+                f"{translations['overview']}\n\n[dim]Original: {movie_data['overview']}[/dim]",
+                title="TÓM TẮT NỘI DUNG PHIM (The Movie Database)",
+                border_style="green"
+            ))
 
-    if wiki_plot_data['success']:
-        if wiki_plot_data['language'] == 'en':
+        if omdb_details['success'] and omdb_details['plot']:
             console.print(Panel(
-                f"{wiki_plot_vi}\n\n[dim]Original: {wiki_plot_data['plot']}[/dim]",
-                title="TÓM TẮT CỐT TRUYỆN (WIKIPEDIA)",
+                f"{translations['imdb_plot']}\n\n[dim]Original: {omdb_details['plot']}[/dim]",
+                title="TÓM TẮT NỘI DUNG PHIM (Internet Movie Database)",
                 border_style="green"
             ))
-        else:
-            console.print(Panel(wiki_plot_vi, title="TÓM TẮT CỐT TRUYỆN (WIKIPEDIA)", border_style="green"))
+
+        if wiki_plot_data['success']:
+            if wiki_plot_data['language'] == 'en':
+                console.print(Panel(
+                    f"{translations['wiki_plot']}\n\n[dim]Original: {wiki_plot_data['plot']}[/dim]",
+                    title="TÓM TẮT CỐT TRUYỆN (WIKIPEDIA)",
+                    border_style="green"
+                ))
+            else:
+                console.print(Panel(translations['wiki_plot'], title="TÓM TẮT CỐT TRUYỆN (WIKIPEDIA)", border_style="green"))
 
     # Display YouTube reviews using Rich Table
-    console.print(f"\n{UI_ICONS['youtube']} VIDEOS TRÊN YOUTUBE:")
-    if youtube_reviews:
-        # Sort reviews by published date (newest first)
-        youtube_reviews.sort(
-            key=lambda x: x['published_at'] if x['published_at'] else "0000-00-00",
-            reverse=True
-        )
-        
-        # Create a table for YouTube reviews
-        youtube_table = Table(title="YouTube Reviews (Mới nhất)")
-        youtube_table.add_column("#", justify="right", style="cyan", no_wrap=True)
-        youtube_table.add_column("Title", style="magenta")
-        youtube_table.add_column("Channel", style="green")
-        youtube_table.add_column("Published Date", style="yellow")
+    with tracing.span("youtube_reviews", "render"):
+        console.print(f"\n{UI_ICONS['youtube']} VIDEOS TRÊN YOUTUBE:")
+        if youtube_reviews:
+            # Create a table for YouTube reviews
+            youtube_table = Table(title="YouTube Reviews (Mới nhất)")
+            youtube_table.add_column("#", justify="right", style="cyan", no_wrap=True)
+            youtube_table.add_column("Title", style="magenta")
+            youtube_table.add_column("Channel", style="green")
+            youtube_table.add_column("Published Date", style="yellow")
         
-        for i, review in enumerate(youtube_reviews, 1):
-            published_date = review['published_at'] if review['published_at'] else "N/A"
-            video_title = f"[link={review['url']}] {review['title']} [/link]"
-            youtube_table.add_row(str(i), video_title, review['channel'], published_date)
-        console.print(youtube_table)
+            for i, review in enumerate(youtube_reviews, 1):
+                published_date = review['published_at'] if review['published_at'] else "N/A"
+                video_title = f"[link={review['url']}] {review['title']} [/link]"
+                youtube_table.add_row(str(i), video_title, review['channel'], published_date)
+            console.print(youtube_table)
         
-        # Automatically get transcript for the most recent review
-        if len(youtube_reviews) > 0:
-            latest_video = youtube_reviews[0]
-            console.print(f"\n{UI_ICONS['transcript']} Phụ đề của video mới nhất:")
-            console.print(f"[dim]Video: {latest_video['title']}[/dim]")
+        # Show the best transcript found among the most recent reviews
+        if transcript_result and transcript_result['success']:
+            transcript_video = transcript_result['video']
+            console.print(f"\n{UI_ICONS['transcript']} Phụ đề video ({TRANSCRIPT_LABELS[transcript_result['language']]}):")
+            console.print(f"[dim]Video: {transcript_video['title']}[/dim]")
             
-            # Get transcript
-            transcript_result = youtube.get_video_transcript(latest_video['video_id'])
-            
-            if transcript_result['success']:
-                # Create a panel for the transcript
-                # Combine all text segments into a single paragraph
-                transcript_text = ""
-                current_sentence = ""
-                
-                for segment in transcript_result['transcript']:
-                    text = segment['text'].strip()
-                    
-                    # Skip empty segments
-                    if not text:
-                        continue
-                        
-                    # Add space before the text if it doesn't start with punctuation
-                    if text[0] not in ',.!?:;' and current_sentence:
-                        current_sentence += ' '
-                    
-                    current_sentence += text
-                    
-                    # If the segment ends with sentence-ending punctuation,
-                    # add it to transcript_text and start a new sentence
-                    if text[-1] in '.!?':
-                        transcript_text += current_sentence + '\n\n'
-                        current_sentence = ""
-                
-                # Add any remaining text
-                if current_sentence:
-                    transcript_text += current_sentence
-                
-                console.print(Panel(
-                    transcript_text.strip(),
-                    title=f"PHỤ ĐỀ - {latest_video['title']}",
-                    border_style="blue"
-                ))
-            else:
-                console.print(f"[red]{transcript_result['error']}[/red]")
+            # Stream the transcript into paginated panels
+            with tracing.span("transcript", "render"):
+                display_transcript(
+                    console,
+                    transcript_result['transcript'],
+                    title=f"PHỤ ĐỀ - {transcript_video['title']}",
+                    interactive=console.is_terminal
+                )
+        elif transcript_result:
+            console.print(f"[red]{transcript_result['error']}[/red]")
 
     # Display poster URL if available
-    if movie_data["poster_path"]:
-        poster_url = f"{TMDB_IMAGE_BASE_URL}{movie_data['poster_path']}"
-        console.print(f"\n{UI_ICONS['poster']}  Poster: {poster_url}")
+    if view["poster_url"]:
+        console.print(f"\n{UI_ICONS['poster']}  Poster: {view['poster_url']}")
 
     console.print("\n" + UI_SEPARATOR)
 
+def profile_movie_info(movie, traces, trace_out=None):
+    """Display movie information while recording a latency trace.
+
+    Prints a waterfall of the recorded spans after the view and, when
+    trace_out is set, writes all traces so far as Chrome trace-event JSON.
+
+    Args:
+        movie (dict): Movie search result
+        traces (list): Traces recorded in this session (appended to)
+        trace_out (str, optional): Output file for the Chrome trace
+    """
+    trace, token = tracing.start_trace(movie.get('title', str(movie["id"])))
+    try:
+        display_movie_info(movie)
+    finally:
+        tracing.stop_trace(token)
+    
+    traces.append(trace)
+    tracing.print_waterfall(console, trace)
+    if trace_out:
+        tracing.export_chrome_trace(traces, trace_out)
+        console.print(f"[dim]Đã lưu trace vào {trace_out} (mở bằng chrome://tracing hoặc Perfetto)[/dim]")
+
 def main():
     """Main function to run the movie search script."""
-    print("\n=== TÌM KIẾM THÔNG TIN PHIM ===\n")
+    parser = argparse.ArgumentParser(description="Tìm kiếm thông tin phim")
+    parser.add_argument("--profile", action="store_true",
+                        help="hiển thị thời gian của từng bước sau mỗi lần xem phim")
+    parser.add_argument("--trace-out", metavar="FILE",
+                        help="lưu trace dạng Chrome trace-event JSON (bật --profile)")
+    parser.add_argument("--offline", action="store_true",
+                        help="chỉ dùng dữ liệu đã lưu, không gửi request nào ra mạng (như OFFLINE=1)")
+    args = parser.parse_args()
+    profile = args.profile or bool(args.trace_out)
+    traces = []
     
-    # Check API keys
-    if not tmdb.check_api_key():
-        sys.exit(1)
+    print("\n=== TÌM KIẾM THÔNG TIN PHIM ===\n")
     
-    omdb.check_api_key()
-    youtube.check_api_key()
+    if args.offline:
+        resilience.set_offline(True)
+    if resilience.is_offline():
+        # API keys are not needed to read saved data
+        print("Chế độ ngoại tuyến: chỉ hiển thị dữ liệu đã lưu.")
+    else:
+        # Check API keys
+        if not tmdb.check_api_key():
+            sys.exit(1)
+        
+        omdb.check_api_key()
+        youtube.check_api_key()
+    metrics.start_file_dump()
     
     while True:
         # Get movie title from user
-        query = input("\nNhập tên phim (hoặc 'q' để thoát): ")
+        query = input("\nNhập tên phim ('?' + nội dung để tìm theo cốt truyện, 'q' để thoát): ")
         
         if query.lower() in ['q', 'quit', 'exit']:
             print("\nCảm ơn bạn đã sử dụng tìm kiếm phim. Tạm biệt!")
@@ -231,26 +260,28 @@ def main():
             print("Vui lòng nhập tên phim.")
             continue
         
-        print(f"\nĐang tìm kiếm phim '{query}'...")
-        
-        # Search for movies
-        movies = tmdb.search_movie(query)
-        
-        # Sort movies by release date (newest first)
-        movies.sort(key=lambda x: x.get('release_date', ''), reverse=True)
-
-        # Display search results using Rich Table
-        if movies:
-            table = Table(title="KẾT QUẢ TÌM KIẾM")
-            table.add_column("#", justify="right", style="cyan", no_wrap=True)
-            table.add_column("Tên phim", style="magenta")
-            table.add_column("Năm phát hành", style="green")
-            for i, movie in enumerate(movies[:10], 1):  # Show max 10 results
-                release_year = movie.get("release_date", "")[:4] if movie.get("release_date") else "N/A"
-                table.add_row(str(i), movie.get('title', 'N/A'), release_year)
-            console.print(table)
+        if query.startswith("?"):
+            # Search the plots fetched so far (local index, no network request)
+            movies = search_plots(query[1:])
+            display_plot_results(movies)
         else:
-            console.print("Không tìm thấy phim nào. Vui lòng thử lại với từ khóa khác.")
+            print(f"\nĐang tìm kiếm phim '{query}'...")
+
+            # Search for movies (newest first)
+            movies = search_movies(query)
+
+            # Display search results using Rich Table
+            if movies:
+                table = Table(title="KẾT QUẢ TÌM KIẾM")
+                table.add_column("#", justify="right", style="cyan", no_wrap=True)
+                table.add_column("Tên phim", style="magenta")
+                table.add_column("Năm phát hành", style="green")
+                for i, movie in enumerate(movies, 1):
+                    release_year = movie.get("release_date", "")[:4] if movie.get("release_date") else "N/A"
+                    table.add_row(str(i), movie.get('title', 'N/A'), release_year)
+                console.print(table)
+            else:
+                console.print("Không tìm thấy phim nào. Vui lòng thử lại với từ khóa khác.")
         
         # Let user select a movie
         while True:
@@ -261,8 +292,11 @@ def main():
                     break
                 
                 idx = int(selection) - 1
-                if 0 <= idx < len(movies[:10]):
-                    display_movie_info(movies[idx])
+                if 0 <= idx < len(movies):
+                    if profile:
+                        profile_movie_info(movies[idx], traces, args.trace_out)
+                    else:
+                        display_movie_info(movies[idx])
                     input("\nNhấn Enter để tiếp tục...")
                     break
                 else:
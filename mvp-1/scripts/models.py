@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Models module for the Movie Search Script.
+Compact typed records for the movie data collected from TMDb, OMDb,
+Wikipedia and YouTube. Movies are frozen dataclasses with __slots__ and
+the records they hold (ratings, credits, plots, videos) are named tuples,
+so many of them can be held in memory (batch jobs, caches) at a fraction
+of the size of the equivalent dicts. Partial records built from different
+sources are combined with Movie.merge(), and to_cache()/from_cache()
+convert a record to and from a compact JSON-serializable list.
+"""
+
+from dataclasses import dataclass, fields, replace
+from operator import attrgetter
+from typing import NamedTuple
+
+class Rating(NamedTuple):
+    """Rating of a movie on one site (e.g. 'Rotten Tomatoes', '91%')."""
+    source: str
+    value: str
+
+class Credit(NamedTuple):
+    """Cast or crew member (job 'Actor' for the cast)."""
+    name: str
+    job: str
+    character: str = ""
+
+class Plot(NamedTuple):
+    """Plot summary from one source ('tmdb', 'imdb' or 'wikipedia')."""
+    text: str
+    source: str
+    language: str = "en"
+    url: str = ""
+    page_title: str = ""
+
+    @classmethod
+    def from_wikipedia(cls, result):
+        """Build a plot from a wikipedia.get_movie_plot() result, or None if it has no plot."""
+        if not result.get('success'):
+            return None
+        return cls(result['plot'], "wikipedia", result['language'], result['source_url'], result['page_title'])
+
+class Video(NamedTuple):
+    """YouTube video."""
+    video_id: str
+    title: str = ""
+    channel: str = ""
+    published_at: str = ""
+    thumbnail: str = ""
+
+    @property
+    def url(self):
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+    @classmethod
+    def from_youtube(cls, info):
+        """Build a video from the dict of youtube.build_video_info()."""
+        return cls(info['video_id'], info['title'], info['channel'], info['published_at'], info['thumbnail'])
+
+    def to_dict(self):
+        """Get the video as the dict used by the UI (see youtube.build_video_info)."""
+        return {
+            "title": self.title,
+            "channel": self.channel,
+            "url": self.url,
+            "published_at": self.published_at,
+            "thumbnail": self.thumbnail,
+            "video_id": self.video_id
+        }
+
+# Record types of the Movie fields holding tuples of records
+_NESTED = {"credits": Credit, "ratings": Rating, "plots": Plot, "videos": Video}
+
+@dataclass(frozen=True, slots=True)
+class Movie:
+    """Movie record; every field is optional so sources can fill in what they know."""
+    tmdb_id: int = None
+    imdb_id: str = ""
+    wikidata_id: str = ""
+    title: str = ""
+    original_title: str = ""
+    release_date: str = ""
+    runtime: int = 0
+    overview: str = ""
+    vote_average: float = 0
+    vote_count: int = 0
+    poster_path: str = ""
+    awards: str = ""
+    genres: tuple = ()
+    production_companies: tuple = ()
+    credits: tuple = ()  # Credit records: directors and top-billed cast
+    ratings: tuple = ()  # Rating records from OMDb
+    plots: tuple = ()  # Plot records, one per source
+    videos: tuple = ()  # Video records of YouTube reviews
+    localized_title: str = ""  # Title and overview from TMDb's translation in the target language, if any
+    localized_overview: str = ""
+
+    @property
+    def release_year(self):
+        return self.release_date[:4] if self.release_date else None
+
+    @property
+    def directors(self):
+        return [credit.name for credit in self.credits if credit.job == "Director"]
+
+    @property
+    def cast(self):
+        return [credit.name for credit in self.credits if credit.job == "Actor"]
+
+    @classmethod
+    def from_tmdb(cls, movie_details, cast_limit=5, locale="vi-VN"):
+        """Build a movie from TMDb movie details.
+
+        Args:
+            movie_details (dict): Movie details from TMDb (with appended credits,
+                external_ids and translations)
+            cast_limit (int, optional): Number of top-billed cast members to keep
+            locale (str, optional): Language and country of the translation kept as
+                localized_title / localized_overview (e.g. 'vi-VN'); translations
+                of the language for other countries are used when it has none
+
+        Returns:
+            Movie: Movie record
+        """
+        external_ids = movie_details.get("external_ids") or {}
+        credits = movie_details.get("credits", {})
+        directors = [Credit(member.get("name", ""), "Director")
+                     for member in credits.get("crew", []) if member.get("job") == "Director"]
+        cast = [Credit(member.get("name", ""), "Actor", member.get("character", ""))
+                for member in credits.get("cast", [])[:cast_limit]]
+        localized = _find_translation(movie_details, locale)
+
+        return cls(
+            tmdb_id=movie_details.get("id"),
+            imdb_id=movie_details.get("imdb_id") or external_ids.get("imdb_id") or "",
+            wikidata_id=external_ids.get("wikidata_id") or "",
+            title=movie_details.get("title", "Không có tên"),
+            original_title=movie_details.get("original_title", ""),
+            release_date=movie_details.get("release_date", ""),
+            runtime=movie_details.get("runtime", 0),
+            overview=movie_details.get("overview", "Không có mô tả"),
+            vote_average=movie_details.get("vote_average", 0),
+            vote_count=movie_details.get("vote_count", 0),
+            poster_path=movie_details.get("poster_path", ""),
+            genres=tuple(genre.get("name", "") for genre in movie_details.get("genres", [])),
+            production_companies=tuple(company.get("name", "") for company in movie_details.get("production_companies", [])),
+            credits=tuple(directors + cast),
+            localized_title=(localized.get("title") or "").strip(),
+            localized_overview=(localized.get("overview") or "").strip()
+        )
+
+    @classmethod
+    def from_omdb(cls, omdb_details):
+        """Build a movie from an omdb.get_omdb_details() result.
+
+        Returns:
+            Movie: Movie record (empty if the lookup failed)
+        """
+        if not omdb_details.get('success'):
+            return cls()
+
+        credits = [Credit(name.strip(), "Director") for name in omdb_details['director'].split(',') if name.strip()]
+        credits += [Credit(name, "Actor") for name in omdb_details['actors']]
+        return cls(
+            imdb_id=omdb_details['imdb_id'],
+            awards=omdb_details['awards'],
+            credits=tuple(credits),
+            ratings=tuple(Rating(rating.get("Source", ""), rating.get("Value", "")) for rating in omdb_details['ratings']),
+            plots=(Plot(omdb_details['plot'], "imdb", "en", omdb_details.get('url', "")),) if omdb_details['plot'] else ()
+        )
+
+    def merge(self, other):
+        """Combine this record with a partial record of the same movie from another source.
+
+        Fields set on this record win; empty ones are filled from the other
+        record, and record tuples (credits, ratings, plots, videos) are joined
+        without duplicates. Credits are only taken from the other record when
+        this one has none, so the same people are not listed twice.
+
+        Args:
+            other (Movie): Record to merge in
+
+        Returns:
+            Movie: Merged record (this record if nothing changes)
+        """
+        changes = {}
+        for name in self.__slots__:
+            mine = getattr(self, name)
+            theirs = getattr(other, name)
+            if not theirs or mine == theirs:
+                continue
+            if not mine:
+                changes[name] = theirs
+            elif name in _NESTED and name != "credits":
+                extra = tuple(item for item in theirs if item not in mine)
+                if extra:
+                    changes[name] = mine + extra
+        return replace(self, **changes) if changes else self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Records are immutable all the way down, so caches can hand out the same one
+        return self
+
+    def get_plot(self, source):
+        """Get the plot of one source, or None."""
+        return next((plot for plot in self.plots if plot.source == source), None)
+
+    def to_dict(self):
+        """Get the movie data as the dict shown by the detail view."""
+        return {
+            "tmdb_id": self.tmdb_id,
+            "title": self.title,
+            "original_title": self.original_title,
+            "release_date": self.release_date,
+            "release_year": self.release_year,
+            "runtime": self.runtime,
+            "overview": self.overview,
+            "vote_average": self.vote_average,
+            "vote_count": self.vote_count,
+            "poster_path": self.poster_path,
+            "imdb_id": self.imdb_id,
+            "wikidata_id": self.wikidata_id,
+            "genres": list(self.genres),
+            "production_companies": list(self.production_companies),
+            "directors": self.directors,
+            "cast": self.cast
+        }
+
+    def to_cache(self):
+        """Convert the record to a compact JSON-serializable list (field values in order).
+
+        The nested records are tuples already, so they are serialized as
+        they are (one list of field values per record).
+        """
+        return list(_MOVIE_ROW(self))
+
+    @classmethod
+    def from_cache(cls, row):
+        """Rebuild a record from the output of to_cache()."""
+        values = list(row)
+        values += _MOVIE_DEFAULTS[len(values):]  # Rows cached before fields were added
+        for index, make in _NESTED_COLUMNS:
+            values[index] = tuple(map(make, values[index]))
+        for index in _TUPLE_COLUMNS:
+            values[index] = tuple(values[index])
+
+        # Fill the slots directly: the frozen dataclass __init__ sets each field through object.__setattr__
+        movie = object.__new__(cls)
+        for set_field, value in zip(_MOVIE_SETTERS, values):
+            set_field(movie, value)
+        return movie
+
+def _find_translation(movie_details, locale):
+    """Get the data of a locale ('vi-VN') from the appended TMDb translations, or of its language for another country."""
+    language, _, country = locale.partition("-")
+    candidates = [translation for translation in (movie_details.get("translations") or {}).get("translations", [])
+                  if translation.get("iso_639_1") == language]
+    if not candidates:
+        return {}
+    # sort() is stable: the country's own translation first, the others in TMDb's order
+    candidates.sort(key=lambda translation: translation.get("iso_3166_1", "").upper() != country.upper())
+    return candidates[0].get("data") or {}
+
+# Field getters and column positions used by Movie.to_cache() / from_cache()
+_MOVIE_ROW = attrgetter(*Movie.__slots__)
+_MOVIE_SETTERS = [Movie.__dict__[name].__set__ for name in Movie.__slots__]
+_MOVIE_DEFAULTS = [field.default for field in fields(Movie)]
+_NESTED_COLUMNS = [(Movie.__slots__.index(name), record._make) for name, record in _NESTED.items()]
+_TUPLE_COLUMNS = [Movie.__slots__.index(name) for name in ("genres", "production_companies")]
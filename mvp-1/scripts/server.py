@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Movie Search Service
+------------------
+Long-running HTTP service returning the search and detail views of the
+Movie Search Script as JSON, for use behind a web front end.
+
+Endpoints:
+    GET /search?q=<title>     Search results, newest first
+    GET /search/plot?q=<words> Movies already fetched whose plot matches, best first
+    GET /movie/<tmdb_id>      Detail view data (same data as the terminal view)
+    GET /health               Service status
+    GET /metrics              Metrics in the Prometheus text format
+
+With --offline (or OFFLINE=1) only cached and snapshotted data is served
+and no upstream is contacted (see views.py).
+
+The api modules are blocking, so views are built in a shared thread pool.
+The HTTP session, id map and caches are shared by all requests; identical
+requests in flight at the same time share one result.
+"""
+
+import sys
+import time
+import asyncio
+import functools
+import argparse
+import json
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    SERVER_HOST, SERVER_PORT, SERVER_WORKERS, SERVER_MAX_PENDING, SERVER_REQUEST_TIMEOUT,
+    SEARCH_CACHE_FOLD_DIACRITICS
+)
+from api import tmdb, omdb, youtube
+from utils import cache, hedging, id_map, metrics, plot_index, resilience, scheduler, text, vocabulary
+import views
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout"
+}
+
+# Limits on a single request
+MAX_REQUEST_LINE = 8192
+MAX_HEADERS = 100
+MAX_REQUEST_BODY = 8192  # Bodies are read and discarded (every endpoint is a GET)
+
+# Requests served, by endpoint ('search', 'plot_search', 'movie', 'health', 'metrics' or 'other')
+SERVER_REQUESTS = metrics.counter("movie_server_requests_total", "HTTP requests served", ["endpoint", "status"])
+SERVER_DURATION = metrics.histogram("movie_server_request_duration_seconds", "Time to answer HTTP requests", ["endpoint"])
+
+class ServiceBusy(Exception):
+    """Raised when too many requests are already waiting for a worker."""
+
+class MovieService:
+    """Shared state of the service: worker threads, limits and in-flight requests."""
+
+    def __init__(self, workers=SERVER_WORKERS, max_pending=SERVER_MAX_PENDING, timeout=SERVER_REQUEST_TIMEOUT):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="view")
+        # Transcript lookups get their own threads so they never wait behind the views that started them
+        self.transcript_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcript")
+        self.slots = asyncio.Semaphore(workers)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self.inflight = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+        metrics.register_collector(self.collect_metrics)
+
+    def collect_metrics(self):
+        """Report the queue and coalescing state (see metrics.register_collector)."""
+        return [
+            ("movie_server_pending", "gauge", "Requests waiting for or running in a worker", [({}, self.pending)]),
+            ("movie_server_inflight", "gauge", "Distinct requests being computed", [({}, len(self.inflight))]),
+            ("movie_server_coalesced_total", "counter", "Requests answered with the result of an identical request",
+             [({}, self.stats["coalesced"])])
+        ]
+
+    async def run(self, key, func, *args):
+        """Run a blocking view function in a worker thread.
+
+        Args:
+            key (tuple): Request key; concurrent calls with the same key share one run
+            func (callable): Function to run
+            *args: Arguments for func
+
+        Returns:
+            The function result
+        """
+        task = self.inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if self.pending >= self.max_pending:
+                raise ServiceBusy()
+            # Counted as soon as it is created, so requests arriving before it starts see it too
+            self.pending += 1
+            task = asyncio.ensure_future(self._run(func, *args))
+            task.add_done_callback(functools.partial(self._finish, key))
+            self.inflight[key] = task
+
+        # A request that times out leaves the shared run going for the others
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+
+    async def _run(self, func, *args):
+        async with self.slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    def _finish(self, key, task):
+        self.pending -= 1
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+
+    async def dispatch(self, method, target):
+        """Route a request to its endpoint.
+
+        Args:
+            method (str): HTTP method
+            target (str): Request target (path and query string)
+
+        Returns:
+            tuple: (status code, JSON-serializable payload)
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, {"error": "Chỉ hỗ trợ GET"}
+
+        parts = urllib.parse.urlsplit(target)
+        path = parts.path.rstrip("/")
+        query = urllib.parse.parse_qs(parts.query)
+
+        if path == "/metrics":
+            return 200, metrics.render()
+
+        if path == "/health":
+            return 200, {
+                "status": "ok",
+                "offline": resilience.is_offline(),
+                "pending": self.pending,
+                "inflight": len(self.inflight),
+                "requests": self.stats["requests"],
+                "coalesced": self.stats["coalesced"],
+                "cache_backend": cache.default_cache.backend.name,
+                "vocabulary_version": vocabulary.VERSION,
+                "plot_index": plot_index.get_stats(),
+                "caches": {
+                    "id_map": dict(id_map.stats),
+                    "transcripts": dict(youtube.transcript_cache_stats),
+                    "responses": cache.get_stats()
+                },
+                "upstreams": resilience.get_state(),
+                "slots": scheduler.get_state(),
+                "hedging": hedging.get_stats()
+            }
+
+        if path == "/search":
+            title = query.get("q", [""])[0].strip()
+            if not title:
+                return 400, {"error": "Thiếu tham số q"}
+            key = ("search", text.normalize_query(title, SEARCH_CACHE_FOLD_DIACRITICS))
+            movies = await self.run(key, views.search_movies, title)
+            return 200, {"query": title, "results": movies}
+
+        if path == "/search/plot":
+            words = query.get("q", [""])[0].strip()
+            if not words:
+                return 400, {"error": "Thiếu tham số q"}
+            key = ("plot", text.normalize_query(words, fold=True))
+            movies = await self.run(key, views.search_plots, words)
+            return 200, {"query": words, "results": movies}
+
+        if path.startswith("/movie/"):
+            movie_id = path[len("/movie/"):]
+            if not movie_id.isdigit():
+                return 404, {"error": "ID phim không hợp lệ"}
+            view = await self.run(("movie", int(movie_id)), views.build_movie_view,
+                                  int(movie_id), self.transcript_executor)
+            if not view:
+                return 404, {"error": "Không thể lấy thông tin chi tiết của phim"}
+            return 200, view
+
+        return 404, {"error": "Không tìm thấy đường dẫn"}
+
+    async def respond(self, method, target):
+        """Dispatch a request and turn errors into status codes."""
+        self.stats["requests"] += 1
+        started = time.perf_counter()
+        status, payload = await self._respond(method, target)
+        endpoint = get_endpoint(target)
+        SERVER_REQUESTS.inc(endpoint, str(status))
+        SERVER_DURATION.observe(time.perf_counter() - started, endpoint)
+        return status, payload
+
+    async def _respond(self, method, target):
+        try:
+            return await self.dispatch(method, target)
+        except ServiceBusy:
+            return 503, {"error": "Máy chủ đang bận, vui lòng thử lại sau"}
+        except asyncio.TimeoutError:
+            return 504, {"error": "Hết thời gian chờ dữ liệu phim"}
+        except Exception as e:
+            print(f"Error handling {method} {target}: {e}")
+            return 500, {"error": "Lỗi máy chủ"}
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive supported)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                if len(request_line) > MAX_REQUEST_LINE:
+                    await write_response(writer, "GET", 400, {"error": "Yêu cầu quá dài"}, keep_alive=False)
+                    break
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await write_response(writer, "GET", 400, {"error": "Yêu cầu không hợp lệ"}, keep_alive=False)
+                    break
+
+                headers = await read_headers(reader)
+                if headers is None:
+                    await write_response(writer, method, 400, {"error": "Quá nhiều header"}, keep_alive=False)
+                    break
+
+                # Discard any request body
+                length = headers.get("content-length", "").strip() or "0"
+                if not (length.isascii() and length.isdigit()):
+                    await write_response(writer, method, 400, {"error": "Content-Length không hợp lệ"}, keep_alive=False)
+                    break
+                if int(length) > MAX_REQUEST_BODY:
+                    await write_response(writer, method, 413, {"error": "Nội dung yêu cầu quá lớn"}, keep_alive=False)
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                status, payload = await self.respond(method, target)
+                await write_response(writer, method, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+def get_endpoint(target):
+    """Get the endpoint name of a request target, used as a metrics label.
+
+    Returns:
+        str: 'search', 'plot_search', 'movie', 'health', 'metrics' or 'other'
+    """
+    path = urllib.parse.urlsplit(target).path.rstrip("/")
+    if path.startswith("/movie/"):
+        return "movie"
+    if path == "/search/plot":
+        return "plot_search"
+    if path in ("/search", "/health", "/metrics"):
+        return path[1:]
+    return "other"
+
+async def read_headers(reader):
+    """Read request headers.
+
+    Returns:
+        dict: Header values by lower-case name, or None if there are too many
+    """
+    headers = {}
+    for _ in range(MAX_HEADERS):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return None
+
+async def write_response(writer, method, status, payload, keep_alive):
+    """Write a JSON response (or a plain text one if the payload is a string, e.g. /metrics)."""
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+        content_type = metrics.CONTENT_TYPE
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = [
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}"
+    ]
+    if status == 503:
+        head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+    if method != "HEAD":
+        writer.write(body)
+    await writer.drain()
+
+async def serve(host, port):
+    """Run the service until interrupted."""
+    service = MovieService()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Dịch vụ tìm kiếm phim đang chạy tại http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Main function to run the HTTP service."""
+    parser = argparse.ArgumentParser(description="Dịch vụ HTTP tìm kiếm thông tin phim (JSON)")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--offline", action="store_true",
+                        help="chỉ trả về dữ liệu đã lưu, không gửi request nào ra mạng (như OFFLINE=1)")
+    args = parser.parse_args()
+
+    if args.offline:
+        resilience.set_offline(True)
+    if not resilience.is_offline():
+        # Check API keys (not needed to serve saved data)
+        if not tmdb.check_api_key():
+            sys.exit(1)
+
+        omdb.check_api_key()
+        youtube.check_api_key()
+    metrics.start_file_dump()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nĐã dừng dịch vụ.")
+
+if __name__ == "__main__":
+    main()
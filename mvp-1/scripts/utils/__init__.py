@@ -1,3 +1,20 @@
 # Utilities package for the Movie Search Script 
 from . import translator
-from . import formatter 
\ No newline at end of file
+from . import formatter
+from . import id_map
+from . import quota
+from . import text
+from . import youtube_filters
+from . import transcript
+from . import http_client
+from . import tracing
+from . import resilience
+from . import hedging
+from . import cache
+from . import fastjson
+from . import metrics
+from . import blobstore
+from . import scheduler
+from . import cache_backend
+from . import vocabulary
+from . import plot_index 
\ No newline at end of file
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Blob store module for the Movie Search Script.
+Content-addressed store for the large texts kept in the caches (plots,
+transcripts, translations). Each blob is zlib-compressed in BLOB_DIR under
+the SHA-256 of its content, so a text shared by several cache entries (an
+OMDb plot that is also the key of its translation, the same Wikipedia
+section cached for two lookups) is stored once. Cache files hold
+{"$blob": digest} references instead of the text; blobs are read through
+mmap, and collect_garbage() removes the ones no cache file refers to.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_DIR, BLOB_DIR, BLOB_MIN_SIZE, BLOB_GC_GRACE
+from utils import metrics
+
+# Reference markers: {"$blob": digest} for a text, {"$json": digest} for a JSON value
+TEXT_REF = "$blob"
+JSON_REF = "$json"
+
+# Blobs are written once and read many times, so compress as well as zlib can
+COMPRESSION_LEVEL = 9
+
+# References inside cache files (found without parsing them)
+_REF_PATTERN = re.compile(r'"\$(?:blob|json)":\s*"([0-9a-f]{64})"')
+
+_lock = threading.Lock()
+
+# Blobs written / already present / read, and bytes before and after compression of the written ones
+stats = {"written": 0, "reused": 0, "read": 0, "bytes_raw": 0, "bytes_stored": 0}
+
+class BlobMissing(KeyError):
+    """Raised when a referenced blob is missing or corrupt (the referring entry is treated as not cached)."""
+
+def _count(**counts):
+    with _lock:
+        for name, amount in counts.items():
+            stats[name] += amount
+
+def blob_path(digest, directory=BLOB_DIR):
+    """Get the file of a blob (fanned out over 256 subdirectories)."""
+    return os.path.join(directory, digest[:2], f"{digest[2:]}.z")
+
+def put(data, directory=BLOB_DIR):
+    """Store bytes, unless a blob with the same content exists.
+
+    Args:
+        data (bytes): Content
+        directory (str, optional): Blob directory
+
+    Returns:
+        str: SHA-256 hex digest of the content
+
+    Raises:
+        OSError: If the blob cannot be written
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest, directory)
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # Restarts the grace period, so a running collection keeps it
+        except OSError:
+            pass
+        _count(reused=1)
+        return digest
+
+    compressed = zlib.compress(data, COMPRESSION_LEVEL)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(tmp_path, path)
+    _count(written=1, bytes_raw=len(data), bytes_stored=len(compressed))
+    return digest
+
+def read(digest, directory=BLOB_DIR):
+    """Read a blob through mmap and check it against its digest.
+
+    Args:
+        digest (str): SHA-256 hex digest
+        directory (str, optional): Blob directory
+
+    Returns:
+        bytes: Content
+
+    Raises:
+        BlobMissing: If the blob is missing or corrupt
+    """
+    try:
+        with open(blob_path(digest, directory), "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = zlib.decompress(mapped)
+    except (OSError, ValueError, zlib.error) as e:
+        raise BlobMissing(digest) from e
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise BlobMissing(digest)
+    _count(read=1)
+    return data
+
+def put_value(value, directory=BLOB_DIR):
+    """Store a JSON-serializable value as one blob (e.g. all segments of a transcript).
+
+    Returns:
+        dict: Reference to put in the cache file in place of the value
+    """
+    data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {JSON_REF: put(data, directory)}
+
+def pack(value, min_size=BLOB_MIN_SIZE):
+    """Replace the long strings of a JSON-serializable value by blob references.
+
+    Args:
+        value: Value to write to a cache file
+        min_size (int, optional): Shortest string (in characters) stored as a blob
+
+    Returns:
+        Value with references (the input is not modified)
+    """
+    if isinstance(value, str):
+        if len(value) >= min_size:
+            return {TEXT_REF: put(value.encode("utf-8"))}
+        return value
+    if isinstance(value, dict):
+        return {key: pack(item, min_size) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [pack(item, min_size) for item in value]
+    return value
+
+def unpack(value):
+    """Resolve the blob references of a value read from a cache file (see pack and put_value).
+
+    Raises:
+        BlobMissing: If a referenced blob is missing or corrupt
+    """
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if TEXT_REF in value:
+                return read(value[TEXT_REF]).decode("utf-8")
+            if JSON_REF in value:
+                return json.loads(read(value[JSON_REF]))
+        return {key: unpack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unpack(item) for item in value]
+    return value
+
+def collect_garbage(roots=(CACHE_DIR,), directory=BLOB_DIR, grace=BLOB_GC_GRACE):
+    """Remove the blobs no cache file refers to any more.
+
+    Every JSON file under the roots (outside the blob directory) is scanned
+    for references. Blobs younger than the grace period are kept, since
+    their cache entry may still be being written.
+
+    Args:
+        roots (list, optional): Directories holding files that may refer to
+            blobs: CACHE_DIR and, when it is elsewhere, the directory of the
+            file cache backend (CACHE_BACKEND=file:///...)
+        directory (str, optional): Blob directory
+        grace (float, optional): Minimum age in seconds of removed blobs
+
+    Returns:
+        dict: Numbers of referenced, kept and removed blobs, and bytes freed
+    """
+    referenced = set()
+    blob_root = os.path.abspath(directory)
+    roots = sorted({os.path.abspath(root) for root in roots})
+    # Skip the roots inside another one: their files are scanned with it
+    roots = [root for root in roots
+             if not any(root != other and root.startswith(other.rstrip(os.sep) + os.sep) for other in roots)]
+    walks = [os.walk(root) for root in roots]
+    for dirpath, dirnames, filenames in (entry for walk in walks for entry in walk):
+        if os.path.abspath(dirpath) == blob_root:
+            dirnames.clear()
+            continue
+        for name in filenames:
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(dirpath, name), encoding="utf-8") as f:
+                    referenced.update(_REF_PATTERN.findall(f.read()))
+            except (OSError, ValueError):
+                continue
+
+    summary = {"referenced": len(referenced), "kept": 0, "removed": 0, "bytes_freed": 0}
+    cutoff = time.time() - grace
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            digest = os.path.basename(dirpath) + name[:-len(".z")]
+            if name.endswith(".z") and digest in referenced:
+                summary["kept"] += 1
+                continue
+            try:
+                info = os.stat(path)
+                if info.st_mtime > cutoff:
+                    summary["kept"] += 1
+                    continue
+                os.remove(path)  # Unreferenced blob or leftover temporary file
+            except OSError:
+                continue
+            summary["removed"] += 1
+            summary["bytes_freed"] += info.st_size
+    return summary
+
+def collect_metrics():
+    """Report the blob counters (see metrics.register_collector)."""
+    with _lock:
+        counts = dict(stats)
+    return [
+        ("movie_blob_events_total", "counter", "Blobs written, reused (same content already stored) and read",
+         [({"event": event}, counts[event]) for event in ("written", "reused", "read")]),
+        ("movie_blob_bytes_total", "counter", "Size of the written blobs before (raw) and after (stored) compression",
+         [({"size": "raw"}, counts["bytes_raw"]), ({"size": "stored"}, counts["bytes_stored"])])
+    ]
+
+metrics.register_collector(collect_metrics)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache module for the Movie Search Script.
+Two-tier cache for upstream lookups: an in-process LRU in front of a storage
+backend (CACHE_BACKEND, see utils/cache_backend.py): one JSON file per entry
+on disk, or a key-value server shared by every instance. How long an entry
+stays fresh depends on the fields it holds (CACHE_NAMESPACES,
+CACHE_FIELD_TTLS): it is fresh until its most volatile field (e.g. ratings)
+is due, and is served stale until its most stable field (e.g. plot) expires.
+A stale hit is returned at once and refreshed in the background, so it never
+costs user-visible latency.
+
+Lookups that found nothing (OMDb "Movie not found!", no Wikipedia page, no
+YouTube review or transcript) are kept apart as negative entries with short
+TTLs (CACHE_NEGATIVE_TTLS), so a known miss skips straight to the fallbacks.
+
+In offline mode (see resilience.set_offline) entries are served whatever
+their age and nothing is refreshed. track_freshness() records when the data
+served to a view was fetched, so the view can show it.
+
+A missing entry is fetched by one caller at a time: concurrent callers in
+the process wait for its result, and other instances sharing the backend
+wait for the entry it stores (up to CACHE_LOCK_WAIT).
+"""
+
+import contextvars
+import copy
+import functools
+import hashlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (CACHE_MEMORY_ENTRIES, CACHE_FIELD_TTLS, CACHE_NAMESPACES, CACHE_NEGATIVE_TTLS,
+                    CACHE_LOCK_TTL, CACHE_LOCK_WAIT, CACHE_LOCK_POLL)
+from utils import cache_backend, metrics, resilience, scheduler, tracing
+
+# Written into fetch locks, to tell which instance holds them
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+def get_policy(namespace):
+    """Get the freshness policy of a namespace from the fields it holds.
+
+    Args:
+        namespace (str): Cache namespace (e.g. 'omdb_details')
+
+    Returns:
+        tuple: (seconds fresh, seconds usable while stale)
+    """
+    ttls = [CACHE_FIELD_TTLS[field] for field in CACHE_NAMESPACES[namespace]]
+    return min(ttls), max(ttls)
+
+def is_success(value):
+    """Default check of which results are worth caching (not None or a failed lookup)."""
+    if isinstance(value, dict):
+        return value.get("success", True) is not False
+    return value is not None
+
+def is_not_found(value):
+    """Default check of which results are known misses (lookups flagged 'not_found')."""
+    return isinstance(value, dict) and bool(value.get("not_found"))
+
+# Fetch times of the values served in the current context (see track_freshness)
+_freshness = contextvars.ContextVar("freshness", default=None)
+
+@contextmanager
+def track_freshness():
+    """Record when the values served inside the block were fetched, per namespace.
+
+    Cached values report the time their entry was stored, fetched values the
+    current time. Threads started with tracing.bind() report to the same record.
+
+    Yields:
+        dict: {namespace: oldest fetch time (Unix time) of the values served}
+    """
+    record = {}
+    token = _freshness.set(record)
+    try:
+        yield record
+    finally:
+        _freshness.reset(token)
+
+def note_freshness(namespace, fetched_at):
+    """Report the fetch time of a value served in the current context (see track_freshness)."""
+    record = _freshness.get()
+    if record is not None:
+        record[namespace] = min(fetched_at, record.get(namespace, fetched_at))
+
+class TieredCache:
+    """In-memory LRU in front of a cache backend.
+
+    Negative entries have their own LRU and keys ('negative/...' instead of
+    'http/...'), so misses never evict or overwrite positive entries.
+    Namespaces holding values that are not plain JSON (e.g. records) register
+    a codec; the memory tier keeps the values themselves and only the backend
+    stores their encoded form.
+
+    Args:
+        backend (CacheBackend, optional): Storage tier (default: CACHE_BACKEND)
+        max_entries (int): Entries kept in memory (each for positive and negative entries)
+    """
+
+    def __init__(self, backend=None, max_entries=CACHE_MEMORY_ENTRIES):
+        self.backend = backend or cache_backend.default_backend
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.negative = OrderedDict()
+        self.inflight = {}
+        self.stats = {}
+        self.codecs = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+    def _storage_key(self, namespace, key, kind="http"):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{kind}/{namespace}/{digest}"
+
+    def register_codec(self, namespace, encode, decode):
+        """Store the values of a namespace on disk in an encoded form.
+
+        Args:
+            namespace (str): Cache namespace
+            encode (callable): Converts a value to a JSON-serializable form
+            decode (callable): Rebuilds a value from the output of encode
+        """
+        self.codecs[namespace] = (encode, decode)
+
+    def _count(self, namespace, outcome):
+        with self._lock:
+            counters = self.stats.setdefault(namespace, {"hits": 0, "stale": 0, "negative": 0,
+                                                         "misses": 0, "refreshes": 0, "waits": 0})
+            counters[outcome] += 1
+
+    def _remember(self, memory_key, entry, negative=False):
+        memory = self.negative if negative else self.memory
+        with self._lock:
+            memory[memory_key] = entry
+            memory.move_to_end(memory_key)
+            while len(memory) > self.max_entries:
+                memory.popitem(last=False)
+
+    def get_entry(self, namespace, key, negative=False):
+        """Look up an entry in memory, then in the backend.
+
+        Returns:
+            dict: Entry with 'value' and 'stored_at', or None
+        """
+        memory = self.negative if negative else self.memory
+        memory_key = (namespace, key)
+        with self._lock:
+            entry = memory.get(memory_key)
+            if entry is not None:
+                memory.move_to_end(memory_key)
+                return entry
+        return self._load(namespace, key, negative)
+
+    def _load(self, namespace, key, negative=False):
+        """Read an entry from the backend into memory."""
+        try:
+            entry = self.backend.get(self._storage_key(namespace, key, "negative" if negative else "http"))
+        except OSError as e:
+            print(f"Error reading cache entry: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        if not negative and namespace in self.codecs:
+            try:
+                entry["value"] = self.codecs[namespace][1](entry["value"])
+            except (TypeError, ValueError, IndexError, KeyError):
+                return None  # Written in an older format: fetch again
+        self._remember((namespace, key), entry, negative)
+        return entry
+
+    def set(self, namespace, key, value, negative=False):
+        """Store a value in both tiers."""
+        entry = {"key": key, "stored_at": time.time(), "value": value}
+        self._remember((namespace, key), entry, negative)
+        if not negative and namespace in self.codecs:
+            entry = dict(entry, value=self.codecs[namespace][0](value))
+
+        # The backend may drop the entry once it is no longer usable
+        ttl = CACHE_NEGATIVE_TTLS[namespace] if negative else get_policy(namespace)[1]
+        try:
+            self.backend.set(self._storage_key(namespace, key, "negative" if negative else "http"), entry, ttl)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving cache entry: {e}")
+
+    def get_negative(self, namespace, key):
+        """Get the stored result of a recent known miss.
+
+        Returns:
+            A copy of the result stored by set_negative(), or None if there is
+            no negative entry younger than the namespace's CACHE_NEGATIVE_TTLS
+        """
+        entry = self.get_entry(namespace, key, negative=True)
+        if entry is None:
+            return None
+        if time.time() - entry["stored_at"] >= CACHE_NEGATIVE_TTLS[namespace] and not resilience.is_offline():
+            return None
+        self._count(namespace, "negative")
+        tracing.annotate(cache="negative")
+        note_freshness(namespace, entry["stored_at"])
+        return copy.deepcopy(entry["value"])
+
+    def set_negative(self, namespace, key, value):
+        """Remember that a lookup found nothing.
+
+        Args:
+            namespace (str): Cache namespace (see CACHE_NEGATIVE_TTLS)
+            key (str): Entry key within the namespace
+            value: Result to return for the miss until the entry expires
+        """
+        self.set(namespace, key, value, negative=True)
+
+    def _fetch(self, namespace, key, fetch, store_if, is_miss):
+        """Run fetch once for concurrent callers of the same key and store the result."""
+        with self._lock:
+            future = self.inflight.get((namespace, key))
+            owner = future is None
+            if owner:
+                future = self.inflight[(namespace, key)] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._fetch_once(namespace, key, fetch, store_if, is_miss)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self.inflight.pop((namespace, key), None)
+
+    def _fetch_once(self, namespace, key, fetch, store_if, is_miss):
+        """Fetch and store a value, unless another instance sharing the backend already is.
+
+        The instance holding the backend lock of the key fetches; the others
+        wait for it to finish and use the entry it stored. If it stores none
+        (failed lookup) or takes longer than CACHE_LOCK_WAIT, they fetch too.
+        """
+        lock_key = self._storage_key(namespace, key, "lock")
+        started = time.time()
+        locked = self._lock_fetch(lock_key)
+        if not locked:
+            self._count(namespace, "waits")
+            tracing.annotate(cache="wait")
+            deadline = time.monotonic() + CACHE_LOCK_WAIT
+            while not locked and time.monotonic() < deadline:
+                time.sleep(CACHE_LOCK_POLL)
+                locked = self._lock_fetch(lock_key)
+            # Entries older than the lock were there before the other fetch started
+            for negative in (False, True):
+                entry = self._load(namespace, key, negative)
+                if entry is not None and entry["stored_at"] >= started - CACHE_LOCK_TTL:
+                    if locked:
+                        self._unlock_fetch(lock_key)
+                    return entry["value"]
+
+        try:
+            value = fetch()
+            if store_if(value):
+                self.set(namespace, key, value)
+            elif is_miss(value) and namespace in CACHE_NEGATIVE_TTLS:
+                self.set_negative(namespace, key, value)
+            return value
+        finally:
+            if locked:
+                self._unlock_fetch(lock_key)
+
+    def _lock_fetch(self, lock_key):
+        """Take the backend lock of a key (True if taken, or if the backend cannot be reached)."""
+        try:
+            return self.backend.add(lock_key, {"owner": INSTANCE_ID, "at": time.time()}, CACHE_LOCK_TTL)
+        except OSError as e:
+            print(f"Error locking cache entry: {e}")
+            return True
+
+    def _unlock_fetch(self, lock_key):
+        try:
+            self.backend.delete(lock_key)
+        except OSError as e:
+            print(f"Error unlocking cache entry: {e}")
+
+    def _refresh(self, namespace, key, fetch, store_if, is_miss):
+        """Refresh a stale entry in the background (at most once at a time per key)."""
+        with self._lock:
+            if (namespace, key) in self.inflight:
+                return
+        self._count(namespace, "refreshes")
+        # Refreshes give way to the upstream requests of views users are waiting for
+        future = self._refresher.submit(scheduler.bind("refresh", self._fetch), namespace, key, fetch, store_if, is_miss)
+        future.add_done_callback(lambda f: f.exception())  # Errors keep the stale entry
+
+    def get_or_fetch(self, namespace, key, fetch, store_if=is_success, is_miss=is_not_found):
+        """Get a value from the cache, fetching it when missing or expired.
+
+        Args:
+            namespace (str): Cache namespace (see CACHE_NAMESPACES)
+            key (str): Entry key within the namespace
+            fetch (callable): Fetches the current value
+            store_if (callable, optional): Decides whether a fetched value is cached
+            is_miss (callable, optional): Decides whether a value that is not
+                cached is a known miss, kept as a negative entry
+
+        Returns:
+            A copy of the cached or fetched value
+        """
+        fresh_for, usable_for = get_policy(namespace)
+        entry = self.get_entry(namespace, key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < fresh_for:
+                self._count(namespace, "hits")
+                tracing.annotate(cache="hit")
+                note_freshness(namespace, entry["stored_at"])
+                return copy.deepcopy(entry["value"])
+            offline = resilience.is_offline()
+            if age < usable_for or offline:
+                self._count(namespace, "stale")
+                tracing.annotate(cache="stale")
+                note_freshness(namespace, entry["stored_at"])
+                if not offline:
+                    self._refresh(namespace, key, fetch, store_if, is_miss)
+                return copy.deepcopy(entry["value"])
+
+        if namespace in CACHE_NEGATIVE_TTLS:
+            value = self.get_negative(namespace, key)
+            if value is not None:
+                return value
+
+        self._count(namespace, "misses")
+        tracing.annotate(cache="miss")
+        note_freshness(namespace, time.time())
+        return copy.deepcopy(self._fetch(namespace, key, fetch, store_if, is_miss))
+
+    def get_stats(self):
+        """Get hit/stale/negative/miss/refresh/wait counters per namespace."""
+        with self._lock:
+            return {namespace: dict(counters) for namespace, counters in self.stats.items()}
+
+# Cache shared by the api modules
+default_cache = TieredCache()
+
+def cached(namespace, store_if=is_success, is_miss=is_not_found, encode=None, decode=None):
+    """Decorator caching a lookup function in the default cache.
+
+    The key is built from the call arguments, which must be JSON-serializable.
+
+    Args:
+        namespace (str): Cache namespace (see CACHE_NAMESPACES)
+        store_if (callable, optional): Decides whether a result is cached
+        is_miss (callable, optional): Decides whether a result is a known miss
+        encode (callable, optional): Converts results to JSON for the disk tier
+        decode (callable, optional): Rebuilds results from the output of encode
+    """
+    if encode is not None:
+        default_cache.register_codec(namespace, encode, decode)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            return default_cache.get_or_fetch(namespace, key, lambda: func(*args, **kwargs), store_if, is_miss)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+def make_key(*parts):
+    """Build a cache key from JSON-serializable parts."""
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False)
+
+def get_negative(namespace, key):
+    """Get a recent known miss from the default cache (see TieredCache.get_negative)."""
+    return default_cache.get_negative(namespace, key)
+
+def set_negative(namespace, key, value):
+    """Remember a known miss in the default cache (see TieredCache.set_negative)."""
+    default_cache.set_negative(namespace, key, value)
+
+def get_stats():
+    """Get hit/stale/negative/miss/refresh/wait counters per namespace (for metrics and /health)."""
+    return default_cache.get_stats()
+
+def collect_metrics():
+    """Report the cache counters (see metrics.register_collector)."""
+    return [("movie_cache_events_total", "counter", "Cache lookups by outcome (hits, stale, negative, misses), refreshes and waits for other instances",
+             [({"namespace": namespace, "event": event}, count)
+              for namespace, counters in get_stats().items() for event, count in counters.items()])]
+
+metrics.register_collector(collect_metrics)
@@ -26,6 +26,17 @@ def format_date(date_str):
     except ValueError:
         return date_str
 
+def format_timestamp(timestamp):
+    """Format a Unix time as a Vietnamese date and time (DD/MM/YYYY HH:MM).
+    
+    Args:
+        timestamp (float): Seconds since the epoch
+        
+    Returns:
+        str: Formatted local date and time
+    """
+    return datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M")
+
 def format_rating_source(source):
     """Translate rating source names to shorter versions.
     
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ID mapping module for the Movie Search Script.
+Keeps a persistent table linking a TMDb movie id to its IMDb id, Wikipedia
+pages (per language) and recently found YouTube videos, so later views can
+call ID-based endpoints instead of searching by title again.
+
+With a shared cache backend (CACHE_BACKEND=redis://...) each entry is also
+kept there, so ids learned by one instance are used by all of them.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import ID_MAP_FILE, ID_MAP_YOUTUBE_TTL
+from utils import cache_backend, metrics
+
+_lock = threading.Lock()
+_entries = None
+
+# get_ids() lookups that found / did not find a known movie (reported by the HTTP service)
+stats = {"hits": 0, "misses": 0}
+
+def _load():
+    """Load the mapping table from disk on first use.
+
+    Returns:
+        dict: Mapping of TMDb id (as string) to entry dict
+    """
+    global _entries
+    if _entries is None:
+        try:
+            with open(ID_MAP_FILE, encoding="utf-8") as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+def _save():
+    """Write the mapping table to disk atomically."""
+    os.makedirs(os.path.dirname(ID_MAP_FILE), exist_ok=True)
+    tmp_path = f"{ID_MAP_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_entries, f, ensure_ascii=False)
+        os.replace(tmp_path, ID_MAP_FILE)
+    except OSError as e:
+        print(f"Error saving ID map: {e}")
+
+def _get_shared(tmdb_id):
+    """Get the entry of a movie from the shared backend (None if there is none)."""
+    backend = cache_backend.default_backend
+    if not backend.shared:
+        return None
+    try:
+        return backend.get(f"ids/{tmdb_id}")
+    except OSError as e:
+        print(f"Error reading shared ID map: {e}")
+        return None
+
+def _set_shared(tmdb_id, entry):
+    backend = cache_backend.default_backend
+    if backend.shared:
+        try:
+            backend.set(f"ids/{tmdb_id}", entry)
+        except OSError as e:
+            print(f"Error saving shared ID map: {e}")
+
+def get_ids(tmdb_id):
+    """Get the known external ids of a movie.
+
+    Args:
+        tmdb_id (int): TMDb movie ID
+
+    Returns:
+        dict: Entry with optional keys 'imdb_id', 'wikidata_id',
+            'wikipedia' (language -> page title) and 'youtube'
+            ({'video_ids': [...], 'updated_at': timestamp})
+    """
+    shared = _get_shared(tmdb_id)
+    with _lock:
+        entry = shared or _load().get(str(tmdb_id), {})
+        stats["hits" if entry else "misses"] += 1
+        return json.loads(json.dumps(entry))  # Copy so callers cannot mutate the table
+
+def update_ids(tmdb_id, imdb_id=None, wikidata_id=None, wikipedia_pages=None, youtube_video_ids=None):
+    """Record ids learned from TMDb external_ids or from a successful lookup.
+
+    Args:
+        tmdb_id (int): TMDb movie ID
+        imdb_id (str, optional): IMDb ID (e.g. 'tt1375666')
+        wikidata_id (str, optional): Wikidata item ID (e.g. 'Q25188')
+        wikipedia_pages (dict, optional): Language code -> Wikipedia page title
+        youtube_video_ids (list, optional): Video ids of the latest YouTube reviews
+    """
+    shared = _get_shared(tmdb_id)
+    with _lock:
+        entries = _load()
+        entry = entries.setdefault(str(tmdb_id), {})
+        if shared:
+            entry.update(shared)  # Ids learned by other instances
+        changed = False
+
+        if imdb_id and entry.get("imdb_id") != imdb_id:
+            entry["imdb_id"] = imdb_id
+            changed = True
+
+        if wikidata_id and entry.get("wikidata_id") != wikidata_id:
+            entry["wikidata_id"] = wikidata_id
+            changed = True
+
+        if wikipedia_pages:
+            pages = entry.setdefault("wikipedia", {})
+            for language, title in wikipedia_pages.items():
+                if title and pages.get(language) != title:
+                    pages[language] = title
+                    changed = True
+
+        if youtube_video_ids:
+            entry["youtube"] = {
+                "video_ids": list(youtube_video_ids),
+                "updated_at": int(time.time())
+            }
+            changed = True
+
+        if changed:
+            entry["updated_at"] = int(time.time())
+            _save()
+            _set_shared(tmdb_id, entry)
+
+def get_recent_youtube_ids(entry):
+    """Get stored YouTube video ids if they are recent enough to reuse.
+
+    Args:
+        entry (dict): Entry returned by get_ids()
+
+    Returns:
+        list: Video ids, or an empty list if none are stored or they are stale
+    """
+    youtube = entry.get("youtube") or {}
+    if time.time() - youtube.get("updated_at", 0) > ID_MAP_YOUTUBE_TTL:
+        return []
+    return youtube.get("video_ids", [])
+
+def collect_metrics():
+    """Report the lookup counters (see metrics.register_collector)."""
+    return [("movie_cache_events_total", "counter", "Cache lookups by outcome (hits, stale, negative, misses) and refreshes",
+             [({"namespace": "id_map", "event": event}, count) for event, count in stats.items()])]
+
+metrics.register_collector(collect_metrics)
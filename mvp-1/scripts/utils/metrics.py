@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Metrics module for the Movie Search Script.
+In-process registry of counters, gauges and fixed-bucket histograms,
+exported in the Prometheus text format: by GET /metrics of server.py, or
+as a file rewritten every METRICS_DUMP_INTERVAL seconds when METRICS_FILE
+is set (e.g. for the node_exporter textfile collector).
+
+Recording is a dict update under a lock, cheap enough for every upstream
+call. Counters the other modules already keep (cache, limiters, breakers,
+hedging) are not recorded twice: collectors registered with
+register_collector() read them when the metrics are exported.
+"""
+
+import atexit
+import bisect
+import math
+import os
+import sys
+import threading
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import METRICS_FILE, METRICS_DUMP_INTERVAL
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from cache hits to slow upstream calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metric:
+    """Base class of the metric types: one value per combination of label values.
+
+    Args:
+        name (str): Metric name (e.g. 'movie_upstream_requests_total')
+        documentation (str): HELP text
+        labelnames (tuple, optional): Label names; values are passed positionally
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and self.kind in ("counter", "gauge"):
+            self._values[()] = 0  # Exported as 0 before the first update
+
+    def samples(self):
+        """Get the samples of the metric.
+
+        Returns:
+            list: (sample name, labels dict, value) tuples
+        """
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, labels)), value) for labels, value in self._values.items()]
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+class Gauge(Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets.
+
+    Args:
+        buckets (tuple, optional): Upper bounds of the buckets (+Inf is added)
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+
+        samples = []
+        for labels, counts, total in values:
+            labels = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", dict(labels, le=format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+_metrics = {}
+_collectors = []
+_registry_lock = threading.Lock()
+
+def _register(metric_type, name, documentation, labelnames=(), **kwargs):
+    with _registry_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = metric_type(name, documentation, labelnames, **kwargs)
+        return metric
+
+def counter(name, documentation, labelnames=()):
+    """Get or create a counter in the registry."""
+    return _register(Counter, name, documentation, labelnames)
+
+def gauge(name, documentation, labelnames=()):
+    """Get or create a gauge in the registry."""
+    return _register(Gauge, name, documentation, labelnames)
+
+def histogram(name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+    """Get or create a histogram in the registry."""
+    return _register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+def register_collector(collect):
+    """Add a function reporting metrics kept elsewhere, called at export time.
+
+    Args:
+        collect (callable): Returns a list of (name, kind, documentation,
+            samples) families, samples being (labels dict, value) pairs.
+            Families of the same name from several collectors are merged.
+    """
+    with _registry_lock:
+        _collectors.append(collect)
+
+def format_value(value):
+    """Format a sample value (or bucket bound) for the text format."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+def render():
+    """Export all metrics in the Prometheus text format.
+
+    Returns:
+        str: Metrics text (CONTENT_TYPE)
+    """
+    with _registry_lock:
+        metrics = list(_metrics.values())
+        collectors = list(_collectors)
+
+    families = {}
+    for metric in metrics:
+        families[metric.name] = [metric.kind, metric.documentation, metric.samples()]
+    for collect in collectors:
+        try:
+            collected = collect()
+        except Exception as e:
+            print(f"Error collecting metrics: {e}")
+            continue
+        for name, kind, documentation, samples in collected:
+            family = families.setdefault(name, [kind, documentation, []])
+            family[2].extend((name, labels, value) for labels, value in samples)
+
+    lines = []
+    for name, (kind, documentation, samples) in families.items():
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            if value is not None:
+                lines.append(f"{sample_name}{_format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+def dump(path=METRICS_FILE):
+    """Write all metrics to a file (replaced atomically, so readers never see a partial file).
+
+    Args:
+        path (str, optional): Output file
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing metrics file: {e}")
+
+def start_file_dump(path=METRICS_FILE, interval=METRICS_DUMP_INTERVAL):
+    """Rewrite the metrics file periodically and once more at exit.
+
+    Does nothing when no path is configured (METRICS_FILE).
+
+    Args:
+        path (str, optional): Output file
+        interval (float, optional): Seconds between writes
+
+    Returns:
+        threading.Thread: The dump thread, or None
+    """
+    if not path:
+        return None
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            dump(path)
+
+    def finish():
+        stop.set()
+        dump(path)
+
+    thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+    thread.start()
+    atexit.register(finish)
+    return thread
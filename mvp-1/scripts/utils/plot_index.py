@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Plot index module for the Movie Search Script.
+Local full-text index (SQLite FTS5, in PLOT_INDEX_FILE) of the plot texts
+fetched so far: TMDb overviews, OMDb plots and Wikipedia plots, in their
+own language and in their Vietnamese translation. Movies can then be found
+by their story ('phim về người du hành thời gian') in milliseconds, without
+a network search, and also in offline mode.
+
+Texts and queries are folded the same way (lowercase, no diacritics, see
+text.fold_diacritics), so 'du hanh thoi gian' finds 'du hành thời gian'.
+Vietnamese words are made of space-separated syllables, which the FTS5
+tokenizer indexes one by one: a query matches the texts holding all of its
+syllables, or if there are none, the texts holding most of them. Texts are
+replaced only when they change, so indexing a movie again is cheap.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import PLOT_INDEX_FILE
+from utils import metrics, text
+
+SEARCH_DURATION = metrics.histogram("movie_plot_search_duration_seconds", "Time to search the local plot index")
+INDEXED_DOCUMENTS = metrics.counter("movie_plot_index_updates_total", "Plot texts added to or replaced in the local index",
+                                    ["source"])
+
+# Query words too common in plot searches to narrow them ('phim về ...', 'a movie about ...')
+STOPWORDS = {
+    "phim", "về", "là", "của", "một", "những", "các", "và", "có", "với", "cho", "trong", "bộ",
+    "a", "an", "the", "of", "about", "movie", "film", "and", "with", "in", "on", "to"
+}
+
+# Longest query (in words) and snippet (in characters)
+MAX_QUERY_TERMS = 16
+SNIPPET_LENGTH = 160
+
+# Terms this long also match as prefixes ('travel' finds 'traveler'); shorter Vietnamese syllables must match whole
+PREFIX_MIN_LENGTH = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    tmdb_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    language TEXT NOT NULL,
+    title TEXT NOT NULL,
+    year TEXT NOT NULL,
+    body TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (tmdb_id, source, language)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS plots USING fts5(titles, body, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+_connection = None
+_lock = threading.Lock()
+
+def _connect():
+    """Get the shared connection, opening (and creating) the index on first use."""
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(os.path.abspath(PLOT_INDEX_FILE)), exist_ok=True)
+        connection = sqlite3.connect(PLOT_INDEX_FILE, timeout=5, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers in other processes do not block writers
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL: a crash loses at most the last updates
+        connection.executescript(SCHEMA)
+        _connection = connection
+    return _connection
+
+def fold(value):
+    """Fold a text the way the index stores it ('Bố Già' -> 'bo gia')."""
+    return text.fold_diacritics(value.casefold())
+
+def add_movie(tmdb_id, texts, title="", year="", titles=()):
+    """Add or replace the plot texts of a movie.
+
+    Args:
+        tmdb_id (int): TMDb movie ID
+        texts (iterable): (source, language, text) tuples, e.g. ('imdb', 'en', plot);
+            source is 'tmdb', 'imdb' or 'wikipedia', empty texts are ignored
+        title (str, optional): Movie title shown in search results
+        year (str, optional): Release year shown in search results
+        titles (iterable, optional): Other titles of the movie, also searched
+
+    Returns:
+        int: Number of texts added or replaced (unchanged texts are skipped)
+    """
+    if tmdb_id is None:
+        return 0
+    names = list(dict.fromkeys(name for name in (title, *titles) if name))
+    folded_names = fold(" / ".join(names))
+    updated = []
+    seen = set()
+
+    try:
+        with _lock:
+            connection = _connect()
+            with connection:
+                for source, language, body in texts:
+                    body = (body or "").strip()
+                    if not body or body in seen:  # e.g. a translation that failed and kept the source text
+                        continue
+                    seen.add(body)
+                    digest = hashlib.sha1("\n".join(names + [body]).encode("utf-8")).hexdigest()
+                    row = connection.execute(
+                        "SELECT id, digest FROM documents WHERE tmdb_id = ? AND source = ? AND language = ?",
+                        (tmdb_id, source, language)
+                    ).fetchone()
+                    if row is not None and row[1] == digest:
+                        continue
+                    if row is not None:
+                        connection.execute("DELETE FROM plots WHERE rowid = ?", (row[0],))
+                        connection.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+                    cursor = connection.execute(
+                        "INSERT INTO documents (tmdb_id, source, language, title, year, body, digest, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tmdb_id, source, language, title, str(year or ""), body, digest, time.time())
+                    )
+                    connection.execute("INSERT INTO plots (rowid, titles, body) VALUES (?, ?, ?)",
+                                       (cursor.lastrowid, folded_names, fold(body)))
+                    updated.append(source)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error updating plot index: {e}")
+        return 0
+    for source in updated:
+        INDEXED_DOCUMENTS.inc(source)
+    return len(updated)
+
+def query_terms(query):
+    """Split a plot query into folded search terms, without stopwords.
+
+    Returns:
+        list: Terms, in query order (all words if every word is a stopword)
+    """
+    words = re.findall(r"\w+", text.normalize_query(query))
+    terms = [word for word in words if word not in STOPWORDS] or words
+    return list(dict.fromkeys(fold(term) for term in terms))[:MAX_QUERY_TERMS]
+
+def make_snippet(body, terms, length=SNIPPET_LENGTH):
+    """Cut the part of a text around the first query term it contains."""
+    folded = fold(body)
+    start = 0
+    if len(folded) == len(body):  # Folding kept one character per character: positions match
+        match = re.search(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", folded)
+        if match:
+            start = max(0, match.start() - length // 4)
+            start = body.rfind(" ", 0, start) + 1 if start else 0
+    snippet = body[start:start + length]
+    if start + length < len(body):
+        snippet = snippet[:snippet.rfind(" ")] if " " in snippet else snippet
+        snippet += "…"
+    return ("…" if start else "") + snippet
+
+def search(query, limit=10):
+    """Search the indexed plots.
+
+    Args:
+        query (str): Words of the plot, with or without diacritics
+        limit (int, optional): Maximum number of movies
+
+    Returns:
+        list: One dict per movie, best match first, with 'id', 'title',
+            'release_year', 'source' and 'language' of the best matching
+            text, and 'snippet' (a part of that text)
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    started = time.perf_counter()
+    quoted = [f'"{term}"*' if len(term) >= PREFIX_MIN_LENGTH else f'"{term}"' for term in terms]
+    rows = []
+    try:
+        with _lock:
+            connection = _connect()
+            # Texts with every term first; otherwise those with most of them (bm25 adds up the terms found)
+            for match in dict.fromkeys((" AND ".join(quoted), " OR ".join(quoted))):
+                rows = connection.execute(
+                    "SELECT d.tmdb_id, d.title, d.year, d.source, d.language, d.body "
+                    "FROM plots JOIN documents d ON d.id = plots.rowid "
+                    "WHERE plots MATCH ? ORDER BY bm25(plots, 2.0, 1.0) LIMIT ?",
+                    (match, limit * 6)  # A movie has up to 6 texts (3 sources, 2 languages)
+                ).fetchall()
+                if rows:
+                    break
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error searching plot index: {e}")
+    finally:
+        SEARCH_DURATION.observe(time.perf_counter() - started)
+
+    results = {}
+    for tmdb_id, title, year, source, language, body in rows:
+        if tmdb_id not in results and len(results) < limit:
+            results[tmdb_id] = {
+                "id": tmdb_id,
+                "title": title,
+                "release_year": year,
+                "source": source,
+                "language": language,
+                "snippet": make_snippet(body, terms)
+            }
+    return list(results.values())
+
+def get_stats():
+    """Get the size of the index.
+
+    Returns:
+        dict: Number of 'documents' and of 'movies' indexed
+    """
+    try:
+        with _lock:
+            documents, movies = _connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT tmdb_id) FROM documents"
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error reading plot index: {e}")
+        return {"documents": 0, "movies": 0}
+    return {"documents": documents, "movies": movies}
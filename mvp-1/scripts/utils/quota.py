@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Quota ledger module for the Movie Search Script.
+Keeps a persistent count of the API quota units spent per key and per day,
+so callers can refuse or degrade before an upstream daily quota runs out.
+
+With a shared cache backend (CACHE_BACKEND=redis://...) the count is kept
+there instead, so every instance spends from the same daily quota. The local
+ledger is used when the backend cannot be reached.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+
+try:
+    import fcntl  # Serializes ledger updates between processes (not available on Windows)
+except ImportError:
+    fcntl = None
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")  # Google quotas reset at midnight Pacific Time
+except Exception:
+    QUOTA_TIMEZONE = datetime.timezone(datetime.timedelta(hours=-8))
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import QUOTA_FILE
+from utils import cache_backend
+
+# Shared counters outlive their quota day by a day, then expire
+SHARED_COUNTER_TTL = 2 * 24 * 3600
+
+_lock = threading.Lock()
+
+def quota_day():
+    """Get the current quota day.
+
+    Returns:
+        str: Date in YYYY-MM-DD format, in the quota reset timezone
+    """
+    return datetime.datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+def _ledger_key(service, api_key):
+    """Build the ledger key for an API key without storing the key itself."""
+    digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+    return f"{service}:{digest}"
+
+def _shared_add(service, api_key, units):
+    """Add units to today's shared counter of a key.
+
+    Returns:
+        int: Units used today, or None without a reachable shared backend
+    """
+    backend = cache_backend.default_backend
+    if not backend.shared:
+        return None
+    try:
+        return backend.incr(f"quota/{_ledger_key(service, api_key)}/{quota_day()}", units, SHARED_COUNTER_TTL)
+    except OSError as e:
+        print(f"Error updating shared quota: {e}")
+        return None
+
+def _update(callback):
+    """Apply callback to the ledger while holding the process and file locks.
+
+    Args:
+        callback (callable): Receives the ledger dict, may modify it and
+            returns the value to pass back to the caller
+
+    Returns:
+        Value returned by callback
+    """
+    with _lock:
+        os.makedirs(os.path.dirname(QUOTA_FILE), exist_ok=True)
+        with open(QUOTA_FILE, "a+", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    ledger = json.loads(f.read() or "{}")
+                except ValueError:
+                    ledger = {}
+
+                result = callback(ledger)
+
+                f.seek(0)
+                f.truncate()
+                json.dump(ledger, f)
+                f.flush()
+                return result
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+def _entry_for_today(ledger, service, api_key):
+    """Get the ledger entry for today, resetting it if it is from an older day."""
+    day = quota_day()
+    entry = ledger.get(_ledger_key(service, api_key))
+    if not entry or entry.get("day") != day:
+        entry = {"day": day, "used": 0}
+        ledger[_ledger_key(service, api_key)] = entry
+    return entry
+
+def get_remaining(service, api_key, daily_limit):
+    """Get the quota units left today.
+
+    Args:
+        service (str): Service name (e.g. 'youtube')
+        api_key (str): API key the quota belongs to
+        daily_limit (int): Daily quota of the key
+
+    Returns:
+        int: Remaining units (never negative)
+    """
+    used = _shared_add(service, api_key, 0)
+    if used is None:
+        used = _update(lambda ledger: _entry_for_today(ledger, service, api_key)["used"])
+    return max(0, daily_limit - used)
+
+def try_spend(service, api_key, units, daily_limit, reserve=0):
+    """Reserve quota units before making a call.
+
+    Args:
+        service (str): Service name (e.g. 'youtube')
+        api_key (str): API key the quota belongs to
+        units (int): Cost of the call
+        daily_limit (int): Daily quota of the key
+        reserve (int, optional): Units that must stay available after this call
+
+    Returns:
+        bool: True if the units were recorded, False if the call should not be made
+    """
+    used = _shared_add(service, api_key, units)
+    if used is not None:
+        if used + reserve > daily_limit:
+            _shared_add(service, api_key, -units)  # Give back the units taken above
+            return False
+        return True
+
+    def spend(ledger):
+        entry = _entry_for_today(ledger, service, api_key)
+        if entry["used"] + units + reserve > daily_limit:
+            return False
+        entry["used"] += units
+        return True
+
+    return _update(spend)
+
+def mark_exhausted(service, api_key, daily_limit):
+    """Record that the upstream reported the quota as exceeded for today.
+
+    Args:
+        service (str): Service name (e.g. 'youtube')
+        api_key (str): API key the quota belongs to
+        daily_limit (int): Daily quota of the key
+    """
+    used = _shared_add(service, api_key, 0)
+    if used is not None:
+        if used < daily_limit:
+            _shared_add(service, api_key, daily_limit - used)
+        return
+
+    def exhaust(ledger):
+        _entry_for_today(ledger, service, api_key)["used"] = daily_limit
+
+    _update(exhaust)
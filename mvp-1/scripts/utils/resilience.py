@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resilience module for the Movie Search Script.
+Keeps one token-bucket rate limiter and one circuit breaker per upstream
+(tmdb, omdb, youtube, wikipedia, translate). Requests wait briefly for a
+token instead of tripping the upstream's rate limit, and after repeated
+errors a breaker opens and fails requests immediately for a cool-down
+window instead of letting each one run into a timeout. Before both, a
+request takes one of the upstream's concurrency slots (see
+utils/scheduler.py). In offline mode no request is let through at all.
+"""
+
+import sys
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import UPSTREAM_RATE_LIMITS, RATE_LIMIT_MAX_WAIT, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN, OFFLINE
+from utils import metrics, scheduler
+
+# HTTP statuses counted as upstream failures (rate limits, exhausted quotas and keys, outages)
+FAILURE_STATUSES = {401, 403, 429}
+
+# Requests sent to upstreams, through the HTTP session (see utils/http_client.py) or guard()
+UPSTREAM_REQUESTS = metrics.counter("movie_upstream_requests_total",
+                                    "Upstream requests by outcome (HTTP status, 'ok' or 'error')", ["source", "status"])
+UPSTREAM_DURATION = metrics.histogram("movie_upstream_request_duration_seconds",
+                                      "Duration of upstream requests", ["source"])
+UPSTREAM_RETRIES = metrics.counter("movie_upstream_retries_total", "Upstream requests repeated after an error", ["source"])
+
+class UpstreamUnavailable(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request when its upstream's breaker is open
+    or no concurrency slot or rate-limit token becomes available in time.
+
+    It is a requests ConnectionError, so the api modules handle it like any
+    other failed request.
+    """
+
+class TokenBucket:
+    """Token-bucket rate limiter.
+
+    Args:
+        rate (float): Tokens added per second
+        burst (int): Bucket size (requests allowed at once after a pause)
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.acquired = 0
+        self.waited = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=RATE_LIMIT_MAX_WAIT):
+        """Take a token, sleeping until it is available.
+
+        Args:
+            max_wait (float, optional): Longest acceptable wait in seconds
+
+        Returns:
+            bool: True if a token was taken, False if the wait would be too long
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # Tokens may go negative: each waiting caller reserves its own future token
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                self.rejected += 1
+                return False
+            self.tokens -= 1
+            self.acquired += 1
+            if wait:
+                self.waited += 1
+
+        if wait:
+            time.sleep(wait)
+        return True
+
+    def state(self):
+        with self._lock:
+            tokens = min(self.burst, self.tokens + (time.monotonic() - self.updated) * self.rate)
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(tokens, 2),
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "rejected": self.rejected
+            }
+
+class CircuitBreaker:
+    """Circuit breaker failing fast after repeated upstream errors.
+
+    closed: requests pass. After failure_threshold consecutive failures it
+    opens: requests are refused for cooldown seconds. Then it is half-open:
+    one trial request passes and closes the breaker again if it succeeds.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker
+        cooldown (float): Seconds the breaker stays open
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.status = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Check whether a request may be sent now.
+
+        Returns:
+            bool: False while the breaker is open
+        """
+        with self._lock:
+            if self.status == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.status = "half_open"
+                self._trial_running = False
+
+            if self.status == "closed":
+                return True
+            if self.status == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Give back a trial allowed by allow() when the request is not sent after all."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.status = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.status == "half_open" or self.failures >= self.failure_threshold:
+                if self.status != "open":
+                    self.times_opened += 1
+                self.status = "open"
+                self.opened_at = time.monotonic()
+                self._trial_running = False
+
+    def state(self):
+        with self._lock:
+            remaining = self.cooldown - (time.monotonic() - self.opened_at) if self.status == "open" else 0
+            return {
+                "status": self.status,
+                "failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "retry_in": round(max(0.0, remaining), 1)
+            }
+
+# In offline mode every upstream request is refused before it is sent
+_offline = OFFLINE
+
+def set_offline(enabled):
+    """Turn offline mode on or off (see OFFLINE)."""
+    global _offline
+    _offline = enabled
+
+def is_offline():
+    return _offline
+
+# One limiter and breaker per configured upstream; other names pass through unchecked
+_limiters = {name: TokenBucket(rate, burst) for name, (rate, burst) in UPSTREAM_RATE_LIMITS.items()}
+_breakers = {name: CircuitBreaker() for name in UPSTREAM_RATE_LIMITS}
+
+def acquire(source):
+    """Get permission to send one request to an upstream.
+
+    Takes a concurrency slot in the current priority class (see
+    utils/scheduler.py), to be given back with release() once the request
+    is done.
+
+    Args:
+        source (str): Upstream name (e.g. 'tmdb')
+
+    Raises:
+        UpstreamUnavailable: In offline mode, or if no slot becomes free in
+            time, the breaker is open or the rate limit wait is too long
+    """
+    if _offline:
+        raise UpstreamUnavailable(f"{source} is not contacted in offline mode")
+    if not scheduler.acquire(source):
+        raise UpstreamUnavailable(f"{source} is busy (no free slot for {scheduler.current_priority()} requests)")
+    breaker = _breakers.get(source)
+    if breaker is None:
+        return
+    if not breaker.allow():
+        scheduler.release(source)
+        raise UpstreamUnavailable(f"{source} is temporarily unavailable (circuit open)")
+    if not _limiters[source].acquire():
+        breaker.release()
+        scheduler.release(source)
+        raise UpstreamUnavailable(f"{source} rate limit reached")
+
+def release(source):
+    """Give back the concurrency slot taken by acquire()."""
+    scheduler.release(source)
+
+def record_success(source):
+    """Record a successful request to an upstream."""
+    if source in _breakers:
+        _breakers[source].record_success()
+
+def record_failure(source):
+    """Record a failed request to an upstream."""
+    if source in _breakers:
+        _breakers[source].record_failure()
+
+def record_status(source, status_code):
+    """Record the outcome of a request from its HTTP status code."""
+    if status_code in FAILURE_STATUSES or status_code >= 500:
+        record_failure(source)
+    else:
+        record_success(source)
+
+@contextmanager
+def guard(source):
+    """Rate-limit and circuit-break a call that does not go through the HTTP session.
+
+    Exceptions raised inside the block count as failures and are re-raised.
+
+    Example:
+        with resilience.guard("translate"):
+            translation = translator.translate(text, dest='vi')
+    """
+    acquire(source)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_failure(source)
+        UPSTREAM_REQUESTS.inc(source, "error")
+        raise
+    finally:
+        UPSTREAM_DURATION.observe(time.perf_counter() - started, source)
+        release(source)
+    record_success(source)
+    UPSTREAM_REQUESTS.inc(source, "ok")
+
+def count_requests():
+    """Get the number of requests let through to all upstreams so far (e.g. for request budgets)."""
+    return sum(limiter.acquired for limiter in _limiters.values())
+
+def get_state():
+    """Get the state of every limiter and breaker (for metrics and /health).
+
+    Returns:
+        dict: {source: {'limiter': {...}, 'breaker': {...}}}
+    """
+    return {name: {"limiter": _limiters[name].state(), "breaker": _breakers[name].state()}
+            for name in _breakers}
+
+def collect_metrics():
+    """Report the limiter and breaker counters (see metrics.register_collector)."""
+    state = get_state()
+    families = [
+        ("movie_rate_limit_waited_total", "counter", "Requests that waited for a rate-limit token", "limiter", "waited"),
+        ("movie_rate_limit_rejected_total", "counter", "Requests refused because the rate-limit wait was too long",
+         "limiter", "rejected"),
+        ("movie_breaker_opened_total", "counter", "Times the circuit breaker opened", "breaker", "times_opened"),
+        ("movie_breaker_rejected_total", "counter", "Requests refused by an open circuit breaker", "breaker", "rejected")
+    ]
+    collected = [(name, kind, documentation, [({"source": source}, upstream[part][field])
+                                              for source, upstream in state.items()])
+                 for name, kind, documentation, part, field in families]
+    collected.append(("movie_breaker_open", "gauge", "1 while the circuit breaker of the upstream is open",
+                      [({"source": source}, upstream["breaker"]["status"] == "open") for source, upstream in state.items()]))
+    return collected
+
+metrics.register_collector(collect_metrics)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Transcript module for the Movie Search Script.
+Turns YouTube transcript segments into paragraphs and pages as a stream,
+so long transcripts are displayed page by page without building the whole
+text in memory first.
+"""
+
+from rich.panel import Panel
+
+# Characters that attach to the previous text without a space
+ATTACHED_PUNCTUATION = ',.!?:;'
+# Characters that end a sentence (and a paragraph)
+SENTENCE_END = '.!?'
+
+# Auto-generated transcripts often have no punctuation at all; cut paragraphs at this length
+MAX_PARAGRAPH_CHARS = 800
+# Approximate amount of text shown per page
+PAGE_CHARS = 3000
+
+def iter_paragraphs(segments, max_chars=MAX_PARAGRAPH_CHARS):
+    """Join transcript segments into sentence paragraphs.
+
+    Parts are buffered in a list and joined once per paragraph, so the
+    work is linear in the transcript length.
+
+    Args:
+        segments (iterable): Transcript segments (dicts with a 'text' key)
+        max_chars (int, optional): Paragraph length after which the paragraph
+            is cut at the next segment boundary, even without punctuation
+
+    Yields:
+        str: One paragraph (usually one sentence)
+    """
+    parts = []
+    length = 0
+
+    for segment in segments:
+        text = segment['text'].strip()
+
+        # Skip empty segments
+        if not text:
+            continue
+
+        # Add space before the text if it doesn't start with punctuation
+        if parts and text[0] not in ATTACHED_PUNCTUATION:
+            parts.append(' ')
+            length += 1
+
+        parts.append(text)
+        length += len(text)
+
+        # End the paragraph at sentence-ending punctuation or when it gets too long
+        if text[-1] in SENTENCE_END or length >= max_chars:
+            yield ''.join(parts)
+            parts = []
+            length = 0
+
+    # Add any remaining text
+    if parts:
+        yield ''.join(parts)
+
+def iter_pages(paragraphs, page_chars=PAGE_CHARS):
+    """Group paragraphs into pages of roughly page_chars characters.
+
+    Args:
+        paragraphs (iterable): Paragraphs from iter_paragraphs()
+        page_chars (int, optional): Target page size in characters
+
+    Yields:
+        str: Page text with paragraphs separated by blank lines
+    """
+    page = []
+    length = 0
+
+    for paragraph in paragraphs:
+        page.append(paragraph)
+        length += len(paragraph) + 2
+        if length >= page_chars:
+            yield '\n\n'.join(page)
+            page = []
+            length = 0
+
+    if page:
+        yield '\n\n'.join(page)
+
+def display_transcript(console, segments, title, interactive=True):
+    """Display a transcript one page at a time.
+
+    The first page is shown as soon as its segments have been processed.
+
+    Args:
+        console (Console): Rich console to print to
+        segments (iterable): Transcript segments (dicts with a 'text' key)
+        title (str): Panel title
+        interactive (bool, optional): Ask before showing each following page;
+            when False all pages are printed in sequence
+    """
+    for page_number, page in enumerate(iter_pages(iter_paragraphs(segments)), 1):
+        if page_number > 1 and interactive:
+            choice = input("\nNhấn Enter để xem tiếp phụ đề (hoặc 'q' để bỏ qua): ")
+            if choice.strip().lower() == 'q':
+                break
+
+        console.print(Panel(
+            page,
+            title=f"{title} (trang {page_number})" if page_number > 1 else title,
+            border_style="blue"
+        ))
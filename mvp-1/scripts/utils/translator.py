@@ -4,6 +4,9 @@
 """
 Translator module for the Movie Search Script.
 Handles translations to Vietnamese and other text processing functions.
+Closed vocabularies (genres, awards summaries) are translated from the
+precomputed table of utils/vocabulary.py; only other texts go to Google
+Translate.
 """
 
 import sys
@@ -14,6 +17,13 @@ import json
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import TARGET_LANGUAGE
+from utils import cache, metrics, resilience, tracing, vocabulary
+
+# Translation volume: texts asked for (cached or not) and characters sent to Google Translate
+TRANSLATIONS = metrics.counter("movie_translations_total", "Texts passed to translate_to_vietnamese")
+VOCABULARY_HITS = metrics.counter("movie_vocabulary_hits_total", "Texts translated from the precomputed vocabulary table")
+TRANSLATED_CHARACTERS = metrics.counter("movie_translated_characters_total",
+                                        "Characters sent for machine translation", ["source"])
 
 # Initialize translator with retry logic
 try:
@@ -23,6 +33,7 @@ except Exception as e:
     print(f"Error initializing translator: {e}")
     translator = None
 
+@tracing.traced("translate_to_vietnamese", "translate")
 def translate_to_vietnamese(text):
     """Translate text to Vietnamese with robust error handling.
     
@@ -35,9 +46,31 @@ def translate_to_vietnamese(text):
     if text is None or text == "":
         return ""
     
+    TRANSLATIONS.inc()
+    
+    # Genres and awards summaries never need a network call
+    translation = vocabulary.lookup(text)
+    if translation is not None:
+        VOCABULARY_HITS.inc()
+        tracing.annotate(cache="vocabulary")
+        return translation
+    
     if translator is None:
         return text
     
+    # Translations are cached; failed ones (None) are retried next time
+    translation = cache.default_cache.get_or_fetch("translations", text, lambda: request_translation(text))
+    return translation if translation is not None else text
+
+def request_translation(text):
+    """Ask Google Translate for the Vietnamese translation of a text.
+    
+    Args:
+        text (str): Text to translate
+        
+    Returns:
+        str: Translated text, or None if translation fails
+    """
     # Maximum retry attempts
     max_retries = 3
     retry_count = 0
@@ -47,29 +80,36 @@ def translate_to_vietnamese(text):
             # Add a small delay between retries to avoid rate limiting
             if retry_count > 0:
                 time.sleep(1)
+                resilience.UPSTREAM_RETRIES.inc("translate")
                 
-            translation = translator.translate(text, dest='vi')
+            TRANSLATED_CHARACTERS.inc("translate", amount=len(text))
+            with resilience.guard("translate"):
+                translation = translator.translate(text, dest='vi')
             
             # Verify we have valid translated text
             if translation and hasattr(translation, 'text') and translation.text:
                 return translation.text
             else:
-                # If translate returned None or empty, return original
-                return text
+                # If translate returned None or empty, the original is shown
+                return None
+                
+        except resilience.UpstreamUnavailable:
+            # Translation is paused after repeated errors; show the original text
+            return None
                 
         except json.JSONDecodeError as e:
             # Specific handling for JSON decode errors
             print(f"JSON error in translation: {e}")
             retry_count += 1
             if retry_count >= max_retries:
-                return text
+                return None
                 
         except Exception as e:
             print(f"Translation error: {e}")
-            return text
+            return None
     
-    # If all retries failed, return original text
-    return text
+    # If all retries failed, the original text is shown
+    return None
 
 def translate_texts(texts_list):
     """Translate a list of texts to Vietnamese.
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vocabulary module for the Movie Search Script.
+Precomputed Vietnamese translations of closed vocabularies: the TMDb movie
+genres and the sentences OMDb builds its awards summaries from ("Won 4
+Oscars. 152 wins & 220 nominations total"). The table is generated by
+build_vocabulary.py into VOCABULARY_FILE and versioned; the translator
+consults it before any network call.
+"""
+
+import json
+import os
+import re
+import sys
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import VOCABULARY_FILE
+
+# Layout of the table file understood by this module
+FORMAT = 1
+
+def load_table(path=VOCABULARY_FILE):
+    """Load a vocabulary table.
+
+    Returns:
+        dict: Table with 'version', 'terms', 'awards' and 'sentences', or an
+            empty table if the file is missing or in another format
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        if table.get("format") == FORMAT:
+            return table
+        print(f"Error loading vocabulary: unsupported format {table.get('format')}")
+    except (OSError, ValueError) as e:
+        print(f"Error loading vocabulary: {e}")
+    return {"version": 0, "terms": {}, "awards": {}, "sentences": []}
+
+def compile_sentences(table):
+    """Compile the sentence patterns of a table.
+
+    '{award}' in a pattern matches any award name of the table; the name is
+    replaced by its translation in the output.
+
+    Returns:
+        list: (compiled pattern, output template) tuples, in table order
+    """
+    names = sorted(table["awards"], key=len, reverse=True)  # Longest first: 'BAFTA Film Award' before 'BAFTA Award'
+    award = "(?P<award>" + "|".join(re.escape(name) for name in names) + ")"
+    return [(re.compile(pattern.replace("{award}", award)), template) for pattern, template in table["sentences"]]
+
+_table = load_table()
+_terms = {term.casefold(): translation for term, translation in _table["terms"].items()}
+_sentences = compile_sentences(_table)
+
+# Version of the table in use (0 if none is loaded)
+VERSION = _table["version"]
+
+def _translate_sentence(sentence):
+    for pattern, template in _sentences:
+        match = pattern.fullmatch(sentence)
+        if match:
+            groups = match.groupdict()
+            if groups.get("award"):
+                groups["award"] = _table["awards"][groups["award"]]
+            return template.format(**groups)
+    return None
+
+def lookup(text):
+    """Get the precomputed translation of a text.
+
+    Args:
+        text (str): Text in English (or already in Vietnamese)
+
+    Returns:
+        str: Vietnamese text, or None if the text is not in the vocabularies
+    """
+    translation = _terms.get(text.strip().casefold())
+    if translation is not None or not _sentences:
+        return translation
+
+    # Awards summaries: every sentence must be known
+    sentences = [sentence.strip() for sentence in text.strip().rstrip(".").split(". ")]
+    translated = [_translate_sentence(sentence) for sentence in sentences]
+    if not sentences or None in translated:
+        return None
+    return ". ".join(translated) + ("." if text.strip().endswith(".") else "")
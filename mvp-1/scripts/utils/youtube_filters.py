@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+YouTube result filters for the Movie Search Script.
+Decides which search results are Vietnamese movie reviews. Patterns are
+compiled once at import time and title matchers once per movie, so the
+filters stay cheap when run over tens of thousands of video snippets.
+"""
+
+import re
+from functools import lru_cache
+
+from utils.text import VIETNAMESE_CHARS, fold_diacritics
+
+# Common Vietnamese words/patterns in channel names
+VN_CHANNEL_PATTERNS = (
+    'review', 'phim', 'điện ảnh', 'phê phim', 'xem phim',
+    'việt', 'viet', 'vn', '.vn', 'vietnam',
+    'phim hay', 'phim mới', 'phim chiếu rạp',
+    'cine', 'cinema', 'rap', 'rạp'
+)
+
+# One regex for all patterns plus any Vietnamese diacritic, searched in a single pass
+_CHANNEL_RE = re.compile(
+    '[' + VIETNAMESE_CHARS + ']|' +
+    '|'.join(re.escape(pattern) for pattern in sorted(set(VN_CHANNEL_PATTERNS), key=len, reverse=True))
+)
+
+# Channel classification memoized by channel id (titles are used when no id is known)
+_channel_cache = {}
+CHANNEL_CACHE_SIZE = 100000
+
+def is_vietnamese_channel(channel_title, channel_id=None):
+    """Check if a YouTube channel is likely Vietnamese based on its title.
+
+    Args:
+        channel_title (str): The title of the YouTube channel
+        channel_id (str, optional): The channel id, used as memoization key
+
+    Returns:
+        bool: True if the channel appears to be Vietnamese
+    """
+    key = channel_id or channel_title
+    cached = _channel_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = _CHANNEL_RE.search(channel_title.lower()) is not None
+
+    if len(_channel_cache) >= CHANNEL_CACHE_SIZE:
+        _channel_cache.clear()
+    _channel_cache[key] = result
+    return result
+
+@lru_cache(maxsize=1024)
+def compile_title_matcher(movie_title):
+    """Compile a matcher for video titles mentioning a movie.
+
+    Tokens are diacritic-folded once here, so 'Bố Già' also matches
+    'bo gia review'. Single-word titles must appear as a whole word,
+    multi-word titles must have all words present in order.
+
+    Args:
+        movie_title (str): The title of the movie being searched
+
+    Returns:
+        re.Pattern: Pattern to search in folded, lowercased video titles,
+            or None if the title has no searchable words (matches everything)
+    """
+    movie_clean = ''.join(c for c in fold_diacritics(movie_title.lower()) if c.isalnum() or c.isspace())
+    movie_words = movie_clean.split()
+
+    if not movie_words:
+        return None
+
+    if len(movie_words) == 1:
+        return re.compile(r'\b' + re.escape(movie_words[0]) + r'\b')
+
+    return re.compile('.*?'.join(re.escape(word) for word in movie_words), re.DOTALL)
+
+@lru_cache(maxsize=65536)
+def _fold_video_title(video_title):
+    """Lowercase and fold a video title (memoized: the same titles recur across movies and pages)."""
+    return fold_diacritics(video_title.lower())
+
+def matches_title(matcher, video_title):
+    """Check a video title against a compiled title matcher.
+
+    Args:
+        matcher (re.Pattern): Result of compile_title_matcher()
+        video_title (str): The title of the YouTube video
+
+    Returns:
+        bool: True if the video title contains the movie title
+    """
+    if matcher is None:
+        return True
+    return matcher.search(_fold_video_title(video_title)) is not None
+
+def filter_review_items(items, movie_title, seen_ids=None):
+    """Yield search items that are Vietnamese reviews of a movie.
+
+    Args:
+        items (list): 'items' of a YouTube search.list response
+        movie_title (str): The title of the movie being searched
+        seen_ids (set, optional): Video ids already accepted; updated in place
+            so duplicates across result pages are skipped
+
+    Yields:
+        tuple: (video_id, snippet) of each accepted item
+    """
+    matcher = compile_title_matcher(movie_title)
+    if seen_ids is None:
+        seen_ids = set()
+
+    for item in items:
+        video_id = item.get("id", {}).get("videoId", "")
+        snippet = item.get("snippet", {})
+        title = snippet.get("title", "")
+
+        # Only include videos from Vietnamese channels that contain the movie title
+        if (video_id and title and video_id not in seen_ids and
+                is_vietnamese_channel(snippet.get("channelTitle", ""), snippet.get("channelId")) and
+                matches_title(matcher, title)):
+            seen_ids.add(video_id)
+            yield video_id, snippet
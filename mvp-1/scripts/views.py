@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Views module for the Movie Search Script.
+Builds the data shown by the search and detail views as plain dictionaries,
+so the same data can be rendered in the terminal (main.py) or returned as
+JSON by the HTTP service (server.py).
+
+Every detail view built online is saved as a snapshot (SNAPSHOT_DIR). In
+offline mode (see resilience.set_offline) detail views are served from
+these snapshots, and built from the caches alone for movies without one.
+
+The plots and overviews of the views and search results are added to the
+local plot index as they are fetched, for search_plots() (see
+utils/plot_index.py).
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import TMDB_IMAGE_BASE_URL, SEARCH_CACHE_FOLD_DIACRITICS, SNAPSHOT_DIR, LANGUAGE, TARGET_LANGUAGE
+from api import tmdb, omdb, youtube, wikipedia
+from utils.translator import translate_to_vietnamese, translate_texts
+from utils import blobstore, cache, id_map, plot_index, resilience, text, tracing
+import models
+
+# Cache namespaces the sections of the detail view come from (see cache.track_freshness)
+SECTION_SOURCES = {
+    "movie": ["tmdb_details"],
+    "omdb": ["omdb_details"],
+    "wikipedia": ["wikipedia_plot"],
+    "youtube_reviews": ["youtube_reviews"],
+    "transcript": ["transcripts"],
+    "translations": ["translations"]
+}
+
+# Background worker for slow lookups that run while the rest of a view is prepared
+background = ThreadPoolExecutor(max_workers=2)
+
+# Set once the saved snapshots have been added to the plot index (see search_plots)
+_snapshots_indexed = False
+
+def search_movies(query, limit=10):
+    """Search TMDb for movies, newest first.
+
+    Results are cached under the normalized query, so 'Bố Già', ' BỐ GIÀ '
+    and (with SEARCH_CACHE_FOLD_DIACRITICS) 'bo gia' share one search.
+
+    Args:
+        query (str): Movie title to search for
+        limit (int, optional): Maximum number of results
+
+    Returns:
+        list: Movie search results
+    """
+    key = cache.make_key(text.normalize_query(query, SEARCH_CACHE_FOLD_DIACRITICS), limit)
+    # Empty lists are not cached: they may come from a failed request
+    return cache.default_cache.get_or_fetch("search", key, lambda: rank_search_results(query, limit), store_if=bool)
+
+def rank_search_results(query, limit=10):
+    """Search TMDb and rank the results (see search_movies)."""
+    movies = tmdb.search_movie(query)
+    for movie in movies:
+        plot_index.add_movie(movie.get("id"), [("tmdb", LANGUAGE.split("-")[0], movie.get("overview"))],
+                             movie.get("title", ""), movie.get("release_date", "")[:4],
+                             [movie.get("original_title", "")])
+
+    # Sort movies by release date (newest first)
+    movies.sort(key=lambda x: x.get('release_date', ''), reverse=True)
+    return movies[:limit]
+
+def build_movie_view(movie_id, executor=None):
+    """Collect and translate everything the detail view shows for a movie.
+
+    The view includes 'freshness': when the data of each section was
+    fetched (Unix time), from the cache entries it was served from.
+
+    Args:
+        movie_id (int): TMDb movie ID
+        executor (Executor, optional): Executor for the transcript lookup,
+            which runs while the other sources are queried (default: background)
+
+    Returns:
+        dict: View data, or None if the movie details could not be fetched
+    """
+    offline = resilience.is_offline()
+    if offline:
+        view = load_snapshot(movie_id)
+        if view is not None:
+            return view
+
+    built_at = time.time()
+    with cache.track_freshness() as fetched_at:
+        view = collect_movie_view(movie_id, executor)
+    if view is None:
+        return None
+
+    # Sections served from no cache were fetched just now
+    view["freshness"] = {section: min((fetched_at[namespace] for namespace in namespaces if namespace in fetched_at),
+                                      default=built_at)
+                         for section, namespaces in SECTION_SOURCES.items()}
+    view["freshness"]["reviews"] = built_at
+    if not offline:
+        save_snapshot(movie_id, view)
+    index_view(movie_id, view)
+    return view
+
+def index_view(movie_id, view):
+    """Add the plots of a detail view, as fetched and translated, to the plot index."""
+    movie_data = view["movie"]
+    translations = view["translations"]
+    omdb_details = view["omdb"]
+    wiki_plot_data = view["wikipedia"]
+    texts = [
+        ("tmdb", LANGUAGE.split("-")[0], movie_data["overview"]),
+        ("tmdb", TARGET_LANGUAGE, translations["overview"]),
+        ("imdb", TARGET_LANGUAGE, translations["imdb_plot"]),
+        ("wikipedia", TARGET_LANGUAGE, translations["wiki_plot"])
+    ]
+    if omdb_details["success"]:
+        texts.append(("imdb", "en", omdb_details["plot"]))
+    if wiki_plot_data["success"]:
+        texts.append(("wikipedia", wiki_plot_data["language"], wiki_plot_data["plot"]))
+    plot_index.add_movie(movie_id, texts, movie_data["title"], movie_data["release_year"],
+                         [translations["title"], movie_data["original_title"]])
+
+def search_plots(query, limit=10):
+    """Search the movies whose plot or overview has been fetched by words of their story.
+
+    The first search of a process indexes the saved snapshots, so views built
+    before the index existed are found too.
+
+    Args:
+        query (str): Words of the plot (e.g. 'du hành thời gian')
+        limit (int, optional): Maximum number of results
+
+    Returns:
+        list: Matching movies, best first (see plot_index.search)
+    """
+    global _snapshots_indexed
+    if not _snapshots_indexed:
+        _snapshots_indexed = True
+        index_snapshots()
+    return plot_index.search(query, limit)
+
+def index_snapshots():
+    """Add the plots of every saved snapshot to the plot index (unchanged ones are skipped).
+
+    Returns:
+        int: Number of snapshots read
+    """
+    try:
+        names = [name for name in os.listdir(SNAPSHOT_DIR) if name.endswith(".json")]
+    except OSError:
+        return 0
+    count = 0
+    for name in names:
+        movie_id = name[:-len(".json")]
+        view = load_snapshot(movie_id) if movie_id.isdigit() else None
+        if view is not None:
+            index_view(int(movie_id), view)
+            count += 1
+    return count
+
+def collect_movie_view(movie_id, executor=None):
+    """Query and translate the data of the detail view (see build_movie_view)."""
+    # Get movie details (as a record holding only the fields used below)
+    movie = tmdb.get_movie_details(movie_id)
+    if movie is None:
+        return None
+
+    # Fill in ids found by earlier views so the other sources can skip title searches
+    known_ids = id_map.get_ids(movie_id)
+    movie = movie.merge(models.Movie(imdb_id=known_ids.get("imdb_id", ""), wikidata_id=known_ids.get("wikidata_id", "")))
+    id_map.update_ids(movie_id, imdb_id=movie.imdb_id, wikidata_id=movie.wikidata_id)
+    imdb_id = movie.imdb_id
+    wikidata_id = movie.wikidata_id
+
+    # Get detailed info from OMDb including plot and ratings
+    omdb_details = omdb.get_omdb_details(
+        movie.title,
+        movie.release_year,
+        imdb_id=imdb_id or None
+    )
+    if omdb_details['success']:
+        movie = movie.merge(models.Movie.from_omdb(omdb_details))
+        id_map.update_ids(movie_id, imdb_id=omdb_details['imdb_id'])
+    movie_data = movie.to_dict()
+
+    # Get YouTube reviews (reuse recently found videos instead of searching again)
+    youtube_reviews = youtube.get_youtube_reviews(
+        movie_data["title"],
+        movie_data["release_year"],
+        video_ids=id_map.get_recent_youtube_ids(known_ids)
+    )
+    transcript_future = None
+    if youtube_reviews:
+        id_map.update_ids(movie_id, youtube_video_ids=[review['video_id'] for review in youtube_reviews])
+
+        # Newest first, then fetch transcripts of the top videos while the rest of the view is prepared
+        youtube_reviews.sort(
+            key=lambda x: x['published_at'] if x['published_at'] else "0000-00-00",
+            reverse=True
+        )
+        transcript_future = (executor or background).submit(
+            tracing.bind(youtube.get_best_transcript), [review['video_id'] for review in youtube_reviews]
+        )
+
+    # Get Wikipedia plot (read the known pages directly when they have been identified)
+    wiki_pages = known_ids.get("wikipedia") or (wikipedia.get_page_titles(wikidata_id) if wikidata_id else {})
+    wiki_plot_data = wikipedia.get_movie_plot(
+        movie_data["title"],
+        movie_data["release_year"],
+        page_titles=wiki_pages
+    )
+    if wiki_pages:
+        # Store the whole page set the lookup used: it is part of the plot cache key, so the next view hits it
+        id_map.update_ids(movie_id, wikipedia_pages=wiki_pages)
+    elif wiki_plot_data['success']:
+        id_map.update_ids(movie_id, wikipedia_pages={wiki_plot_data['language']: wiki_plot_data['page_title']})
+
+    # Get user reviews from TMDb
+    reviews = tmdb.get_movie_reviews(movie_id, limit=2)
+
+    # Translate information to Vietnamese, using TMDb's own translation where it has one
+    if movie.localized_title:
+        title_vi = movie.localized_title
+    elif movie_data["title"] != movie_data["original_title"]:
+        title_vi = translate_to_vietnamese(movie_data["title"])
+    else:
+        title_vi = movie_data["title"]
+    translations = {
+        "title": title_vi,
+        "overview": movie.localized_overview or translate_to_vietnamese(movie_data["overview"]),
+        "genres": translate_texts(movie_data["genres"]),
+        "production_companies": translate_texts(movie_data["production_companies"]),
+        "imdb_plot": "",
+        "awards": "",
+        "wiki_plot": ""
+    }
+
+    # Translate IMDb plot and awards if available
+    if omdb_details['success'] and omdb_details['plot']:
+        translations["imdb_plot"] = translate_to_vietnamese(omdb_details['plot'])
+    if omdb_details['success'] and omdb_details['awards']:
+        translations["awards"] = translate_to_vietnamese(omdb_details['awards'])
+
+    # Translate Wikipedia plot if it's in English
+    if wiki_plot_data['success']:
+        if wiki_plot_data['language'] == 'en':
+            translations["wiki_plot"] = translate_to_vietnamese(wiki_plot_data['plot'])
+        else:
+            translations["wiki_plot"] = wiki_plot_data['plot']
+
+    # Wait for the best transcript found among the most recent reviews
+    transcript = None
+    if transcript_future is not None:
+        with tracing.span("wait_transcript", "view"):
+            transcript = transcript_future.result()
+        if transcript['success']:
+            transcript['video'] = next(review for review in youtube_reviews
+                                       if review['video_id'] == transcript['video_id'])
+
+    return {
+        "movie": movie_data,
+        "translations": translations,
+        "omdb": omdb_details,
+        "wikipedia": wiki_plot_data,
+        "youtube_reviews": youtube_reviews,
+        "transcript": transcript,
+        "reviews": reviews,
+        "poster_url": f"{TMDB_IMAGE_BASE_URL}{movie_data['poster_path']}" if movie_data["poster_path"] else ""
+    }
+
+def snapshot_path(movie_id):
+    return os.path.join(SNAPSHOT_DIR, f"{int(movie_id)}.json")
+
+def load_snapshot(movie_id):
+    """Load the last detail view saved for a movie.
+
+    Returns:
+        dict: View data (see build_movie_view), or None if there is none
+    """
+    try:
+        with open(snapshot_path(movie_id), encoding="utf-8") as f:
+            return blobstore.unpack(json.load(f))
+    except (OSError, ValueError, blobstore.BlobMissing):
+        return None
+
+def save_snapshot(movie_id, view):
+    """Save a detail view for offline mode (long texts go to the blob store)."""
+    path = snapshot_path(movie_id)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        transcript = view["transcript"]
+        if transcript and transcript["success"]:
+            # Same blob as the segments in the transcript cache of the video
+            view = dict(view, transcript=dict(transcript, transcript=blobstore.put_value(transcript["transcript"])))
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(blobstore.pack(view), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Error saving view snapshot: {e}")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache Warm-up Job
+-----------------
+Pre-fills the caches (TMDb details, OMDb, Wikipedia, YouTube, transcripts,
+translations and searches) for the movies most likely to be opened: the
+TMDb trending and popular lists plus the titles in WARMUP_TITLES. Peak-hour
+views of these movies are then served without cold upstream calls.
+
+Run it from cron before peak hours, for example:
+    0 6,17 * * * cd /path/to/mvp-1/scripts && python warmup.py
+
+Movies are warmed one at a time with a pause in between, and no new movie is
+started once the request budget has been spent. Requests are sent in the
+bulk priority class (see utils/scheduler.py).
+"""
+
+import sys
+import time
+import argparse
+
+from config import CACHE_DIR, WARMUP_TITLES, WARMUP_LIMIT, WARMUP_REQUEST_BUDGET, WARMUP_DELAY
+from api import tmdb, omdb, youtube
+from utils import blobstore, cache_backend, hedging, metrics, resilience, scheduler, text
+import views
+
+def best_match(title, results):
+    """Pick the search result a title refers to.
+
+    Cached searches are sorted newest first (see views.search_movies), not by
+    relevance: the most popular result titled like the search wins, so a newer
+    sequel or namesake is not picked instead of the movie itself.
+
+    Args:
+        title (str): Searched title
+        results (list): Search results
+
+    Returns:
+        dict: Matching result (the most popular one if no title matches, None if there are no results)
+    """
+    wanted = text.normalize_query(title, fold=True)
+    matches = [movie for movie in results
+               if wanted in (text.normalize_query(movie.get(name) or "", fold=True) for name in ("title", "original_title"))]
+    return max(matches or results, key=lambda movie: movie.get("popularity") or 0, default=None)
+
+def collect_movies(sources, titles, limit):
+    """Pick the movies to warm up, configured titles first, without duplicates.
+
+    Args:
+        sources (list): TMDb lists to use ('trending', 'popular')
+        titles (list): Movie titles to keep warm; their searches are warmed too
+        limit (int): Maximum number of movies
+
+    Returns:
+        list: (TMDb movie ID, title) tuples
+    """
+    candidates = []
+    for title in titles:
+        # Warm the search users type, and its best match
+        match = best_match(title, views.search_movies(title))
+        if match:
+            candidates.append(match)
+
+    if "trending" in sources:
+        candidates += tmdb.get_trending_movies()
+    if "popular" in sources:
+        candidates += tmdb.get_popular_movies()
+
+    movies = []
+    seen_ids = set()
+    for movie in candidates:
+        if movie.get("id") is None or movie["id"] in seen_ids:
+            continue
+        seen_ids.add(movie["id"])
+        movies.append((movie["id"], movie.get("title", "N/A")))
+    return movies[:limit]
+
+def run_warmup(sources, titles, limit, budget, delay):
+    """Warm up the caches once.
+
+    Args:
+        sources (list): TMDb lists to use ('trending', 'popular')
+        titles (list): Movie titles to keep warm
+        limit (int): Maximum number of movies
+        budget (int): Upstream requests after which no new movie is started
+        delay (float): Pause between movies in seconds
+
+    Returns:
+        dict: Number of movies warmed, failed and skipped, and requests used
+    """
+    start_requests = resilience.count_requests()
+    movies = collect_movies(sources, titles, limit)
+    print(f"Làm nóng cache cho {len(movies)} phim (tối đa {budget} request)...")
+
+    summary = {"warmed": 0, "failed": 0, "skipped": 0, "requests": 0}
+    for index, (movie_id, title) in enumerate(movies):
+        if resilience.count_requests() - start_requests >= budget:
+            summary["skipped"] = len(movies) - index
+            print(f"Đã dùng hết ngân sách request, bỏ qua {summary['skipped']} phim còn lại.")
+            break
+        if index:
+            time.sleep(delay)
+
+        before = resilience.count_requests()
+        started = time.perf_counter()
+        view = views.build_movie_view(movie_id)
+        summary["warmed" if view else "failed"] += 1
+        print(f"  {'✓' if view else '✗'} {title} ({time.perf_counter() - started:.1f}s, "
+              f"{resilience.count_requests() - before} request)")
+
+    summary["requests"] = resilience.count_requests() - start_requests
+    print(f"Hoàn tất: {summary['warmed']} phim, {summary['requests']} request.")
+    return summary
+
+def blob_reference_roots():
+    """Get the directories of the files that may refer to blobs (see blobstore.collect_garbage).
+
+    Cache entries of a file backend outside CACHE_DIR (CACHE_BACKEND=file:///...)
+    still keep their long texts in BLOB_DIR.
+    """
+    roots = [CACHE_DIR]
+    backend = cache_backend.default_backend
+    if isinstance(backend, cache_backend.FileBackend):
+        roots.append(backend.root)
+    return roots
+
+def main():
+    """Main function to run the warm-up job."""
+    parser = argparse.ArgumentParser(description="Làm nóng cache cho các phim đang được quan tâm")
+    parser.add_argument("--sources", nargs="*", choices=["trending", "popular"], default=["trending", "popular"],
+                        help="danh sách phim của TMDb cần làm nóng (để trống để chỉ dùng --titles)")
+    parser.add_argument("--titles", nargs="*", default=WARMUP_TITLES,
+                        help="tên phim cần làm nóng (mặc định WARMUP_TITLES)")
+    parser.add_argument("--limit", type=int, default=WARMUP_LIMIT, help="số phim tối đa mỗi lần chạy")
+    parser.add_argument("--budget", type=int, default=WARMUP_REQUEST_BUDGET,
+                        help="số request tối đa tới các upstream mỗi lần chạy")
+    parser.add_argument("--delay", type=float, default=WARMUP_DELAY, help="thời gian nghỉ giữa hai phim (giây)")
+    parser.add_argument("--every", type=float, metavar="MINUTES",
+                        help="chạy lại sau mỗi MINUTES phút thay vì chạy một lần")
+    args = parser.parse_args()
+
+    # Check API keys
+    if not tmdb.check_api_key():
+        sys.exit(1)
+
+    omdb.check_api_key()
+    youtube.check_api_key()
+    metrics.start_file_dump()
+    # Warm-up is not latency sensitive: never spend extra requests on hedges
+    hedging.set_enabled(False)
+
+    try:
+        while True:
+            with scheduler.priority("bulk"):
+                run_warmup(args.sources, args.titles, args.limit, args.budget, args.delay)
+            # Drop the texts no cache entry refers to any more
+            removed = blobstore.collect_garbage(blob_reference_roots())
+            print(f"Dọn blob store: xóa {removed['removed']} blob không còn dùng ({removed['bytes_freed'] // 1024} KB).")
+            if not args.every:
+                break
+            time.sleep(args.every * 60)
+    except KeyboardInterrupt:
+        print("\nĐã dừng làm nóng cache.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the movie records (scripts/models.py).
+
+Usage:
+    python -m unittest discover mvp-1/tests
+"""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import models  # noqa: E402
+
+def translation(language, country, title, overview=""):
+    return {"iso_639_1": language, "iso_3166_1": country, "data": {"title": title, "overview": overview}}
+
+class FromTmdbTranslationsTest(unittest.TestCase):
+    def build(self, *translations, locale="vi-VN"):
+        details = {"id": 1, "title": "Movie", "translations": {"translations": list(translations)}}
+        return models.Movie.from_tmdb(details, locale=locale)
+
+    def test_prefers_translation_of_the_locale_country(self):
+        movie = self.build(translation("en", "US", "Movie"),
+                           translation("vi", "US", "Phim (US)", "Nội dung US"),
+                           translation("vi", "VN", "Phim", "Nội dung"))
+        self.assertEqual(movie.localized_title, "Phim")
+        self.assertEqual(movie.localized_overview, "Nội dung")
+
+    def test_falls_back_to_language_of_another_country(self):
+        movie = self.build(translation("en", "US", "Movie"), translation("vi", "US", "Phim (US)"))
+        self.assertEqual(movie.localized_title, "Phim (US)")
+
+    def test_no_translation_in_the_language(self):
+        movie = self.build(translation("en", "US", "Movie"))
+        self.assertEqual((movie.localized_title, movie.localized_overview), ("", ""))
+
+class CacheRowTest(unittest.TestCase):
+    movie = models.Movie(
+        tmdb_id=238, title="The Godfather", genres=("Drama", "Crime"),
+        credits=(models.Credit("Francis Ford Coppola", "Director"), models.Credit("Al Pacino", "Actor", "Michael")),
+        ratings=(models.Rating("Internet Movie Database", "9.2/10"),),
+        plots=(models.Plot("The aging patriarch...", "imdb"),),
+        localized_title="Bố Già"
+    )
+
+    def test_round_trip_through_json(self):
+        row = json.loads(json.dumps(self.movie.to_cache()))
+        self.assertEqual(models.Movie.from_cache(row), self.movie)
+
+    def test_row_cached_before_new_fields(self):
+        row = json.loads(json.dumps(self.movie.to_cache()))[:18]
+        movie = models.Movie.from_cache(row)
+        self.assertEqual(movie.localized_title, "")
+        self.assertEqual(movie.credits, self.movie.credits)
+
+if __name__ == "__main__":
+    unittest.main()
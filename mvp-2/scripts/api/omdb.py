@@ -13,7 +13,13 @@ import os
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import OMDB_API_KEY, OMDB_BASE_URL
+from utils import fastjson, http_client, tracing
 
+# Detail fields shown by the UI and used in the OpenAI prompts; the rest (e.g. the full plot) is dropped
+DETAIL_FIELDS = ("Title", "Year", "Runtime", "Genre", "Director", "Actors", "Awards", "Poster",
+                 "Ratings", "imdbRating", "imdbVotes", "BoxOffice", "imdbID")
+
+@tracing.traced("omdb.search_movies")
 def search_movies(title):
     """Search for movies by title using the OMDb API.
     
@@ -33,9 +39,9 @@ def search_movies(title):
     }
     
     try:
-        response = requests.get(OMDB_BASE_URL, params=params)
+        response = http_client.get(OMDB_BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = fastjson.decode_response(response)
         
         if data.get("Response") == "True":
             return data.get("Search", [])
@@ -45,6 +51,7 @@ def search_movies(title):
         print(f"Error searching movies: {e}")
         return []
 
+@tracing.traced("omdb.get_movie_details")
 def get_movie_details(imdb_id):
     """Get detailed movie information by IMDb ID.
     
@@ -52,7 +59,7 @@ def get_movie_details(imdb_id):
         imdb_id (str): The IMDb ID of the movie
         
     Returns:
-        dict: Movie details or None if not found
+        dict: Movie details (DETAIL_FIELDS only) or None if not found
     """
     if not check_api_key():
         return None
@@ -64,12 +71,12 @@ def get_movie_details(imdb_id):
     }
     
     try:
-        response = requests.get(OMDB_BASE_URL, params=params)
+        response = http_client.get(OMDB_BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = fastjson.decode_response(response)
         
         if data.get("Response") == "True":
-            return data
+            return {field: data[field] for field in DETAIL_FIELDS if field in data}
         return None
         
     except requests.exceptions.RequestException as e:
@@ -12,11 +12,34 @@ from openai import OpenAI
 
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import OPENAI_API_KEY
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+from config import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_TIMEOUT, UPSTREAM_OVERRIDE
+from utils.http_client import rewrite_url
+from utils import cache, metrics, resilience, tracing
+
+# Initialize OpenAI client (pointed at the stub server when upstreams are overridden)
+client = OpenAI(
+    api_key=OPENAI_API_KEY,
+    base_url=rewrite_url(OPENAI_BASE_URL, UPSTREAM_OVERRIDE) if UPSTREAM_OVERRIDE else OPENAI_BASE_URL,
+    timeout=OPENAI_TIMEOUT
+)
+
+# Tokens billed by OpenAI, by kind of request ('analysis', 'awards', 'translation')
+OPENAI_TOKENS = metrics.counter("movie_openai_tokens_total", "OpenAI tokens used", ["kind", "type"])
+
+def record_usage(kind, response):
+    """Count the prompt and completion tokens of an OpenAI response.
+    
+    Args:
+        kind (str): Kind of request
+        response: Chat completion response
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    OPENAI_TOKENS.inc(kind, "prompt", amount=usage.prompt_tokens or 0)
+    OPENAI_TOKENS.inc(kind, "completion", amount=usage.completion_tokens or 0)
 
+@tracing.traced("openai.get_movie_analysis", "upstream")
 def get_movie_analysis(movie_details):
     """Get movie analysis and review using OpenAI.
     
@@ -29,6 +52,15 @@ def get_movie_analysis(movie_details):
     if not OPENAI_API_KEY:
         return "Error: OpenAI API key not found"
 
+    # Analyses are cached per movie; errors are retried next time
+    key = cache.make_key(movie_details.get('imdbID') or movie_details['Title'])
+    return cache.default_cache.get_or_fetch(
+        "movie_analysis", key, lambda: request_movie_analysis(movie_details),
+        store_if=lambda analysis: not analysis.startswith("Error")
+    )
+
+def request_movie_analysis(movie_details):
+    """Ask OpenAI for a movie analysis (see get_movie_analysis)."""
     try:
         prompt = f"""Hãy viết một bài phân tích chuyên sâu về bộ phim "{movie_details['Title']}" với độ dài khoảng 10-15 câu.
 
@@ -48,20 +80,23 @@ def get_movie_analysis(movie_details):
         
         Hãy viết với giọng điệu chuyên nghiệp, khách quan nhưng dễ hiểu, tránh chia thành các mục riêng biệt. Các ý cần được kết nối tự nhiên, tạo một bài phân tích mạch lạc và có chiều sâu."""
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a professional film critic who writes flowing, insightful, and cohesive reviews in Vietnamese. Your reviews seamlessly blend analysis of different aspects while maintaining clarity and depth."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
+        with resilience.guard("openai"):
+            response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are a professional film critic who writes flowing, insightful, and cohesive reviews in Vietnamese. Your reviews seamlessly blend analysis of different aspects while maintaining clarity and depth."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=1000
+            )
+        record_usage("analysis", response)
         
         return response.choices[0].message.content.strip()
     except Exception as e:
         return f"Error getting movie analysis: {str(e)}"
 
+@tracing.traced("openai.get_awards_analysis", "upstream")
 def get_awards_analysis(movie_details):
     """Get detailed analysis of movie awards using OpenAI.
     
@@ -74,6 +109,15 @@ def get_awards_analysis(movie_details):
     if not OPENAI_API_KEY:
         return {"error": "OpenAI API key not found"}
 
+    # Analyses are cached per movie and awards text; errors are retried next time
+    key = cache.make_key(movie_details.get('imdbID') or movie_details['Title'], movie_details.get('Awards'))
+    return cache.default_cache.get_or_fetch(
+        "awards_analysis", key, lambda: request_awards_analysis(movie_details),
+        store_if=lambda analysis: "error" not in analysis
+    )
+
+def request_awards_analysis(movie_details):
+    """Ask OpenAI for a structured awards analysis (see get_awards_analysis)."""
     try:
         prompt = f"""Phân tích chi tiết các giải thưởng của bộ phim sau và trả về kết quả có cấu trúc:
 
@@ -105,15 +149,17 @@ Hãy phân tích và trả về kết quả theo định dạng JSON với cấu
 
 Chỉ trả về JSON, không kèm theo bất kỳ văn bản nào khác."""
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a movie awards analyst who provides structured analysis of film awards in Vietnamese."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
+        with resilience.guard("openai"):
+            response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are a movie awards analyst who provides structured analysis of film awards in Vietnamese."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=1000
+            )
+        record_usage("awards", response)
         
         try:
             import json
@@ -23,6 +23,74 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Base URLs
 OMDB_BASE_URL = "http://www.omdbapi.com/"
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+# Send all upstream requests to a local stub server instead (e.g. http://127.0.0.1:8765, see benchmarks/)
+UPSTREAM_OVERRIDE = os.getenv("UPSTREAM_OVERRIDE")
+
+# Local cache settings
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache'))
+BLOB_DIR = os.path.join(CACHE_DIR, "blobs")  # Compressed texts shared by cache entries, see utils/blobstore.py
+BLOB_MIN_SIZE = int(os.getenv("BLOB_MIN_SIZE", "1024"))  # Strings this long (characters) are stored as blobs
+BLOB_GC_GRACE = 3600  # Unreferenced blobs younger than this (seconds) survive garbage collection
+
+# Search result cache, see utils/cache.py
+CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "1024"))  # Entries kept in the in-process LRU
+DAY = 24 * 3600
+CACHE_FIELD_TTLS = {  # How long each kind of field stays fresh (seconds)
+    "ratings": 1 * DAY,  # IMDb rating and votes
+    "details": 7 * DAY,  # Titles, years, posters, plots, awards
+    "analysis": 30 * DAY  # OpenAI analyses of a movie
+}
+CACHE_NAMESPACES = {  # Fields held by each cached lookup: fresh until the first is due, served stale until the last
+    "search": ["ratings", "details"],  # Search results with their OMDb details (main.search_movie)
+    "movie_analysis": ["analysis"],
+    "awards_analysis": ["analysis"]
+}
+CACHE_NEGATIVE_TTLS = {}  # How long a lookup that found nothing is not repeated (seconds)
+SEARCH_CACHE_FOLD_DIACRITICS = os.getenv("SEARCH_CACHE_FOLD_DIACRITICS", "1") != "0"  # 'bo gia' reuses 'Bố Già'
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")  # Storage behind the LRU: 'file' (CACHE_DIR) or redis://host:port/db shared by all instances
+CACHE_BACKEND_TIMEOUT = float(os.getenv("CACHE_BACKEND_TIMEOUT", "1.0"))  # Connect and read timeout of a network backend (seconds)
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "mvp2:")  # Keeps the keys of each app apart on a shared server
+CACHE_LOCK_TTL = 30  # A fetch lock left behind by a crashed instance expires after this (seconds)
+CACHE_LOCK_WAIT = 45  # Longest wait for another instance fetching the same entry, then fetch anyway (seconds)
+CACHE_LOCK_POLL = 0.05  # Interval between checks of that fetch (seconds)
+
+# Cache warm-up job (warmup.py)
+WARMUP_TITLES = [title.strip() for title in os.getenv("WARMUP_TITLES", "").split(",") if title.strip()]  # Titles to keep warm
+WARMUP_RESULTS = int(os.getenv("WARMUP_RESULTS", "1"))  # Top search results of each title whose analyses are generated
+WARMUP_REQUEST_BUDGET = int(os.getenv("WARMUP_REQUEST_BUDGET", "100"))  # Upstream requests per run (OpenAI calls cost money)
+WARMUP_DELAY = float(os.getenv("WARMUP_DELAY", "1.0"))  # Pause between titles (seconds)
+
+# Upstream rate limits (requests per second, burst) and circuit breakers, see utils/resilience.py
+UPSTREAM_RATE_LIMITS = {
+    "omdb": (10, 10),
+    "openai": (3, 5)  # Keeps concurrent analyses under the per-minute request limit
+}
+RATE_LIMIT_MAX_WAIT = 5  # Longest wait for a rate-limit token before failing fast (seconds)
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open an upstream's circuit breaker
+BREAKER_COOLDOWN = 30  # Seconds an open breaker fails requests fast before trying again
+UPSTREAM_TIMEOUT = 10  # Default (connect, read) timeout of OMDb requests in seconds
+OPENAI_TIMEOUT = 60  # Analyses take a while to generate
+
+# Concurrent requests per upstream, shared by priority class, see utils/scheduler.py
+UPSTREAM_CONCURRENCY = {
+    "omdb": 6,
+    "openai": 4
+}
+SCHEDULER_INTERACTIVE_RESERVE = 1  # Slots of each upstream that background work never takes
+SCHEDULER_MAX_WAIT = 60  # Longest wait for a slot before failing (seconds, analyses are slow)
+
+# Request hedging for sources with long-tail latency, see utils/hedging.py (empty to disable)
+HEDGED_SOURCES = [source for source in os.getenv("HEDGED_SOURCES", "").split(",") if source]
+HEDGE_MAX_RATIO = 0.1  # Extra requests allowed, as a share of the source's requests
+HEDGE_MIN_DELAY = 0.05  # Never hedge sooner than this (seconds)
+HEDGE_MIN_SAMPLES = 20  # Latencies observed before hedging starts
+HEDGE_WINDOW = 200  # Recent latencies used for the p95
+
+# Metrics in the Prometheus text format, see utils/metrics.py
+METRICS_FILE = os.getenv("METRICS_FILE", "")  # File rewritten periodically with all metrics (empty to disable)
+METRICS_DUMP_INTERVAL = float(os.getenv("METRICS_DUMP_INTERVAL", "15"))  # Seconds between writes of METRICS_FILE
 
 # Initialize Rich console
 console = Console()
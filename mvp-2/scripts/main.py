@@ -9,19 +9,25 @@ It uses OMDb API for movie data and OpenAI for analysis.
 """
 
 import sys
+import argparse
 from rich.console import Console
 
+from config import SEARCH_CACHE_FOLD_DIACRITICS
 from api import omdb, openai_helper
 from ui.movie_display import display_movie_info, display_search_results
 from utils.movie_processor import sort_movies_by_year, get_movie_details_batch
 from utils.input_handler import get_movie_selection, get_movie_title
 from utils.translator import translate_to_english
+from utils import cache, metrics, text, tracing
 
 console = Console()
 
 def search_movie(title):
     """Search for movies with translation fallback.
     
+    Results are cached under the normalized title, so 'Bố Già', ' BỐ GIÀ '
+    and (with SEARCH_CACHE_FOLD_DIACRITICS) 'bo gia' share one search.
+    
     Args:
         title (str): Movie title to search for
         
@@ -30,6 +36,15 @@ def search_movie(title):
     """
     print(f"\nĐang tìm kiếm phim '{title}'...")
     
+    key = cache.make_key(text.normalize_query(title, SEARCH_CACHE_FOLD_DIACRITICS))
+    # Empty results are not cached: they may come from a failed request
+    movies, movie_details_list = cache.default_cache.get_or_fetch(
+        "search", key, lambda: find_movies(title), store_if=lambda result: bool(result[0])
+    )
+    return movies, movie_details_list
+
+def find_movies(title):
+    """Search OMDb and get the details of the results (see search_movie)."""
     # First try with original title
     movies = omdb.search_movies(title)
     
@@ -47,14 +62,47 @@ def search_movie(title):
     else:
         return [], []
 
+def profile_movie_info(movie_details, traces, trace_out=None):
+    """Display movie information while recording a latency trace.
+
+    Prints a waterfall of the recorded spans after the view and, when
+    trace_out is set, writes all traces so far as Chrome trace-event JSON.
+
+    Args:
+        movie_details (dict): Movie details from OMDb
+        traces (list): Traces recorded in this session (appended to)
+        trace_out (str, optional): Output file for the Chrome trace
+    """
+    trace, token = tracing.start_trace(movie_details.get('Title', 'N/A') if movie_details else 'N/A')
+    try:
+        display_movie_info(movie_details)
+    finally:
+        tracing.stop_trace(token)
+    
+    traces.append(trace)
+    tracing.print_waterfall(console, trace)
+    if trace_out:
+        tracing.export_chrome_trace(traces, trace_out)
+        console.print(f"[dim]Đã lưu trace vào {trace_out} (mở bằng chrome://tracing hoặc Perfetto)[/dim]")
+
 def main():
     """Main function to run the movie search script."""
+    parser = argparse.ArgumentParser(description="Tìm kiếm và phân tích phim")
+    parser.add_argument("--profile", action="store_true",
+                        help="hiển thị thời gian của từng bước sau mỗi lần xem phim")
+    parser.add_argument("--trace-out", metavar="FILE",
+                        help="lưu trace dạng Chrome trace-event JSON (bật --profile)")
+    args = parser.parse_args()
+    profile = args.profile or bool(args.trace_out)
+    traces = []
+    
     print("\n=== TÌM KIẾM VÀ PHÂN TÍCH PHIM ===\n")
     
     # Check API keys
     if not omdb.check_api_key():
         sys.exit(1)
     openai_helper.check_api_key()
+    metrics.start_file_dump()
     
     while True:
         # Get movie title from user with validation
@@ -80,7 +128,10 @@ def main():
             continue
             
         # Display movie details
-        display_movie_info(movie_details_list[selection])
+        if profile:
+            profile_movie_info(movie_details_list[selection], traces, args.trace_out)
+        else:
+            display_movie_info(movie_details_list[selection])
         
         input("\nNhấn Enter để tiếp tục...")
 
@@ -4,6 +4,7 @@ from rich.table import Table
 from api import openai_helper
 from config import UI_ICONS, UI_SEPARATOR
 from utils.awards_parser import parse_awards
+from utils import tracing
 
 console = Console()
 
@@ -23,93 +24,97 @@ def display_movie_info(movie_details):
 """
     
     # Display basic information
-    console.print(Panel(f"{title}\n{basic_info}", border_style="blue"))
+    with tracing.span("basic_info", "render"):
+        console.print(Panel(f"{title}\n{basic_info}", border_style="blue"))
     
     # Display ratings
-    if movie_details.get('Ratings'):
-        table = Table(title="ĐÁNH GIÁ")
-        table.add_column("Nguồn", justify="right", style="cyan")
-        table.add_column("Điểm", style="magenta")
+    with tracing.span("ratings", "render"):
+        if movie_details.get('Ratings'):
+            table = Table(title="ĐÁNH GIÁ")
+            table.add_column("Nguồn", justify="right", style="cyan")
+            table.add_column("Điểm", style="magenta")
         
-        for rating in movie_details['Ratings']:
-            table.add_row(rating['Source'], rating['Value'])
-        console.print(table)
+            for rating in movie_details['Ratings']:
+                table.add_row(rating['Source'], rating['Value'])
+            console.print(table)
     
-    # Display awards if available
-    if movie_details.get('Awards') and movie_details['Awards'] != 'N/A':
-        awards_analysis = openai_helper.get_awards_analysis(movie_details)
+    # Display awards if available (fetch span: most of its time is the OpenAI analysis)
+    with tracing.span("awards", "api"):
+        if movie_details.get('Awards') and movie_details['Awards'] != 'N/A':
+            awards_analysis = openai_helper.get_awards_analysis(movie_details)
         
-        if not awards_analysis.get('error'):
-            # Create awards table
-            awards_table = Table(title=f"{UI_ICONS['award']} GIẢI THƯỞNG")
-            awards_table.add_column("Giải thưởng", style="yellow")
-            awards_table.add_column("Hạng mục", style="cyan")
-            awards_table.add_column("Kết quả", style="green")
-            awards_table.add_column("Năm", style="blue")
+            if not awards_analysis.get('error'):
+                # Create awards table
+                awards_table = Table(title=f"{UI_ICONS['award']} GIẢI THƯỞNG")
+                awards_table.add_column("Giải thưởng", style="yellow")
+                awards_table.add_column("Hạng mục", style="cyan")
+                awards_table.add_column("Kết quả", style="green")
+                awards_table.add_column("Năm", style="blue")
             
-            # Add Oscar awards
-            for award in awards_analysis.get('oscar_awards', []):
-                awards_table.add_row(
-                    "Oscar",
-                    award['category'],
-                    award['result'],
-                    award['year']
-                )
+                # Add Oscar awards
+                for award in awards_analysis.get('oscar_awards', []):
+                    awards_table.add_row(
+                        "Oscar",
+                        award['category'],
+                        award['result'],
+                        award['year']
+                    )
             
-            # Add Golden Globe awards
-            for award in awards_analysis.get('golden_globe_awards', []):
-                awards_table.add_row(
-                    "Quả Cầu Vàng",
-                    award['category'],
-                    award['result'],
-                    award['year']
-                )
+                # Add Golden Globe awards
+                for award in awards_analysis.get('golden_globe_awards', []):
+                    awards_table.add_row(
+                        "Quả Cầu Vàng",
+                        award['category'],
+                        award['result'],
+                        award['year']
+                    )
             
-            # Add BAFTA awards
-            for award in awards_analysis.get('bafta_awards', []):
-                awards_table.add_row(
-                    "BAFTA",
-                    award['category'],
-                    award['result'],
-                    award['year']
-                )
+                # Add BAFTA awards
+                for award in awards_analysis.get('bafta_awards', []):
+                    awards_table.add_row(
+                        "BAFTA",
+                        award['category'],
+                        award['result'],
+                        award['year']
+                    )
             
-            # Add other major awards
-            for award in awards_analysis.get('other_major_awards', []):
-                awards_table.add_row(
-                    award['award_name'],
-                    award['category'],
-                    award['result'],
-                    award['year']
-                )
+                # Add other major awards
+                for award in awards_analysis.get('other_major_awards', []):
+                    awards_table.add_row(
+                        award['award_name'],
+                        award['category'],
+                        award['result'],
+                        award['year']
+                    )
             
-            # Display awards table
-            console.print(awards_table)
+                # Display awards table
+                console.print(awards_table)
             
-            # Display awards summary
-            if awards_analysis.get('summary'):
-                console.print(Panel(
-                    awards_analysis['summary'],
-                    title="TÓM TẮT THÀNH TỰU",
-                    border_style="yellow"
-                ))
+                # Display awards summary
+                if awards_analysis.get('summary'):
+                    console.print(Panel(
+                        awards_analysis['summary'],
+                        title="TÓM TẮT THÀNH TỰU",
+                        border_style="yellow"
+                    ))
             
-            # Display total counts
-            total_info = f"Tổng cộng: {awards_analysis.get('total_wins', 0)} giải thắng, {awards_analysis.get('total_nominations', 0)} đề cử"
-            console.print(f"[yellow]{total_info}[/yellow]\n")
-        else:
-            # Fallback to simple awards display if analysis fails
-            awards_panel = parse_awards(movie_details['Awards'])
-            console.print(Panel(awards_panel, title=f"{UI_ICONS['award']} GIẢI THƯỞNG", border_style="yellow"))
+                # Display total counts
+                total_info = f"Tổng cộng: {awards_analysis.get('total_wins', 0)} giải thắng, {awards_analysis.get('total_nominations', 0)} đề cử"
+                console.print(f"[yellow]{total_info}[/yellow]\n")
+            else:
+                # Fallback to simple awards display if analysis fails
+                awards_panel = parse_awards(movie_details['Awards'])
+                console.print(Panel(awards_panel, title=f"{UI_ICONS['award']} GIẢI THƯỞNG", border_style="yellow"))
     
-    # Get and display AI analysis
-    console.print(f"\n{UI_ICONS['review']} PHÂN TÍCH VÀ ĐÁNH GIÁ:")
-    analysis_result = openai_helper.get_movie_analysis(movie_details)
-    if isinstance(analysis_result, str) and not analysis_result.startswith("Error"):
-        wrapped_text = "\n".join([line.strip() for line in analysis_result.split("\n") if line.strip()])
-        console.print(Panel(wrapped_text, border_style="green", width=100))
-    else:
-        console.print(f"[red]{analysis_result}[/red]")
+    # Get and display AI analysis (fetch span, like awards)
+    with tracing.span("analysis", "api"):
+        console.print(f"\n{UI_ICONS['review']} PHÂN TÍCH VÀ ĐÁNH GIÁ:")
+        analysis_result = openai_helper.get_movie_analysis(movie_details)
+        if isinstance(analysis_result, str) and not analysis_result.startswith("Error"):
+            wrapped_text = "\n".join([line.strip() for line in analysis_result.split("\n") if line.strip()])
+            console.print(Panel(wrapped_text, border_style="green", width=100))
+        else:
+            console.print(f"[red]{analysis_result}[/red]")
     
     # Show poster if available
     if movie_details.get('Poster') and movie_details['Poster'] != 'N/A':
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache backend module for the Movie Search Script.
+Storage behind the in-memory tier of utils/cache.py, selected with
+CACHE_BACKEND:
+
+    file                     JSON files under CACHE_DIR (the default; shared
+                             by the processes of one host)
+    file:///path/to/dir      JSON files under another directory
+    redis://[:password@]host[:port][/db]
+                             a key-value server speaking the Redis protocol,
+                             shared by every instance that points to it
+
+Backends store JSON-serializable values under '/'-separated keys (e.g.
+'http/omdb_details/<sha1>') with an expiry time. add() stores a value only
+if the key is free, which the cache uses as a lock so that one instance
+fetches a missing entry while the others wait for it. Shared backends also
+keep counters (incr), used by utils/quota.py to spend one daily quota
+across instances.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_DIR, CACHE_BACKEND, CACHE_BACKEND_TIMEOUT, CACHE_KEY_PREFIX, BLOB_MIN_SIZE
+from utils import blobstore, metrics
+
+BACKEND_ERRORS = metrics.counter("movie_cache_backend_errors_total", "Cache backend operations that failed",
+                                 ["backend", "operation"])
+
+class BackendError(OSError):
+    """Raised when a network backend cannot be reached or rejects a command.
+
+    It is an OSError, so callers handle it like a failed file operation.
+    """
+
+class CacheBackend:
+    """Interface of the cache backends.
+
+    Attributes:
+        name (str): Backend name (for /health and metrics)
+        shared (bool): True if instances on other hosts see the same data
+    """
+
+    name = "none"
+    shared = False
+
+    def get(self, key):
+        """Get a stored value, or None if the key is missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Store a value.
+
+        Args:
+            key (str): Key
+            value: JSON-serializable value
+            ttl (float, optional): Seconds before the value may be dropped
+        """
+        raise NotImplementedError
+
+    def add(self, key, value, ttl):
+        """Store a value only if the key is free (missing or expired).
+
+        Returns:
+            bool: True if the value was stored
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove a key (missing keys are ignored)."""
+        raise NotImplementedError
+
+    def incr(self, key, amount=1, ttl=None):
+        """Add to an integer counter, created at 0 (shared backends only).
+
+        Returns:
+            int: New value
+        """
+        raise NotImplementedError
+
+class FileBackend(CacheBackend):
+    """One JSON file per key under a directory.
+
+    Long strings are moved to the blob store (see utils/blobstore.py).
+    Expiry times are only applied to add() locks: cache entries are aged by
+    the cache itself from their 'stored_at'.
+
+    Args:
+        root (str): Directory holding the files
+    """
+
+    name = "file"
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split("/")) + ".json"
+
+    def get(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return blobstore.unpack(json.load(f))
+        except (OSError, ValueError, blobstore.BlobMissing):
+            return None
+
+    def set(self, key, value, ttl=None):
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Long texts (also long keys, e.g. translated texts) go to the blob store
+        value = blobstore.pack(value)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def add(self, key, value, ttl):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) < ttl:
+                        return False
+                    os.remove(path)  # Expired: left behind by a process that died
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            return True
+        return False
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+def encode_command(args):
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+def read_reply(reader):
+    """Read one RESP reply.
+
+    Args:
+        reader: Buffered binary file of the connection
+
+    Returns:
+        str, int, bytes, list or None (nil)
+
+    Raises:
+        BackendError: If the server replies with an error
+    """
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the cache server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        raise BackendError(payload.decode("utf-8", "replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError("Connection closed by the cache server")
+        return data[:-2]
+    if kind == b"*":
+        count = int(payload)
+        return None if count < 0 else read_replies(reader, count)
+    raise ValueError(f"Unexpected reply from the cache server: {line[:32]!r}")
+
+def read_replies(reader, count):
+    """Read several RESP replies, all of them even if some are errors.
+
+    Stopping at the first error would leave the following replies on the
+    connection, where the next command would read them as its own.
+
+    Returns:
+        list: One reply per command
+
+    Raises:
+        BackendError: The first error reply, once every reply has been read
+    """
+    replies = []
+    for _ in range(count):
+        try:
+            replies.append(read_reply(reader))
+        except BackendError as e:
+            replies.append(e)
+    for reply in replies:
+        if isinstance(reply, BackendError):
+            raise reply
+    return replies
+
+class RespBackend(CacheBackend):
+    """Key-value server speaking the Redis protocol (RESP2), shared by all instances.
+
+    Values are JSON, compressed with zlib from BLOB_MIN_SIZE bytes. Connections
+    are pooled and reopened after errors. Once the server cannot be reached,
+    commands fail at once for RETRY_AFTER seconds, so an outage costs each
+    lookup an error message rather than a connect timeout.
+
+    Args:
+        host (str): Server host
+        port (int, optional): Server port
+        db (int, optional): Database number (SELECT)
+        password (str, optional): Password (AUTH)
+        prefix (str, optional): Prepended to every key
+        timeout (float, optional): Connect and read timeout in seconds
+    """
+
+    name = "redis"
+    shared = True
+
+    # Seconds without connection attempts after the server could not be reached
+    RETRY_AFTER = 5.0
+
+    def __init__(self, host, port=6379, db=0, password=None, prefix=CACHE_KEY_PREFIX, timeout=CACHE_BACKEND_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._idle = []
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                self._send(connection, ("AUTH", self.password))
+            if self.db:
+                self._send(connection, ("SELECT", self.db))
+        except (OSError, ValueError):
+            self._close(connection)
+            raise
+        return connection
+
+    @staticmethod
+    def _close(connection):
+        sock, reader = connection
+        reader.close()
+        sock.close()
+
+    def _send(self, connection, *commands):
+        sock, reader = connection
+        sock.sendall(b"".join(encode_command(command) for command in commands))
+        return read_replies(reader, len(commands))
+
+    def execute(self, *commands):
+        """Send commands in one round trip (pipelined).
+
+        Args:
+            *commands (tuple): Commands, e.g. ("GET", key)
+
+        Returns:
+            list: One reply per command
+
+        Raises:
+            BackendError: If the server cannot be reached or rejects a command
+        """
+        with self._lock:
+            if time.monotonic() < self._down_until:
+                raise BackendError(f"Cache server {self.host}:{self.port} unavailable")
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            try:
+                connection = self._connect()
+            except BackendError:
+                # AUTH or SELECT rejected (the connection is closed)
+                BACKEND_ERRORS.inc(self.name, "connect")
+                raise
+            except (OSError, ValueError) as e:
+                self._down_until = time.monotonic() + self.RETRY_AFTER
+                BACKEND_ERRORS.inc(self.name, commands[0][0].lower())
+                raise BackendError(f"Cache server {self.host}:{self.port} unavailable: {e}") from e
+        try:
+            replies = self._send(connection, *commands)
+        except BackendError:
+            with self._lock:
+                self._idle.append(connection)  # Every reply was read: the connection is still in sync
+            raise
+        except (OSError, ValueError) as e:
+            # Replies may be left unread: they must not reach the next command
+            self._close(connection)
+            BACKEND_ERRORS.inc(self.name, commands[0][0].lower())
+            raise BackendError(f"Cache server {self.host}:{self.port} unavailable: {e}") from e
+        with self._lock:
+            self._idle.append(connection)
+        return replies
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _encode(value):
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(data) >= BLOB_MIN_SIZE:
+            return b"z:" + zlib.compress(data)
+        return data
+
+    @staticmethod
+    def _decode(data):
+        if data.startswith(b"z:"):
+            data = zlib.decompress(data[2:])
+        return json.loads(data)
+
+    def get(self, key):
+        data = self.execute(("GET", self._key(key)))[0]
+        if data is None:
+            return None
+        try:
+            return self._decode(data)
+        except (ValueError, zlib.error):
+            return None
+
+    def set(self, key, value, ttl=None):
+        command = ("SET", self._key(key), self._encode(value))
+        if ttl:
+            command += ("PX", int(ttl * 1000))
+        self.execute(command)
+
+    def add(self, key, value, ttl):
+        return self.execute(("SET", self._key(key), self._encode(value), "PX", int(ttl * 1000), "NX"))[0] == "OK"
+
+    def delete(self, key):
+        self.execute(("DEL", self._key(key)))
+
+    def incr(self, key, amount=1, ttl=None):
+        if not ttl:
+            return self.execute(("INCRBY", self._key(key), amount))[0]
+        value, _ = self.execute(("INCRBY", self._key(key), amount), ("PEXPIRE", self._key(key), int(ttl * 1000)))
+        return value
+
+def create_backend(url=CACHE_BACKEND):
+    """Create the backend described by a CACHE_BACKEND value.
+
+    Args:
+        url (str, optional): 'file', 'file:///path' or 'redis://[:password@]host[:port][/db]'
+
+    Returns:
+        CacheBackend: The backend
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url == "file":
+        return FileBackend()
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme == "file":
+        return FileBackend(parts.path)
+    if parts.scheme == "redis":
+        db = parts.path.strip("/")
+        return RespBackend(parts.hostname or "127.0.0.1", parts.port or 6379, int(db) if db else 0,
+                           urllib.parse.unquote(parts.password) if parts.password else None)
+    raise ValueError(f"Unsupported CACHE_BACKEND: {url}")
+
+# Backend of the response cache and the shared quota counters
+default_backend = create_backend()
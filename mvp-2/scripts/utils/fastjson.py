@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fast JSON module for the Movie Search Script.
+Decodes upstream responses with orjson when it is installed (several times
+faster on large TMDb and YouTube bodies) and with the standard json module
+otherwise. Install it with `pip install orjson`; nothing else changes.
+"""
+
+import json
+
+import requests
+
+try:
+    import orjson  # Optional dependency
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+def loads(data):
+    """Decode a JSON document.
+
+    Args:
+        data (bytes or str): JSON document
+
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def decode_response(response):
+    """Decode the JSON body of an HTTP response (drop-in for response.json()).
+
+    Args:
+        response (requests.Response): HTTP response
+
+    Returns:
+        Decoded value
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON,
+            like response.json(), so callers catching RequestException still do
+    """
+    try:
+        return loads(response.content)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
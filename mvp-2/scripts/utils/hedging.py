@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Hedging module for the Movie Search Script.
+Cuts the long latency tail of slow upstreams: when a GET to a hedged
+source (HEDGED_SOURCES) has not been answered within that source's recently
+observed p95 latency, a duplicate request is sent and the first successful
+answer wins. Extra load is capped at HEDGE_MAX_RATIO of the requests.
+"""
+
+import contextvars
+import sys
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import HEDGED_SOURCES, HEDGE_MAX_RATIO, HEDGE_MIN_DELAY, HEDGE_MIN_SAMPLES, HEDGE_WINDOW
+from utils import metrics
+
+# Most hedges that may be saved up while the upstream is fast
+HEDGE_BUDGET_CAP = 10
+
+# Threads for the requests of hedged sources (the caller waits on them)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+class HedgeTracker:
+    """Recent latencies, hedge budget and counters of one source."""
+
+    def __init__(self, window=HEDGE_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.budget = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.won = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def observe(self, latency):
+        with self._lock:
+            self.latencies.append(latency)
+
+    def p95(self):
+        """Get the observed p95 latency, or None until there are enough samples."""
+        with self._lock:
+            if len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def start_request(self):
+        """Count a request and add its share to the hedge budget."""
+        with self._lock:
+            self.requests += 1
+            self.budget = min(HEDGE_BUDGET_CAP, self.budget + HEDGE_MAX_RATIO)
+
+    def take_budget(self):
+        """Spend one hedge from the budget.
+
+        Returns:
+            bool: False if the extra-load cap has been reached
+        """
+        with self._lock:
+            if self.budget >= 1:
+                self.budget -= 1
+                self.hedged += 1
+                return True
+            self.skipped += 1
+            return False
+
+    def record_win(self):
+        with self._lock:
+            self.won += 1
+
+    def stats(self):
+        p95 = self.p95()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "won": self.won,
+                "skipped": self.skipped,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+            }
+
+_trackers = {source: HedgeTracker() for source in HEDGED_SOURCES}
+_enabled = True
+
+def set_enabled(enabled):
+    """Turn hedging on or off for this process (e.g. off in batch jobs, which are not latency sensitive)."""
+    global _enabled
+    _enabled = enabled
+
+def is_hedged(source):
+    """Check if requests to a source are hedged."""
+    return _enabled and source in _trackers
+
+def _timed(tracker, send_func, request):
+    start = time.perf_counter()
+    response = send_func(request)
+    tracker.observe(time.perf_counter() - start)
+    return response
+
+def _discard(future):
+    """Close the response of the losing request once it arrives."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def send(source, send_func, request):
+    """Send an idempotent request, hedging it if it is slower than usual.
+
+    Args:
+        source (str): Upstream name (must be hedged, see is_hedged())
+        send_func (callable): Sends a PreparedRequest and returns the response
+        request (PreparedRequest): GET request to send
+
+    Returns:
+        requests.Response: First successful response
+
+    Raises:
+        requests.exceptions.RequestException: If every attempt failed
+    """
+    tracker = _trackers[source]
+    tracker.start_request()
+
+    delay = tracker.p95()
+    if delay is None:
+        # Not enough history yet to know what "slow" is
+        return _timed(tracker, send_func, request)
+
+    # Each attempt runs in a copy of the caller's context, so it keeps its priority class
+    primary = _executor.submit(contextvars.copy_context().run, _timed, tracker, send_func, request)
+    done, _ = wait([primary], timeout=max(delay, HEDGE_MIN_DELAY))
+    if done or not tracker.take_budget():
+        return primary.result()
+
+    hedge = _executor.submit(contextvars.copy_context().run, _timed, tracker, send_func, request.copy())
+    pending = {primary, hedge}
+    first_error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    tracker.record_win()
+                for other in pending:
+                    other.add_done_callback(_discard)
+                return future.result()
+            first_error = first_error or future.exception()
+    raise first_error
+
+def get_stats():
+    """Get hedging counters of every hedged source (for metrics).
+
+    Returns:
+        dict: {source: {'requests', 'hedged', 'won', 'skipped', 'p95_ms'}}
+    """
+    return {source: tracker.stats() for source, tracker in _trackers.items()}
+
+def collect_metrics():
+    """Report the hedging counters (see metrics.register_collector)."""
+    stats = get_stats()
+    families = [
+        ("movie_hedge_candidates_total", "Requests to hedged sources", "requests"),
+        ("movie_hedges_total", "Duplicate requests sent for slow requests", "hedged"),
+        ("movie_hedge_wins_total", "Duplicate requests answered before the original", "won"),
+        ("movie_hedges_skipped_total", "Hedges skipped because the budget was spent", "skipped")
+    ]
+    return [(name, "counter", documentation, [({"source": source}, counters[field]) for source, counters in stats.items()])
+            for name, documentation, field in families]
+
+metrics.register_collector(collect_metrics)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP client module for the Movie Search Script.
+Provides the shared requests session used for OMDb. Requests go through
+UpstreamAdapter, which applies the OMDb concurrency slots, rate limiter
+and circuit breaker (see utils/resilience.py), hedges slow OMDb lookups
+(see utils/hedging.py) and can redirect them to a local stub server (see
+benchmarks/replay.py) for offline runs; the OpenAI client is pointed at the
+same server with rewrite_url().
+"""
+
+import sys
+import os
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import UPSTREAM_OVERRIDE, UPSTREAM_TIMEOUT
+from utils import hedging, resilience, tracing
+
+# Upstream source names by host, used to label requests
+UPSTREAM_HOSTS = {
+    "www.omdbapi.com": "omdb",
+    "api.openai.com": "openai"
+}
+
+def get_source(url):
+    """Get the upstream source name of a URL.
+
+    Args:
+        url (str): Request URL
+
+    Returns:
+        str: Source name (e.g. 'omdb'), or the host name if unknown
+    """
+    host = urllib.parse.urlsplit(url).hostname or ""
+    return UPSTREAM_HOSTS.get(host, host)
+
+def rewrite_url(url, base_url):
+    """Redirect an upstream URL to a stub server, keeping the host in the path.
+
+    For example http://www.omdbapi.com/?i=tt1375666 becomes
+    http://127.0.0.1:8765/www.omdbapi.com/?i=tt1375666
+
+    Args:
+        url (str): Original request URL
+        base_url (str): Stub server base URL
+
+    Returns:
+        str: Rewritten URL
+    """
+    parts = urllib.parse.urlsplit(url)
+    return f"{base_url.rstrip('/')}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+class UpstreamAdapter(HTTPAdapter):
+    """Transport adapter for all upstream requests."""
+
+    def send(self, request, **kwargs):
+        source = get_source(request.url)
+        path = urllib.parse.urlsplit(request.url).path
+        if UPSTREAM_OVERRIDE:
+            request.url = rewrite_url(request.url, UPSTREAM_OVERRIDE)
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = UPSTREAM_TIMEOUT
+        
+        if not tracing.is_active():
+            return self._send(source, request, **kwargs)
+        
+        with tracing.span(f"{source} {request.method} {path}", "upstream"):
+            response = self._send(source, request, **kwargs)
+            tracing.annotate(bytes=len(response.content), status=response.status_code)
+            return response
+
+    def _send(self, source, request, **kwargs):
+        """Send a request, hedging idempotent GETs to sources with long-tail latency."""
+        if request.method == "GET" and hedging.is_hedged(source):
+            return hedging.send(source, lambda req: self._send_once(source, req, **kwargs), request)
+        return self._send_once(source, request, **kwargs)
+
+    def _send_once(self, source, request, **kwargs):
+        """Send a request through the slots, rate limiter and circuit breaker of its upstream."""
+        resilience.acquire(source)
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.RequestException:
+            resilience.record_failure(source)
+            resilience.UPSTREAM_REQUESTS.inc(source, "error")
+            raise
+        finally:
+            resilience.UPSTREAM_DURATION.observe(time.perf_counter() - started, source)
+            resilience.release(source)
+        resilience.record_status(source, response.status_code)
+        resilience.UPSTREAM_REQUESTS.inc(source, str(response.status_code))
+        return response
+
+def install(target_session):
+    """Route a requests session through UpstreamAdapter.
+
+    Args:
+        target_session (requests.Session): Session to configure
+    """
+    adapter = UpstreamAdapter(pool_connections=10, pool_maxsize=20)
+    target_session.mount("https://", adapter)
+    target_session.mount("http://", adapter)
+
+# Shared session: keeps connections to each upstream alive between calls
+session = requests.Session()
+install(session)
+
+def get(url, params=None, **kwargs):
+    """Send a GET request through the shared session.
+
+    Args:
+        url (str): Request URL
+        params (dict, optional): Query parameters
+
+    Returns:
+        requests.Response: The response
+    """
+    return session.get(url, params=params, **kwargs)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scheduler module for the Movie Search Script.
+Shares the concurrent requests allowed per upstream (UPSTREAM_CONCURRENCY)
+between priority classes, so background work never starves the views users
+are waiting for. Every upstream request takes a slot through
+resilience.acquire(), in the priority class of the code that sends it:
+
+    interactive  searches and analyses the user waits for (the default)
+    prefetch     data fetched ahead of a probable view
+    refresh      background refresh of stale cache entries
+    bulk         warm-up and other batch jobs
+
+A waiting request only gets a slot when no request of a higher class is
+waiting for the same upstream, and the last SCHEDULER_INTERACTIVE_RESERVE
+slots are kept for interactive requests. The class is held in a context
+variable: set it with priority(), and carry it into executor threads with
+bind() or tracing.bind().
+"""
+
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Add parent directory to sys.path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import UPSTREAM_CONCURRENCY, SCHEDULER_INTERACTIVE_RESERVE, SCHEDULER_MAX_WAIT
+from utils import metrics
+
+# Priority classes, highest first
+PRIORITIES = ("interactive", "prefetch", "refresh", "bulk")
+
+SLOT_WAIT = metrics.histogram("movie_scheduler_wait_seconds", "Time spent waiting for an upstream slot",
+                              ["source", "priority"])
+
+_current_priority = contextvars.ContextVar("current_priority", default=PRIORITIES[0])
+
+class SlotPool:
+    """Concurrency slots of one upstream, handed out by priority class.
+
+    Args:
+        size (int): Requests allowed at once
+        reserve (int, optional): Slots only interactive requests may take
+    """
+
+    def __init__(self, size, reserve=SCHEDULER_INTERACTIVE_RESERVE):
+        self.size = size
+        self.reserve = max(0, min(reserve, size - 1))
+        self.active = 0
+        self.waiting = [0] * len(PRIORITIES)
+        self.granted = [0] * len(PRIORITIES)
+        self.timed_out = [0] * len(PRIORITIES)
+        self._condition = threading.Condition()
+
+    def _can_start(self, rank):
+        if any(self.waiting[:rank]):
+            return False
+        limit = self.size if rank == 0 else self.size - self.reserve
+        return self.active < limit
+
+    def acquire(self, rank, max_wait=SCHEDULER_MAX_WAIT):
+        """Take a slot, waiting behind the requests of higher classes.
+
+        Args:
+            rank (int): Index of the priority class in PRIORITIES
+            max_wait (float, optional): Longest acceptable wait in seconds
+
+        Returns:
+            bool: True if a slot was taken, False if none became free in time
+        """
+        with self._condition:
+            if not self._can_start(rank):
+                self.waiting[rank] += 1
+                try:
+                    started = self._condition.wait_for(lambda: self._can_start(rank), timeout=max_wait)
+                finally:
+                    self.waiting[rank] -= 1
+                # Requests of lower classes may have been waiting only for this one
+                self._condition.notify_all()
+                if not started:
+                    self.timed_out[rank] += 1
+                    return False
+            self.active += 1
+            self.granted[rank] += 1
+            return True
+
+    def release(self):
+        """Give back a slot taken with acquire()."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def state(self):
+        with self._condition:
+            return {
+                "size": self.size,
+                "active": self.active,
+                "waiting": dict(zip(PRIORITIES, self.waiting)),
+                "granted": dict(zip(PRIORITIES, self.granted)),
+                "timed_out": dict(zip(PRIORITIES, self.timed_out))
+            }
+
+# One pool per configured upstream; other names pass through unchecked
+_pools = {name: SlotPool(size) for name, size in UPSTREAM_CONCURRENCY.items()}
+
+def current_priority():
+    """Get the priority class of the current context (e.g. 'interactive')."""
+    return _current_priority.get()
+
+@contextmanager
+def priority(name):
+    """Send the upstream requests made inside the block in a priority class.
+
+    Example:
+        with scheduler.priority("bulk"):
+            openai_helper.get_movie_analysis(movie_details)
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority class: {name}")
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def _run_as(name, func, *args, **kwargs):
+    with priority(name):
+        return func(*args, **kwargs)
+
+def bind(name, func):
+    """Run a function submitted to an executor in a priority class.
+
+    Args:
+        name (str): Priority class (see PRIORITIES)
+        func (callable): Function to submit
+
+    Returns:
+        callable: Function running in the priority class
+    """
+    return functools.partial(_run_as, name, func)
+
+def acquire(source):
+    """Take a slot of an upstream for the current priority class.
+
+    Args:
+        source (str): Upstream name (e.g. 'omdb')
+
+    Returns:
+        bool: False if no slot became free within SCHEDULER_MAX_WAIT
+    """
+    pool = _pools.get(source)
+    if pool is None:
+        return True
+    name = _current_priority.get()
+    started = time.perf_counter()
+    acquired = pool.acquire(PRIORITIES.index(name))
+    SLOT_WAIT.observe(time.perf_counter() - started, source, name)
+    return acquired
+
+def release(source):
+    """Give back the slot taken by acquire()."""
+    pool = _pools.get(source)
+    if pool is not None:
+        pool.release()
+
+def get_state():
+    """Get the slots in use and waiting requests of every upstream (for metrics and /health).
+
+    Returns:
+        dict: {source: {'size', 'active', 'waiting', 'granted', 'timed_out'}}
+    """
+    return {name: pool.state() for name, pool in _pools.items()}
+
+def collect_metrics():
+    """Report the slot usage of every upstream (see metrics.register_collector)."""
+    state = get_state()
+    return [
+        ("movie_scheduler_active", "gauge", "Upstream requests holding a slot",
+         [({"source": source}, pool["active"]) for source, pool in state.items()]),
+        ("movie_scheduler_waiting", "gauge", "Upstream requests waiting for a slot",
+         [({"source": source, "priority": name}, count)
+          for source, pool in state.items() for name, count in pool["waiting"].items()]),
+        ("movie_scheduler_timeouts_total", "counter", "Upstream requests refused because no slot became free in time",
+         [({"source": source, "priority": name}, count)
+          for source, pool in state.items() for name, count in pool["timed_out"].items()])
+    ]
+
+metrics.register_collector(collect_metrics)
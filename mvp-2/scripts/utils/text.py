@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Text utilities module for the Movie Search Script.
+Handles Vietnamese diacritic folding and search query normalization.
+"""
+
+import unicodedata
+
+# Vietnamese lowercase letters with diacritics and their base letters
+VIETNAMESE_CHARS = 'àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ'
+_VIETNAMESE_BASES = 'aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd'
+
+# str.translate table covering both cases, so folding needs no per-character Python loop
+_FOLD_TABLE = str.maketrans(
+    VIETNAMESE_CHARS + VIETNAMESE_CHARS.upper(),
+    _VIETNAMESE_BASES + _VIETNAMESE_BASES.upper()
+)
+
+def fold_diacritics(text):
+    """Remove diacritics from text (e.g. 'Bố Già' -> 'Bo Gia').
+
+    Args:
+        text (str): Text to fold
+
+    Returns:
+        str: Text without diacritics
+    """
+    if not text:
+        return ""
+
+    if text.isascii():
+        return text
+
+    folded = text.translate(_FOLD_TABLE)
+    if folded.isascii():
+        return folded
+
+    # Other scripts or combining characters: fall back to Unicode decomposition
+    decomposed = unicodedata.normalize('NFD', folded)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def normalize_query(query, fold=False):
+    """Normalize a search query so equivalent spellings share cached results.
+
+    Case-folds, collapses whitespace and optionally removes diacritics
+    (e.g. ' BỐ  GIÀ ' -> 'bố già', or 'bo gia' with fold=True).
+
+    Args:
+        query (str): Search query as typed
+        fold (bool, optional): Also remove diacritics
+
+    Returns:
+        str: Normalized query
+    """
+    # NFC first: some input methods type Vietnamese as base letters plus combining marks
+    query = ' '.join(unicodedata.normalize('NFC', query).casefold().split())
+    return fold_diacritics(query) if fold else query
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tracing module for the Movie Search Script.
+Records lightweight spans (upstream calls, translations, render steps) for
+one view at a time, prints them as a waterfall and exports them as Chrome
+trace-event JSON (chrome://tracing, Perfetto). When no trace is active,
+spans cost almost nothing.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+from rich.table import Table
+
+from utils import metrics
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """One timed step of a view."""
+
+    __slots__ = ("name", "category", "start", "end", "bytes", "cache", "thread", "attrs")
+
+    def __init__(self, name, category, start):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.bytes = None
+        self.cache = None
+        self.thread = threading.get_ident()
+        self.attrs = {}
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+class Trace:
+    """Spans recorded for one view."""
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.wall_start = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+class _NoopSpan:
+    """Returned when no trace is active; accepts and ignores annotations."""
+
+    __slots__ = ()
+    bytes = None
+    cache = None
+
+    @property
+    def attrs(self):
+        return {}
+
+    def __setattr__(self, name, value):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class span:
+    """Context manager timing a step in the active trace.
+
+    Example:
+        with tracing.span("tmdb.search", "api") as s:
+            ...
+            s.cache = "hit"
+    """
+
+    __slots__ = ("name", "category", "_span", "_token")
+
+    def __init__(self, name, category="app"):
+        self.name = name
+        self.category = category
+        self._span = None
+        self._token = None
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is None:
+            return _NOOP_SPAN
+        self._span = Span(self.name, self.category, time.perf_counter())
+        trace.add(self._span)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is not None:
+            self._span.end = time.perf_counter()
+            if exc_type is not None:
+                self._span.attrs["error"] = exc_type.__name__
+            _current_span.reset(self._token)
+        return False
+
+# Duration of every traced call, traced or not (cache hits included)
+CALL_DURATION = metrics.histogram("movie_call_duration_seconds", "Duration of api calls, cache hits included",
+                                  ["function"])
+
+def traced(name, category="api"):
+    """Decorator recording each call of a function as a span.
+
+    The duration of every call is also recorded in CALL_DURATION.
+
+    Args:
+        name (str): Span name
+        category (str, optional): Span category
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                if _current_trace.get() is None:
+                    return func(*args, **kwargs)
+                with span(name, category):
+                    return func(*args, **kwargs)
+            finally:
+                CALL_DURATION.observe(time.perf_counter() - started, name)
+        return wrapper
+    return decorator
+
+def annotate(bytes=None, cache=None, **attrs):
+    """Add details to the innermost active span.
+
+    Args:
+        bytes (int, optional): Bytes received
+        cache (str, optional): 'hit' or 'miss'
+    """
+    current = _current_span.get()
+    if current is None:
+        return
+    if bytes is not None:
+        current.bytes = (current.bytes or 0) + bytes
+    if cache is not None:
+        current.cache = cache
+    current.attrs.update(attrs)
+
+def is_active():
+    """Check if a trace is being recorded in the current context."""
+    return _current_trace.get() is not None
+
+def start_trace(name):
+    """Start recording a trace in the current context.
+
+    Args:
+        name (str): Trace name (e.g. the movie title)
+
+    Returns:
+        tuple: (Trace, token to pass to stop_trace)
+    """
+    trace = Trace(name)
+    return trace, _current_trace.set(trace)
+
+def stop_trace(token):
+    """Stop recording the trace started with start_trace()."""
+    _current_trace.reset(token)
+
+def bind(func):
+    """Carry the current trace into a function run on another thread.
+
+    Args:
+        func (callable): Function to submit to an executor
+
+    Returns:
+        callable: Function running in a copy of the current context
+    """
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+def format_bytes(size):
+    """Format a byte count for display."""
+    if size is None:
+        return ""
+    if size < 1024:
+        return f"{size} B"
+    return f"{size / 1024:.1f} KB"
+
+def print_waterfall(console, trace, width=24):
+    """Print the spans of a trace as a waterfall table.
+
+    Args:
+        console (Console): Rich console to print to
+        trace (Trace): Recorded trace
+        width (int, optional): Width of the timeline bars
+    """
+    spans = sorted(trace.spans, key=lambda s: s.start)
+    total = max([(s.end or s.start) - trace.start for s in spans] + [1e-9])
+
+    table = Table(title=f"PROFILE - {trace.name} ({total * 1000:.0f} ms)")
+    table.add_column("Span", style="cyan", overflow="ellipsis", min_width=24, max_width=40)
+    table.add_column("Start", justify="right")
+    table.add_column("Duration", justify="right", style="magenta")
+    table.add_column("Timeline", no_wrap=True, min_width=width)
+    table.add_column("Bytes", justify="right", style="green")
+    table.add_column("Cache", style="yellow")
+
+    for s in spans:
+        offset = s.start - trace.start
+        begin = int(offset / total * width)
+        length = max(1, int(s.duration / total * width))
+        bar = " " * begin + "█" * min(length, width - begin)
+        table.add_row(
+            f"{s.category}:{s.name}",
+            f"{offset * 1000:.0f} ms",
+            f"{s.duration * 1000:.0f} ms",
+            bar,
+            format_bytes(s.bytes),
+            s.cache or ""
+        )
+    console.print(table)
+
+def to_chrome_events(trace, pid=None):
+    """Convert a trace to Chrome trace-event format ('X' complete events).
+
+    Args:
+        trace (Trace): Recorded trace
+        pid (int, optional): Process id for the events
+
+    Returns:
+        list: Trace events
+    """
+    pid = pid or os.getpid()
+    events = []
+    for s in trace.spans:
+        args = dict(s.attrs, trace=trace.name)
+        if s.bytes is not None:
+            args["bytes"] = s.bytes
+        if s.cache:
+            args["cache"] = s.cache
+        events.append({
+            "name": s.name,
+            "cat": s.category,
+            "ph": "X",
+            "ts": round((trace.wall_start + s.start - trace.start) * 1e6),
+            "dur": round(s.duration * 1e6),
+            "pid": pid,
+            "tid": s.thread,
+            "args": args
+        })
+    return events
+
+def export_chrome_trace(traces, path):
+    """Write traces to a Chrome trace-event JSON file.
+
+    Args:
+        traces (list): Recorded traces
+        path (str): Output file path
+    """
+    events = []
+    for trace in traces:
+        events.extend(to_chrome_events(trace))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
@@ -11,8 +11,15 @@ import os
 
 # Add parent directory to sys.path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from api.openai_helper import client
+from api.openai_helper import client, record_usage
+from utils import metrics, resilience, tracing
 
+# Translation volume: texts and characters sent to OpenAI for translation
+TRANSLATIONS = metrics.counter("movie_translations_total", "Texts sent for translation")
+TRANSLATED_CHARACTERS = metrics.counter("movie_translated_characters_total",
+                                        "Characters sent for machine translation", ["source"])
+
+@tracing.traced("openai.translate_to_english", "translate")
 def translate_to_english(text):
     """Translate Vietnamese text to English using OpenAI.
     
@@ -22,22 +29,26 @@ def translate_to_english(text):
     Returns:
         str: Translated text or original text if translation fails
     """
+    TRANSLATIONS.inc()
+    TRANSLATED_CHARACTERS.inc("openai", amount=len(text))
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional translator specializing in movie titles. Translate the given Vietnamese movie title to English. Only return the translated title, nothing else."
-                },
-                {
-                    "role": "user",
-                    "content": f"Translate this movie title from Vietnamese to English: {text}"
-                }
-            ],
-            temperature=0.3,
-            max_tokens=100
-        )
+        with resilience.guard("openai"):
+            response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a professional translator specializing in movie titles. Translate the given Vietnamese movie title to English. Only return the translated title, nothing else."
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Translate this movie title from Vietnamese to English: {text}"
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=100
+            )
+        record_usage("translation", response)
         
         return response.choices[0].message.content.strip()
     except Exception as e:
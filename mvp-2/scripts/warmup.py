@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache Warm-up Job
+-----------------
+Pre-fills the caches for the titles in WARMUP_TITLES: the search results with
+their OMDb details, and the OpenAI movie and awards analyses of the top
+results. Peak-hour views of these movies are then served without waiting
+for OMDb or OpenAI.
+
+Run it from cron before peak hours, for example:
+    0 6,17 * * * cd /path/to/mvp-2/scripts && python warmup.py
+
+Titles are warmed one at a time with a pause in between, and no new title is
+started once the request budget has been spent. Requests are sent in the
+bulk priority class (see utils/scheduler.py).
+"""
+
+import sys
+import time
+import argparse
+import contextlib
+import io
+
+from config import CACHE_DIR, WARMUP_TITLES, WARMUP_RESULTS, WARMUP_REQUEST_BUDGET, WARMUP_DELAY
+from api import omdb, openai_helper
+from utils import blobstore, cache_backend, hedging, metrics, resilience, scheduler
+import main as app
+
+def warm_title(title, results):
+    """Warm the search and the analyses of the top results of one title.
+
+    Args:
+        title (str): Movie title as users search for it
+        results (int): Number of top results whose analyses are generated
+
+    Returns:
+        int: Number of movies whose analyses are cached
+    """
+    # Keep the progress messages of the search out of the job output
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, movie_details_list = app.search_movie(title)
+
+    warmed = 0
+    for movie_details in movie_details_list[:results]:
+        if not movie_details:
+            continue
+        if movie_details.get('Awards') and movie_details['Awards'] != 'N/A':
+            openai_helper.get_awards_analysis(movie_details)
+        analysis = openai_helper.get_movie_analysis(movie_details)
+        if not analysis.startswith("Error"):
+            warmed += 1
+    return warmed
+
+def run_warmup(titles, results, budget, delay):
+    """Warm up the caches once.
+
+    Args:
+        titles (list): Movie titles to keep warm
+        results (int): Top results of each title whose analyses are generated
+        budget (int): Upstream requests after which no new title is started
+        delay (float): Pause between titles in seconds
+
+    Returns:
+        dict: Number of movies warmed, titles skipped and requests used
+    """
+    start_requests = resilience.count_requests()
+    print(f"Làm nóng cache cho {len(titles)} tên phim (tối đa {budget} request)...")
+
+    summary = {"warmed": 0, "skipped": 0, "requests": 0}
+    for index, title in enumerate(titles):
+        if resilience.count_requests() - start_requests >= budget:
+            summary["skipped"] = len(titles) - index
+            print(f"Đã dùng hết ngân sách request, bỏ qua {summary['skipped']} tên phim còn lại.")
+            break
+        if index:
+            time.sleep(delay)
+
+        before = resilience.count_requests()
+        started = time.perf_counter()
+        warmed = warm_title(title, results)
+        summary["warmed"] += warmed
+        print(f"  {'✓' if warmed else '✗'} {title} ({time.perf_counter() - started:.1f}s, "
+              f"{resilience.count_requests() - before} request)")
+
+    summary["requests"] = resilience.count_requests() - start_requests
+    print(f"Hoàn tất: {summary['warmed']} phim, {summary['requests']} request.")
+    return summary
+
+def blob_reference_roots():
+    """Get the directories of the files that may refer to blobs (see blobstore.collect_garbage).
+
+    Cache entries of a file backend outside CACHE_DIR (CACHE_BACKEND=file:///...)
+    still keep their long texts in BLOB_DIR.
+    """
+    roots = [CACHE_DIR]
+    backend = cache_backend.default_backend
+    if isinstance(backend, cache_backend.FileBackend):
+        roots.append(backend.root)
+    return roots
+
+def main():
+    """Main function to run the warm-up job."""
+    parser = argparse.ArgumentParser(description="Làm nóng cache cho các phim đang được quan tâm")
+    parser.add_argument("--titles", nargs="*", default=WARMUP_TITLES,
+                        help="tên phim cần làm nóng (mặc định WARMUP_TITLES)")
+    parser.add_argument("--results", type=int, default=WARMUP_RESULTS,
+                        help="số kết quả đầu tiên của mỗi tên phim được phân tích trước")
+    parser.add_argument("--budget", type=int, default=WARMUP_REQUEST_BUDGET,
+                        help="số request tối đa tới OMDb và OpenAI mỗi lần chạy")
+    parser.add_argument("--delay", type=float, default=WARMUP_DELAY, help="thời gian nghỉ giữa hai tên phim (giây)")
+    parser.add_argument("--every", type=float, metavar="MINUTES",
+                        help="chạy lại sau mỗi MINUTES phút thay vì chạy một lần")
+    args = parser.parse_args()
+
+    if not args.titles:
+        print("Chưa có tên phim nào để làm nóng (WARMUP_TITLES hoặc --titles).")
+        sys.exit(1)
+
+    # Check API keys
+    if not omdb.check_api_key():
+        sys.exit(1)
+    if not openai_helper.check_api_key():
+        sys.exit(1)
+    metrics.start_file_dump()
+    # Warm-up is not latency sensitive: never spend extra requests on hedges
+    hedging.set_enabled(False)
+
+    try:
+        while True:
+            with scheduler.priority("bulk"):
+                run_warmup(args.titles, args.results, args.budget, args.delay)
+            # Drop the texts no cache entry refers to any more
+            removed = blobstore.collect_garbage(blob_reference_roots())
+            print(f"Dọn blob store: xóa {removed['removed']} blob không còn dùng ({removed['bytes_freed'] // 1024} KB).")
+            if not args.every:
+                break
+            time.sleep(args.every * 60)
+    except KeyboardInterrupt:
+        print("\nĐã dừng làm nóng cache.")
+
+if __name__ == "__main__":
+    main()